@@ -0,0 +1,238 @@
+import io
+import json
+import base64
+import tarfile
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlparse
+from synthetic_repo import blob_sha
+
+BRANCH = "main"
+
+# Blob text longer than this is reported as truncated, like GitHub's GraphQL API
+GRAPHQL_TEXT_LIMIT = 512 * 1024
+
+
+class FakeGitHub:
+    """
+    Local stand-in for the GitHub REST endpoints GitHubRepo uses.
+
+    Serves repo info, the head commit, the recursive tree, file contents (with
+    directory listings), git blobs, the tarball and the GraphQL file query of
+    GitHubRepo.get_files for any owner/repo from one generated file set,
+    honours If-None-Match with per-payload ETags, and counts requests per
+    endpoint. Use as a context manager; `api_url` goes into GITHUB_API_URL.
+    """
+
+    def __init__(self, files: dict):
+        self.files = files
+        self.shas = {path: blob_sha(content) for path, content in files.items()}
+        self.blobs = {self.shas[path]: content for path, content in files.items()}
+        self.calls = Counter()
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._tarball = None
+        self._server = None
+        self._thread = None
+
+        dirs = set()
+        for path in files:
+            parts = path.split("/")[:-1]
+            dirs.update("/".join(parts[: i + 1]) for i in range(len(parts)))
+        self.dirs = dirs
+
+    @property
+    def api_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeGitHub":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                fake._handle(self)
+
+            def do_POST(self):
+                fake._handle_graphql(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counters(self) -> None:
+        with self._lock:
+            self.calls.clear()
+            self.bytes_sent = 0
+
+    def _repo_info(self, owner: str, repo: str) -> dict:
+        size_kb = sum(len(c) for c in self.files.values()) // 1024
+        return {
+            "name": repo,
+            "full_name": f"{owner}/{repo}",
+            "description": "Synthetic project generated for AutoREADME benchmarks",
+            "default_branch": BRANCH,
+            "size": size_kb,
+            "stargazers_count": 42,
+            "forks_count": 7,
+            "language": "Python",
+            "topics": ["benchmark", "synthetic"],
+            "license": {"name": "MIT License"},
+            "homepage": None,
+            "created_at": "2024-01-01T00:00:00Z",
+            "updated_at": "2024-06-01T00:00:00Z",
+        }
+
+    def _tree(self) -> dict:
+        tree = [
+            {"path": d, "type": "tree", "mode": "040000"} for d in sorted(self.dirs)
+        ]
+        tree.extend(
+            {
+                "path": path,
+                "type": "blob",
+                "mode": "100644",
+                "sha": self.shas[path],
+                "size": len(content),
+            }
+            for path, content in sorted(self.files.items())
+        )
+        return {"sha": "0" * 40, "tree": tree, "truncated": False}
+
+    def _contents(self, path: str):
+        if path in self.files:
+            content = self.files[path]
+            return {
+                "name": path.rsplit("/", 1)[-1],
+                "path": path,
+                "sha": self.shas[path],
+                "size": len(content),
+                "type": "file",
+                "encoding": "base64",
+                "content": base64.b64encode(content).decode("ascii"),
+            }
+        if path in self.dirs:
+            prefix = path + "/"
+            names = {
+                p[len(prefix) :].split("/", 1)[0]
+                for p in self.files
+                if p.startswith(prefix)
+            }
+            return [{"name": name, "path": prefix + name} for name in sorted(names)]
+        return None
+
+    def _blob(self, sha: str):
+        if sha not in self.blobs:
+            return None
+        content = self.blobs[sha]
+        return {
+            "sha": sha,
+            "size": len(content),
+            "encoding": "base64",
+            "content": base64.b64encode(content).decode("ascii"),
+        }
+
+    def _object(self, expression: str):
+        path = expression.partition(":")[2].strip("/")
+        if path in self.files:
+            content = self.files[path]
+            binary = b"\0" in content
+            truncated = not binary and len(content) > GRAPHQL_TEXT_LIMIT
+            return {
+                "__typename": "Blob",
+                "oid": self.shas[path],
+                "byteSize": len(content),
+                "isBinary": binary,
+                "isTruncated": truncated,
+                "text": None if binary or truncated else content.decode("utf-8"),
+            }
+        if path in self.dirs:
+            entries = [{"name": item["name"]} for item in self._contents(path)]
+            return {"__typename": "Tree", "entries": entries}
+        return None
+
+    def _handle_graphql(self, request: BaseHTTPRequestHandler) -> None:
+        if urlparse(request.path).path.rstrip("/") != "/graphql":
+            return self._send(request, "other", 404, {"message": "Not Found"})
+
+        length = int(request.headers.get("Content-Length", 0))
+        variables = json.loads(request.rfile.read(length)).get("variables", {})
+        repository = {
+            f"f{name[1:]}": self._object(expression)
+            for name, expression in variables.items()
+            if name[0] == "p" and name[1:].isdigit()
+        }
+        self._send(request, "graphql", 200, {"data": {"repository": repository}})
+
+    def _build_tarball(self, repo: str) -> bytes:
+        with self._lock:
+            if self._tarball is None:
+                buffer = io.BytesIO()
+                root = f"owner-{repo}-0000000"
+                with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+                    for path, content in sorted(self.files.items()):
+                        info = tarfile.TarInfo(f"{root}/{path}")
+                        info.size = len(content)
+                        archive.addfile(info, io.BytesIO(content))
+                self._tarball = buffer.getvalue()
+            return self._tarball
+
+    def _handle(self, request: BaseHTTPRequestHandler) -> None:
+        parsed = urlparse(request.path)
+        parts = [unquote(p) for p in parsed.path.strip("/").split("/")]
+        if len(parts) < 3 or parts[0] != "repos":
+            return self._send(request, "other", 404, {"message": "Not Found"})
+
+        owner, repo, rest = parts[1], parts[2], parts[3:]
+        if not rest:
+            return self._send(request, "repo", 200, self._repo_info(owner, repo))
+        if rest[0] == "commits" and len(rest) == 2:
+            return self._send(request, "commit", 200, {"sha": "0" * 40})
+        if rest[:2] == ["git", "trees"]:
+            return self._send(request, "tree", 200, self._tree())
+        if rest[:2] == ["git", "blobs"] and len(rest) == 3:
+            payload = self._blob(rest[2])
+            if payload is None:
+                return self._send(request, "blob", 404, {"message": "Not Found"})
+            return self._send(request, "blob", 200, payload)
+        if rest[0] == "contents":
+            payload = self._contents("/".join(rest[1:]).strip("/"))
+            if payload is None:
+                return self._send(request, "contents", 404, {"message": "Not Found"})
+            return self._send(request, "contents", 200, payload)
+        if rest[0] == "tarball":
+            body = self._build_tarball(repo)
+            return self._send(request, "tarball", 200, body, "application/x-gzip")
+        return self._send(request, "other", 404, {"message": "Not Found"})
+
+    def _send(self, request, endpoint, status, payload, content_type=None) -> None:
+        if isinstance(payload, bytes):
+            body = payload
+        else:
+            body = json.dumps(payload).encode()
+            content_type = "application/json"
+
+        etag = f'"{blob_sha(body)}"'
+        if status == 200 and request.headers.get("If-None-Match") == etag:
+            status, body = 304, b""
+
+        with self._lock:
+            self.calls[endpoint] += 1
+            self.bytes_sent += len(body)
+
+        request.send_response(status)
+        request.send_header("Content-Type", content_type)
+        request.send_header("Content-Length", str(len(body)))
+        request.send_header("ETag", etag)
+        request.end_headers()
+        request.wfile.write(body)
@@ -0,0 +1,190 @@
+import re
+import json
+import time
+from pathlib import Path
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import (
+    AIMessage,
+    AIMessageChunk,
+    HumanMessage,
+    ToolMessage,
+)
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from llm.model import register_provider
+from utils.github_repo import parse_github_url
+
+SOURCE_PREFIX = "Generate a comprehensive README for: "
+_FILE_PATH = re.compile(r"[\w./-]+\.(?:py|toml|txt|json|md|cfg)\b")
+
+ANALYZER_SUMMARY = """- Tech stack: Python, FastAPI, Pydantic, SQLAlchemy
+- Dependencies: fastapi, pydantic, httpx, sqlalchemy
+- Purpose: Synthetic web service generated for benchmarks
+- Key features:
+  - Health check endpoint
+  - Record processing helpers
+- Entry points: synthetic-app = synthetic_app.main:run"""
+
+README = """# Synthetic App
+
+Synthetic web service generated for benchmarks.
+
+## Installation
+
+```bash
+pip install -e .
+```
+
+## Usage
+
+```bash
+synthetic-app
+```
+
+## License
+
+MIT
+"""
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Deterministic chat model that drives the graph like a well-behaved LLM.
+
+    Which phase it plays is decided by the bound tools: one exploration round,
+    one batched read of up to `reads` files found in the conversation, and,
+    without tools, the README itself (streamed line by line). `latency` seconds
+    are slept per call to model provider round trips. Token usage is estimated
+    at four characters a token.
+    """
+
+    latency: float = 0.0
+    reads: int = 8
+    tool_names: tuple = ()
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs) -> "ScriptedChatModel":
+        return self.model_copy(update={"tool_names": tuple(t.name for t in tools)})
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+
+        message = self._respond(list(messages))
+        message.usage_metadata = _usage(messages, message)
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+
+        message = self._respond(list(messages))
+        usage = _usage(messages, message)
+        if message.tool_calls:
+            tool_call_chunks = [
+                {
+                    "name": tc["name"],
+                    "args": json.dumps(tc["args"]),
+                    "id": tc["id"],
+                    "index": i,
+                }
+                for i, tc in enumerate(message.tool_calls)
+            ]
+            chunk = AIMessageChunk(
+                content="", tool_call_chunks=tool_call_chunks, usage_metadata=usage
+            )
+            yield ChatGenerationChunk(message=chunk)
+            return
+
+        for line in message.content.splitlines(keepends=True):
+            if run_manager:
+                run_manager.on_llm_new_token(line)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=line))
+        final = AIMessageChunk(content="", usage_metadata=usage)
+        yield ChatGenerationChunk(message=final)
+
+    def _respond(self, messages: list) -> AIMessage:
+        rounds = sum(
+            1
+            for m in messages
+            if isinstance(m, ToolMessage) and m.name in self.tool_names
+        )
+        source = _source(messages)
+        github = parse_github_url(source) if "github.com" in source else None
+
+        if not self.tool_names:
+            return AIMessage(content=README)
+
+        if {"explore_github_repo", "explore_directory"} & set(self.tool_names):
+            if rounds:
+                return AIMessage(content="Explored the repository structure.")
+            if github:
+                owner, repo = github
+                return _call(
+                    "explore_github_repo",
+                    {"owner": owner, "repo": repo},
+                    ("get_github_repo_metadata", {"owner": owner, "repo": repo}),
+                )
+            return _call("explore_directory", {"path": source})
+
+        if rounds:
+            return AIMessage(content=ANALYZER_SUMMARY)
+        paths = _candidate_paths(messages, self.reads)
+        if github:
+            owner, repo = github
+            args = {"owner": owner, "repo": repo, "filepaths": paths}
+            return _call("read_github_files", args)
+        filepaths = [str(Path(source) / p) for p in paths]
+        return _call("read_files", {"filepaths": filepaths})
+
+
+def _source(messages: list) -> str:
+    for message in messages:
+        text = str(message.content)
+        if isinstance(message, HumanMessage) and text.startswith(SOURCE_PREFIX):
+            return text[len(SOURCE_PREFIX) :].strip()
+    return ""
+
+
+def _usage(messages: list, message: AIMessage) -> dict:
+    prompt_chars = sum(len(str(m.content)) for m in messages)
+    completion_chars = len(str(message.content)) + len(str(message.tool_calls))
+    return {
+        "input_tokens": prompt_chars // 4,
+        "output_tokens": completion_chars // 4,
+        "total_tokens": (prompt_chars + completion_chars) // 4,
+    }
+
+
+def _candidate_paths(messages: list, limit: int) -> list:
+    """File paths mentioned in the compacted findings, manifests first"""
+    text = "\n".join(str(m.content) for m in messages if isinstance(m, HumanMessage))
+    found = (p[2:] if p.startswith("./") else p for p in _FILE_PATH.findall(text))
+    paths = list(dict.fromkeys(found))
+    paths.sort(key=lambda p: (not p.endswith((".toml", ".txt")), p.count("/")))
+    return paths[:limit]
+
+
+def _call(name: str, args: dict, *more: tuple) -> AIMessage:
+    calls = [(name, args), *more]
+    return AIMessage(
+        content="",
+        tool_calls=[
+            {"name": n, "args": a, "id": f"call_{i}_{n}", "type": "tool_call"}
+            for i, (n, a) in enumerate(calls)
+        ],
+    )
+
+
+def register_fake_provider(
+    latency: float = 0.0, reads: int = 8, name: str = "fake"
+) -> str:
+    """Register the scripted model as an LLM provider and return its name"""
+
+    def factory(model_name: str, temperature: float) -> ScriptedChatModel:
+        return ScriptedChatModel(latency=latency, reads=reads)
+
+    register_provider(name, factory)
+    return name
@@ -0,0 +1,121 @@
+"""
+CLI startup benchmark.
+
+Times fresh interpreter runs of the cheap CLI paths (--help, --dry-run)
+against importing the full graph, which every invocation paid before the
+LangChain/LangGraph imports were made lazy:
+
+    python benchmarks/import_time.py --repeat 10
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import shutil
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+MAIN = SRC / "main.py"
+
+
+def _time(command: list, repeat: int, env: dict) -> dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        completed = subprocess.run(command, env=env, capture_output=True, text=True)
+        samples.append(time.perf_counter() - started)
+    return {
+        "median": round(statistics.median(samples), 4),
+        "min": round(min(samples), 4),
+        "exit_code": completed.returncode,
+        "stderr": completed.stderr.strip().splitlines()[-1:],
+    }
+
+
+def _slowest_imports(statement: str, env: dict, limit: int) -> list:
+    """Modules with the largest cumulative import time (python -X importtime)"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Nested imports are indented below the module that triggered them
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            rows.append((int(cumulative), name.strip()))
+    rows.sort(reverse=True)
+    return [{"module": name, "ms": round(us / 1000, 1)} for us, name in rows[:limit]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AutoREADME CLI startup benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per command")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports shown")
+    parser.add_argument("--output", help="Write the results JSON to this file")
+    args = parser.parse_args()
+
+    pythonpath = os.pathsep.join(filter(None, [str(SRC), os.getenv("PYTHONPATH")]))
+    env = dict(os.environ, PYTHONPATH=pythonpath, PYTHONDONTWRITEBYTECODE="1")
+    env.setdefault("GROQ_API_KEY", "dry-run")
+
+    project = tempfile.mkdtemp(prefix="autoreadme-startup-")
+    commands = {
+        "python (baseline)": [sys.executable, "-c", "pass"],
+        "main.py --help": [sys.executable, str(MAIN), "--help"],
+        "main.py --dry-run": [
+            sys.executable,
+            str(MAIN),
+            "--repo",
+            project,
+            "--output",
+            project,
+            "--dry-run",
+        ],
+        "import graph.workflow": [sys.executable, "-c", "import graph.workflow"],
+    }
+
+    results = {}
+    try:
+        for name, command in commands.items():
+            results[name] = _time(command, args.repeat, env)
+    finally:
+        shutil.rmtree(project, ignore_errors=True)
+
+    print(f"{'command':<24}{'median s':>10}{'min s':>10}  exit")
+    print("-" * 50)
+    for name, r in results.items():
+        print(f"{name:<24}{r['median']:>10.3f}{r['min']:>10.3f}  {r['exit_code']}")
+
+    failed = {name: r for name, r in results.items() if r["exit_code"]}
+    for name, r in failed.items():
+        print(f"   ! {name} failed: {' '.join(r['stderr'])}")
+
+    eager = results["import graph.workflow"]["median"]
+    lazy = results["main.py --help"]["median"]
+    if lazy and not failed:
+        print(f"\n--help starts {eager / lazy:.1f}x faster than loading the graph")
+
+    slowest = _slowest_imports("import graph.workflow", env, args.top)
+    if slowest:
+        print("\nSlowest imports deferred until a run starts:")
+        for row in slowest:
+            print(f"   {row['ms']:>8.1f} ms  {row['module']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"commands": results, "slowest_imports": slowest}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
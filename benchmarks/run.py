@@ -0,0 +1,283 @@
+"""
+Offline benchmarks for the README generation pipeline.
+
+Runs the full graph against synthetic repositories with a scripted chat model
+and a local GitHub API stand-in, so results only depend on this code base:
+
+    python benchmarks/run.py --sizes 100 1000 10000 --modes github snapshot local
+    python benchmarks/run.py --save-baseline
+    python benchmarks/run.py --compare benchmarks/baseline.json
+"""
+
+import os
+import sys
+import json
+import asyncio
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+# Never touch the network or caches left behind by earlier runs
+os.environ["GITHUB_BLOB_CACHE"] = "0"
+os.environ.pop("GITHUB_SNAPSHOT_DIR", None)
+os.environ.pop("GITHUB_TOKEN", None)
+# The local server has no quota; pacing to GitHub's anonymous limit would skew timings
+os.environ["GITHUB_RATE_LIMIT"] = "0"
+
+from graph.runner import arun_repo, run_repo  # noqa: E402
+from graph.workflow import app  # noqa: E402
+from utils.github_repo import reset_run_cache  # noqa: E402
+from fake_github import FakeGitHub  # noqa: E402
+from fake_llm import register_fake_provider  # noqa: E402
+from synthetic_repo import generate_repo, write_repo  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+MODES = ("github", "graphql", "snapshot", "local")
+
+# Timing and memory may drift by the tolerance; call counts must not grow
+TIMED_METRICS = ("seconds", "peak_mb")
+COUNTED_METRICS = ("api_calls", "github_calls", "llm_calls", "tool_calls")
+
+
+def _median(values: list) -> float:
+    return round(statistics.median(values), 4) if values else 0.0
+
+
+def run_once(repo: str, config: dict, trace_memory: bool, use_async: bool) -> dict:
+    output = tempfile.mkdtemp(prefix="autoreadme-bench-out-")
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        started = time.perf_counter()
+        if use_async:
+            result = asyncio.run(arun_repo(app, repo, output, config))
+        else:
+            result = run_repo(app, repo, output, config)
+        seconds = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else 0
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        shutil.rmtree(output, ignore_errors=True)
+
+    telemetry = result["telemetry"]
+    totals = telemetry["totals"]
+    return {
+        "status": result["status"],
+        "error": result.get("error"),
+        "seconds": seconds,
+        "peak_mb": peak / 1024 / 1024,
+        "github_calls": totals["github_calls"],
+        "llm_calls": totals["llm_calls"],
+        "tool_calls": totals["tool_calls"],
+        "prompt_tokens": totals["prompt_tokens"],
+        "node_seconds": {n: c["seconds"] for n, c in telemetry["nodes"].items()},
+        "tool_seconds": {t: c["seconds"] for t, c in telemetry["tools"].items()},
+    }
+
+
+def run_scenario(mode: str, size: int, args, config: dict) -> dict:
+    """Warm up, then run one mode/size combination `args.repeat` times"""
+    files = generate_repo(size, seed=args.seed)
+    runs = []
+
+    if mode == "local":
+        root = Path(tempfile.mkdtemp(prefix="autoreadme-bench-src-"))
+        try:
+            write_repo(files, root)
+            for _ in range(args.warmup + args.repeat):
+                run = run_once(str(root), config, args.trace_memory, args.use_async)
+                run["api_calls"] = 0
+                runs.append(run)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+    else:
+        os.environ["GITHUB_SNAPSHOT"] = "1" if mode == "snapshot" else "0"
+        if mode == "graphql":
+            # Batch reads through GraphQL are only used with a token
+            os.environ["GITHUB_TOKEN"] = "benchmark"
+        else:
+            os.environ.pop("GITHUB_TOKEN", None)
+        snapshot_dir = tempfile.mkdtemp(prefix="autoreadme-bench-snap-")
+        os.environ["GITHUB_SNAPSHOT_DIR"] = snapshot_dir
+        with FakeGitHub(files) as server:
+            os.environ["GITHUB_API_URL"] = server.api_url
+            for i in range(args.warmup + args.repeat):
+                # A fresh repo name per run keeps every in-process cache cold
+                repo = f"https://github.com/bench/synthetic-{size}-{mode}-{i}"
+                server.reset_counters()
+                run = run_once(repo, config, args.trace_memory, args.use_async)
+                run["api_calls"] = sum(server.calls.values())
+                run["api_calls_by_endpoint"] = dict(server.calls)
+                run["api_bytes"] = server.bytes_sent
+                runs.append(run)
+                reset_run_cache()
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+    measured = runs[args.warmup :]
+    failures = [r for r in measured if r["status"] != "ok"]
+    summary = {
+        "mode": mode,
+        "files": size,
+        "runs": len(measured),
+        "failures": len(failures),
+        "seconds_min": round(min(r["seconds"] for r in measured), 4),
+    }
+    if failures:
+        summary["error"] = failures[0].get("error") or failures[0]["status"]
+
+    for metric in TIMED_METRICS + COUNTED_METRICS + ("prompt_tokens", "api_bytes"):
+        summary[metric] = _median([r.get(metric, 0) for r in measured])
+    for group in ("node_seconds", "tool_seconds"):
+        names = sorted({name for r in measured for name in r[group]})
+        summary[group] = {
+            name: _median([r[group].get(name, 0.0) for r in measured]) for name in names
+        }
+    if "api_calls_by_endpoint" in measured[-1]:
+        summary["api_calls_by_endpoint"] = measured[-1]["api_calls_by_endpoint"]
+    return summary
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Regressions of `results` against `baseline`, one message per metric"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for metric in TIMED_METRICS:
+            old, new = previous.get(metric, 0), current.get(metric, 0)
+            if old and new > old * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {metric} {old} -> {new} (+{(new / old - 1) * 100:.0f}%)"
+                )
+        for metric in COUNTED_METRICS:
+            old, new = previous.get(metric, 0), current.get(metric, 0)
+            if new > old:
+                regressions.append(f"{name}: {metric} {old} -> {new}")
+    return regressions
+
+
+def print_table(results: dict, baseline: dict) -> None:
+    header = f"{'scenario':<22}{'seconds':>10}{'peak MB':>10}{'API':>8}{'LLM':>6}"
+    print(header + f"{'tools':>7}  vs baseline")
+    print("-" * (len(header) + 20))
+    for name, r in results.items():
+        previous = baseline.get("scenarios", {}).get(name, {})
+        delta = ""
+        if previous.get("seconds"):
+            delta = f"{(r['seconds'] / previous['seconds'] - 1) * 100:+.0f}% time"
+        print(
+            f"{name:<22}{r['seconds']:>10.3f}{r['peak_mb']:>10.1f}"
+            f"{r['api_calls']:>8.0f}{r['llm_calls']:>6.0f}{r['tool_calls']:>7.0f}"
+            f"  {delta}"
+        )
+        if r["failures"]:
+            print(f"   ! {r['failures']} failed run(s): {r.get('error')}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="AutoREADME offline benchmarks")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="Repo sizes"
+    )
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--repeat", type=int, default=3, help="Measured runs each")
+    parser.add_argument("--warmup", type=int, default=1, help="Discarded runs each")
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic repo seed")
+    parser.add_argument(
+        "--llm-latency",
+        type=float,
+        default=0.0,
+        help="Seconds the fake model sleeps per call, to model provider latency",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Measure peak Python memory with tracemalloc (slows runs down)",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Drive the graph with app.astream instead of app.stream",
+    )
+    parser.add_argument("--output", help="Write the results JSON to this file")
+    parser.add_argument(
+        "--save-baseline",
+        nargs="?",
+        const=str(DEFAULT_BASELINE),
+        help=f"Store the results as the baseline (default: {DEFAULT_BASELINE.name})",
+    )
+    parser.add_argument("--compare", help="Baseline file to compare the results to")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative slowdown and memory growth (default: 0.2)",
+    )
+    args = parser.parse_args()
+
+    provider = register_fake_provider(latency=args.llm_latency)
+    config = {
+        "configurable": {
+            "provider": provider,
+            "model_name": "scripted",
+            "cache": False,
+            "incremental": False,
+        },
+        "recursion_limit": 50,
+    }
+
+    results = {}
+    for mode in args.modes:
+        for size in args.sizes:
+            name = f"{mode}-{size}"
+            print(f"> {name} ...", flush=True)
+            results[name] = run_scenario(mode, size, args, config)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print()
+    print_table(results, baseline)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "llm_latency": args.llm_latency,
+            "trace_memory": args.trace_memory,
+            "async": args.use_async,
+        },
+        "scenarios": results,
+    }
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {path}")
+
+    if args.compare:
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("\nNo regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+import random
+import hashlib
+from pathlib import Path
+
+PACKAGE = "synthetic_app"
+
+PYPROJECT = """[project]
+name = "synthetic-app"
+version = "0.1.0"
+description = "Synthetic project generated for AutoREADME benchmarks"
+dependencies = ["fastapi>=0.110", "pydantic>=2", "httpx", "sqlalchemy"]
+
+[project.optional-dependencies]
+dev = ["pytest", "ruff"]
+
+[project.scripts]
+synthetic-app = "synthetic_app.main:run"
+"""
+
+REQUIREMENTS = "fastapi>=0.110\npydantic>=2\nhttpx\nsqlalchemy\n"
+
+MAIN = '''"""Entry point of the synthetic application"""
+from fastapi import FastAPI
+
+app = FastAPI(title="Synthetic App")
+
+
+@app.get("/health")
+def health() -> dict:
+    return {"status": "ok"}
+
+
+def run() -> None:
+    import uvicorn
+
+    uvicorn.run(app)
+'''
+
+MODULE = '''"""Module {index} of package {package}"""
+from dataclasses import dataclass
+
+
+@dataclass
+class Record{index}:
+    name: str
+    value: int = {value}
+
+
+def process_{index}(records: list) -> int:
+    """Sum the values of the given records"""
+    total = 0
+    for record in records:
+        total += record.value
+    return total
+'''
+
+
+def blob_sha(content: bytes) -> str:
+    """Git blob SHA of a file's content, as the tree API reports it"""
+    header = f"blob {len(content)}\0".encode()
+    return hashlib.sha1(header + content).hexdigest()
+
+
+def generate_repo(num_files: int, seed: int = 0) -> dict:
+    """
+    Deterministic synthetic Python project with about `num_files` files.
+
+    Besides the top-level manifests and entry point, files are spread over
+    nested source packages, tests and docs so that ignore rules, depth limits
+    and file sizes all come into play. Returns path -> bytes.
+    """
+    rng = random.Random(seed)
+    files = {
+        "README.md": b"# Synthetic App\n\nPlaceholder README.\n",
+        "LICENSE": b"MIT License\n\nCopyright (c) Synthetic Authors\n",
+        "pyproject.toml": PYPROJECT.encode(),
+        "requirements.txt": REQUIREMENTS.encode(),
+        "Dockerfile": b'FROM python:3.12-slim\nCMD ["synthetic-app"]\n',
+        f"src/{PACKAGE}/__init__.py": b"",
+        f"src/{PACKAGE}/main.py": MAIN.encode(),
+    }
+
+    index = 0
+    while len(files) < num_files:
+        kind = rng.random()
+        if kind < 0.7:
+            depth = rng.randint(0, 3)
+            dirs = [f"pkg_{rng.randint(0, 20)}" for _ in range(depth)]
+            path = "/".join(["src", PACKAGE, *dirs, f"module_{index}.py"])
+            body = MODULE.format(index=index, package=PACKAGE, value=rng.randint(1, 99))
+            # Some modules are much larger to exercise truncation
+            body *= rng.choice((1, 1, 1, 4, 20))
+        elif kind < 0.85:
+            path = f"tests/test_module_{index}.py"
+            body = f"def test_{index}():\n    assert {index} == {index}\n"
+        elif kind < 0.95:
+            path = f"docs/page_{index}.md"
+            body = f"# Page {index}\n\n" + "Lorem ipsum dolor sit amet. " * 40
+        else:
+            path = f"assets/data_{index}.json"
+            body = '{"index": %d, "values": [%s]}\n' % (
+                index,
+                ", ".join(str(rng.randint(0, 1000)) for _ in range(50)),
+            )
+        files[path] = body.encode()
+        index += 1
+
+    return files
+
+
+def write_repo(files: dict, root: Path) -> Path:
+    """Materialize a generated repo on disk for local-path runs"""
+    root = Path(root)
+    for path, content in files.items():
+        target = root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+    return root
@@ -1,8 +1,111 @@
-from llm.model import LLM
+import threading
+from llm.model import get_shared_model, model_stats
+from agents.response_cache import CachedAgent, get_response_cache
+from agents.routing import agent_settings, escalation_target
+from utils.telemetry import record
 
+# Tool-bound models keyed by (provider, model, temperature, tool names)
+_agents: dict = {}
+_lock = threading.Lock()
+_stats = {"agents_created": 0, "agents_reused": 0}
 
-def create_agent(provider: str, model_name: str, tools: list):
 
-    factory = LLM(provider=provider)
-    llm = factory.get_model(model_name=model_name)
-    return llm.bind_tools(tools)
+def create_agent(
+    provider: str,
+    model_name: str,
+    tools: list,
+    cache: bool = False,
+    temperature: float = 0.5,
+):
+
+    key = (provider, model_name, temperature, tuple(t.name for t in tools))
+    with _lock:
+        agent = _agents.get(key)
+        if agent is None:
+            llm = get_shared_model(provider, model_name, temperature)
+            agent = llm.bind_tools(tools) if tools else llm
+            _agents[key] = agent
+            _stats["agents_created"] += 1
+        else:
+            _stats["agents_reused"] += 1
+
+    response_cache = get_response_cache() if cache else None
+    if response_cache:
+        return CachedAgent(
+            agent, response_cache, provider, model_name, temperature, tools
+        )
+    return agent
+
+
+class EscalatingAgent:
+    """
+    A smaller model that hands a turn to a larger one when its tool calls are
+    unusable: malformed, naming a tool it doesn't have, or missing arguments.
+    """
+
+    def __init__(self, agent, fallback, tools: list):
+        self.agent = agent
+        self.fallback = fallback
+        self.tools = {t.name: t for t in tools}
+
+    def usable(self, response) -> bool:
+        if getattr(response, "invalid_tool_calls", None):
+            return False
+        for call in getattr(response, "tool_calls", None) or []:
+            tool = self.tools.get(call["name"])
+            if tool is None:
+                return False
+            schema = tool.tool_call_schema
+            if hasattr(schema, "model_validate"):
+                try:
+                    schema.model_validate(call.get("args") or {})
+                except Exception:
+                    return False
+        return True
+
+    def invoke(self, messages, *args, **kwargs):
+        response = self.agent.invoke(messages, *args, **kwargs)
+        if self.usable(response):
+            return response
+        record(model_escalations=1)
+        return self.fallback.invoke(messages, *args, **kwargs)
+
+    async def ainvoke(self, messages, *args, **kwargs):
+        response = await self.agent.ainvoke(messages, *args, **kwargs)
+        if self.usable(response):
+            return response
+        record(model_escalations=1)
+        return await self.fallback.ainvoke(messages, *args, **kwargs)
+
+
+def agent_for(agent_name: str, config: dict, tools: list):
+    """The agent for one graph role, with that role's provider, model and temperature"""
+    settings = agent_settings(config, agent_name)
+    cache = config.get("configurable", {}).get("cache", False)
+    agent = create_agent(
+        settings["provider"],
+        settings["model_name"],
+        tools,
+        cache=cache,
+        temperature=settings["temperature"],
+    )
+
+    target = escalation_target(config, settings) if tools else None
+    if target is None:
+        return agent
+    fallback = create_agent(
+        target["provider"],
+        target["model_name"],
+        tools,
+        cache=cache,
+        temperature=target["temperature"],
+    )
+    return EscalatingAgent(agent, fallback, tools)
+
+
+def client_stats() -> dict:
+    """Created versus reused counters for chat models and tool-bound agents"""
+    with _lock:
+        stats = dict(_stats)
+    stats.update(model_stats())
+    return stats
@@ -0,0 +1,234 @@
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Sequence
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from utils.telemetry import record
+
+DEFAULT_CACHE_PATH = Path("~/.cache/autoreadme/llm_responses.sqlite").expanduser()
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class ResponseCache:
+    """SQLite-backed store of LLM responses with TTL and size-based eviction"""
+
+    def __init__(
+        self,
+        path: Path,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if missing or expired"""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            if self.ttl_seconds and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+
+            conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+            return row[0]
+
+    def put(self, key: str, value: str) -> None:
+        """Store a value and evict expired and least recently used entries"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if self.ttl_seconds:
+                conn.execute(
+                    "DELETE FROM responses WHERE created_at < ?",
+                    (now - self.ttl_seconds,),
+                )
+            conn.execute(
+                "DELETE FROM responses WHERE key NOT IN ("
+                "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+
+
+def _normalize_message(message: BaseMessage) -> dict:
+    """Keep only the parts of a message that influence the completion"""
+    content = message.content
+    if isinstance(content, str):
+        content = content.strip()
+
+    normalized = {"type": message.type, "content": content}
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        # Tool call IDs are random per completion and don't change the answer
+        normalized["tool_calls"] = [
+            {"name": tc["name"], "args": tc["args"]} for tc in tool_calls
+        ]
+    return normalized
+
+
+def cache_key(
+    provider: str,
+    model_name: str,
+    temperature: float,
+    tools: list,
+    messages: Sequence[BaseMessage],
+) -> str:
+    """Stable hash of everything that determines a completion"""
+    payload = {
+        "provider": provider,
+        "model": model_name,
+        "temperature": temperature,
+        "tools": [convert_to_openai_tool(t) for t in tools],
+        "messages": [_normalize_message(m) for m in messages],
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class CachedAgent:
+    """Wraps a tool-bound chat model and replays stored responses for repeated inputs"""
+
+    def __init__(
+        self,
+        agent,
+        cache: ResponseCache,
+        provider: str,
+        model_name: str,
+        temperature: float,
+        tools: list,
+    ):
+        self.agent = agent
+        self.cache = cache
+        self.provider = provider
+        self.model_name = model_name
+        self.temperature = temperature
+        self.tools = tools
+
+    def invoke(self, messages: Sequence[BaseMessage], *args, **kwargs) -> BaseMessage:
+        key = cache_key(
+            self.provider, self.model_name, self.temperature, self.tools, messages
+        )
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            record(llm_cache_hits=1)
+            return messages_from_dict([json.loads(cached)])[0]
+
+        response = self.agent.invoke(messages, *args, **kwargs)
+        if not getattr(response, "invalid_tool_calls", None):
+            self.cache.put(key, json.dumps(message_to_dict(response)))
+        return response
+
+    def stream(self, messages: Sequence[BaseMessage], *args, **kwargs):
+        """Like invoke, but yields chunks; a cached response comes as one chunk"""
+        key = cache_key(
+            self.provider, self.model_name, self.temperature, self.tools, messages
+        )
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            record(llm_cache_hits=1)
+            yield messages_from_dict([json.loads(cached)])[0]
+            return
+
+        response = None
+        for chunk in self.agent.stream(messages, *args, **kwargs):
+            response = chunk if response is None else response + chunk
+            yield chunk
+        if response is not None and not getattr(response, "invalid_tool_calls", None):
+            self.cache.put(key, json.dumps(message_to_dict(response)))
+
+    async def ainvoke(
+        self, messages: Sequence[BaseMessage], *args, **kwargs
+    ) -> BaseMessage:
+        key = cache_key(
+            self.provider, self.model_name, self.temperature, self.tools, messages
+        )
+
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            record(llm_cache_hits=1)
+            return messages_from_dict([json.loads(cached)])[0]
+
+        response = await self.agent.ainvoke(messages, *args, **kwargs)
+        if not getattr(response, "invalid_tool_calls", None):
+            value = json.dumps(message_to_dict(response))
+            await asyncio.to_thread(self.cache.put, key, value)
+        return response
+
+    async def astream(self, messages: Sequence[BaseMessage], *args, **kwargs):
+        key = cache_key(
+            self.provider, self.model_name, self.temperature, self.tools, messages
+        )
+
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            record(llm_cache_hits=1)
+            yield messages_from_dict([json.loads(cached)])[0]
+            return
+
+        response = None
+        async for chunk in self.agent.astream(messages, *args, **kwargs):
+            response = chunk if response is None else response + chunk
+            yield chunk
+        if response is not None and not getattr(response, "invalid_tool_calls", None):
+            value = json.dumps(message_to_dict(response))
+            await asyncio.to_thread(self.cache.put, key, value)
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide response cache configured from LLM_CACHE_* env vars"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            path = os.getenv("LLM_CACHE_PATH")
+            try:
+                _cache = ResponseCache(
+                    Path(path).expanduser() if path else DEFAULT_CACHE_PATH,
+                    ttl_seconds=int(os.getenv("LLM_CACHE_TTL", DEFAULT_TTL_SECONDS)),
+                    max_entries=int(
+                        os.getenv("LLM_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+                    ),
+                )
+            except (OSError, sqlite3.Error):
+                return None
+        return _cache
@@ -0,0 +1,82 @@
+import os
+from typing import Optional
+from llm.providers import DEFAULT_MODELS, DEFAULT_PROVIDER, is_provider
+
+AGENTS = ("explorer", "analyzer", "writer")
+DEFAULT_MODEL = DEFAULT_MODELS[DEFAULT_PROVIDER]
+DEFAULT_TEMPERATURE = 0.5
+
+
+def parse_model_spec(spec: str) -> dict:
+    """
+    {"provider", "model_name"} from "provider:model", {"model_name"} from "model".
+
+    Only a known or registered provider is split off, since model names may
+    contain colons themselves ("ft:gpt-4o-mini:org::id", "llama3:8b").
+    """
+    spec = spec.strip()
+    provider, sep, model_name = spec.partition(":")
+    if sep and model_name and is_provider(provider):
+        return {"provider": provider, "model_name": model_name}
+    return {"model_name": spec}
+
+
+def _agent_env(agent: str) -> dict:
+    """Settings from <AGENT>_MODEL and <AGENT>_TEMPERATURE"""
+    settings = {}
+    spec = os.getenv(f"{agent.upper()}_MODEL")
+    if spec:
+        settings.update(parse_model_spec(spec))
+    temperature = os.getenv(f"{agent.upper()}_TEMPERATURE")
+    if temperature:
+        settings["temperature"] = float(temperature)
+    return settings
+
+
+def agent_settings(config: dict, agent: str) -> dict:
+    """
+    Provider, model and temperature for one agent.
+
+    Each comes from the agent's own settings in config["configurable"]["agents"]
+    (a "model" spec and "temperature"), then <AGENT>_MODEL/<AGENT>_TEMPERATURE,
+    then the run's provider and model.
+    """
+    setup = config.get("configurable", {})
+    own = dict((setup.get("agents") or {}).get(agent) or {})
+    if own.get("model"):
+        own.update(parse_model_spec(own.pop("model")))
+
+    settings = {
+        "provider": setup.get("provider", DEFAULT_PROVIDER),
+        "model_name": setup.get("model_name", DEFAULT_MODEL),
+        "temperature": DEFAULT_TEMPERATURE,
+    }
+    for source in (_agent_env(agent), own):
+        settings.update({k: v for k, v in source.items() if v is not None})
+    return settings
+
+
+def escalation_target(config: dict, settings: dict) -> Optional[dict]:
+    """
+    The run's main model, if escalation is on and `settings` is a different one.
+
+    With MODEL_ESCALATION (or configurable["escalate"]) set, a turn whose tool
+    calls are unusable is retried on the main model at the same temperature.
+    """
+    setup = config.get("configurable", {})
+    enabled = setup.get("escalate")
+    if enabled is None:
+        enabled = os.getenv("MODEL_ESCALATION", "").lower() in ("1", "true", "yes")
+    if not enabled:
+        return None
+
+    target = {
+        "provider": setup.get("provider", DEFAULT_PROVIDER),
+        "model_name": setup.get("model_name", DEFAULT_MODEL),
+        "temperature": settings["temperature"],
+    }
+    same = (target["provider"], target["model_name"]) == (
+        settings["provider"],
+        settings["model_name"],
+    )
+    return None if same else target
@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CHECKPOINT_PATH = Path("~/.cache/autoreadme/checkpoints.sqlite").expanduser()
+
+# Failed runs stay resumable this long; finished runs drop their checkpoints
+DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def checkpoint_path() -> Path:
+    path = os.getenv("AUTOREADME_CHECKPOINT_PATH")
+    return Path(path).expanduser() if path else DEFAULT_CHECKPOINT_PATH
+
+
+def new_run_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def saved_config(config: dict) -> dict:
+    """The JSON-safe part of a run config, which a resumed run starts from"""
+    configurable = dict(config.get("configurable") or {})
+    configurable.pop("thread_id", None)
+    saved = {"configurable": configurable}
+    for key in ("recursion_limit", "max_concurrency"):
+        if key in config:
+            saved[key] = config[key]
+    return saved
+
+
+def thread_config(config: dict, run_id: str) -> dict:
+    """`config` with the run ID as the checkpoint thread"""
+    configurable = {**(config.get("configurable") or {}), "thread_id": run_id}
+    return {**config, "configurable": configurable}
+
+
+class RunStore:
+    """What each checkpointed run was started with, so --resume needs only its ID"""
+
+    def __init__(self, path: Path, max_age_seconds: float = DEFAULT_MAX_AGE_SECONDS):
+        self.path = Path(path)
+        self.max_age_seconds = max_age_seconds
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                "run_id TEXT PRIMARY KEY, repo TEXT NOT NULL, "
+                "output_path TEXT NOT NULL, example_readme TEXT NOT NULL, "
+                "config TEXT NOT NULL, status TEXT NOT NULL, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def create(
+        self, run_id: str, repo: str, output_path: str, config: dict, example: str
+    ) -> None:
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, 'running', ?, ?)",
+                (
+                    run_id,
+                    repo,
+                    output_path,
+                    example,
+                    json.dumps(saved_config(config)),
+                    now,
+                    now,
+                ),
+            )
+
+    def get(self, run_id: str) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT repo, output_path, example_readme, config, status, "
+                "created_at FROM runs WHERE run_id = ?",
+                (run_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "run_id": run_id,
+            "repo": row[0],
+            "output_path": row[1],
+            "example_readme": row[2],
+            "config": json.loads(row[3]),
+            "status": row[4],
+            "created_at": row[5],
+        }
+
+    def set_status(self, run_id: str, status: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?",
+                (status, time.time(), run_id),
+            )
+
+    def expire(self) -> list:
+        """Forget runs untouched for max_age_seconds; returns their IDs"""
+        cutoff = time.time() - self.max_age_seconds
+        with self._connect() as conn:
+            run_ids = [
+                row[0]
+                for row in conn.execute(
+                    "SELECT run_id FROM runs WHERE updated_at < ?", (cutoff,)
+                )
+            ]
+            conn.execute("DELETE FROM runs WHERE updated_at < ?", (cutoff,))
+        return run_ids
+
+
+def get_run_store() -> RunStore:
+    """Process-wide run store next to the checkpoints"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = RunStore(
+                checkpoint_path(),
+                max_age_seconds=float(
+                    os.getenv("AUTOREADME_CHECKPOINT_MAX_AGE", DEFAULT_MAX_AGE_SECONDS)
+                ),
+            )
+        return _store
+
+
+@contextmanager
+def checkpointer():
+    """SQLite checkpointer for invoke/stream, with expired runs removed"""
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    store = get_run_store()
+    with SqliteSaver.from_conn_string(str(store.path)) as saver:
+        for run_id in store.expire():
+            saver.delete_thread(run_id)
+        yield saver
+
+
+@asynccontextmanager
+async def acheckpointer():
+    """checkpointer() for ainvoke/astream"""
+    from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+    store = get_run_store()
+    async with AsyncSqliteSaver.from_conn_string(str(store.path)) as saver:
+        for run_id in store.expire():
+            await saver.adelete_thread(run_id)
+        yield saver
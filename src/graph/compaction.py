@@ -0,0 +1,290 @@
+import json
+import os
+import re
+from langchain_core.messages import (
+    AIMessage,
+    HumanMessage,
+    RemoveMessage,
+    ToolMessage,
+)
+from graph.state import AgentState
+from tools.github_tools import CONFIG_FILES, SOURCE_EXTENSIONS
+
+# Upper bounds for what is carried forward into later phases
+MAX_LISTED_FILES = 40
+MAX_TREE_LINES = 120
+
+
+def _parse_json(content) -> dict:
+    try:
+        data = json.loads(content)
+    except (TypeError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _tool_results(messages: list) -> list:
+    """(tool name, args, content) for every tool call answered in `messages`"""
+    calls = {}
+    for msg in messages:
+        if isinstance(msg, AIMessage):
+            for tc in msg.tool_calls or []:
+                calls[tc.get("id")] = tc
+
+    results = []
+    for msg in messages:
+        if isinstance(msg, ToolMessage):
+            call = calls.get(msg.tool_call_id, {})
+            name = msg.name or call.get("name", "")
+            results.append((name, call.get("args", {}), msg.content))
+    return results
+
+
+def files_touched(messages: list) -> tuple:
+    """(files read in full, files outlined) by the read tools in `messages`"""
+    read, outlined = [], []
+    for name, args, _ in _tool_results(messages):
+        if name in ("read_file", "read_github_file") and args.get("filepath"):
+            read.append(args["filepath"])
+        elif name in ("read_files", "read_github_files"):
+            read.extend(args.get("filepaths", []))
+        elif name in ("read_file_outline", "read_github_file_outline"):
+            outlined.extend(args.get("filepaths", []))
+    return read, outlined
+
+
+def last_ai_text(messages: list) -> str:
+    for msg in reversed(messages):
+        if isinstance(msg, AIMessage) and isinstance(msg.content, str):
+            if msg.content.strip():
+                return msg.content.strip()
+    return ""
+
+
+def _flatten_local_tree(node: dict, prefix: str = "") -> list:
+    """(relative path, size) for every file in an explore_directory result"""
+    files = []
+    for name, child in node.get("children", {}).items():
+        path = f"{prefix}{name}"
+        if child.get("type") == "directory":
+            files.extend(_flatten_local_tree(child, f"{path}/"))
+        else:
+            files.append((path, child.get("size", 0)))
+    return files
+
+
+def _render_local_tree(node: dict, indent: str = "", lines: list = None) -> list:
+    lines = [] if lines is None else lines
+    for name, child in node.get("children", {}).items():
+        if len(lines) >= MAX_TREE_LINES:
+            lines.append(f"{indent}...")
+            break
+        is_dir = child.get("type") == "directory"
+        lines.append(f"{indent}{name}{'/' if is_dir else ''}")
+        if is_dir:
+            _render_local_tree(child, indent + "  ", lines)
+    return lines
+
+
+def _local_findings(tree: dict, project_path: str) -> tuple:
+    """directory_structure and key_files from an explore_directory result"""
+    files = _flatten_local_tree(tree)
+    root = project_path or ""
+
+    config_files, source_files, main_directories = [], [], {}
+    for path, size in files:
+        parts = path.split("/")
+        filename = parts[-1]
+        ext = f".{filename.split('.')[-1]}" if "." in filename else ""
+
+        if filename in CONFIG_FILES:
+            config_files.append(os.path.join(root, path))
+        if ext in SOURCE_EXTENSIONS:
+            source_files.append((len(parts), -size, os.path.join(root, path)))
+        if len(parts) > 1:
+            main_directories[parts[0]] = main_directories.get(parts[0], 0) + 1
+
+    source_files.sort()
+    directory_structure = {
+        "total_files": len(files),
+        "main_directories": main_directories,
+        "tree": "\n".join(_render_local_tree(tree)),
+    }
+    key_files = {
+        "config_files": config_files[:MAX_LISTED_FILES],
+        "source_files": [p for _, _, p in source_files[:MAX_LISTED_FILES]],
+    }
+    return directory_structure, key_files
+
+
+def render_findings(state: dict) -> str:
+    """Compact, human-readable digest of the structured analysis fields"""
+    sections = []
+
+    if state.get("repo_metadata"):
+        sections.append(
+            "Repository metadata:\n" + json.dumps(state["repo_metadata"], indent=2)
+        )
+
+    structure = dict(state.get("directory_structure") or {})
+    tree = structure.pop("tree", "")
+    if structure:
+        sections.append("Directory structure:\n" + json.dumps(structure, indent=2))
+    if tree:
+        sections.append(f"Directory tree:\n{tree}")
+
+    if state.get("key_files"):
+        sections.append("Key files:\n" + json.dumps(state["key_files"], indent=2))
+
+    for field, title in [
+        ("tech_stack", "Tech stack"),
+        ("dependencies", "Dependencies"),
+        ("entry_points", "Entry points"),
+    ]:
+        if state.get(field):
+            sections.append(f"{title}:\n" + json.dumps(state[field], indent=2))
+
+    if state.get("project_purpose"):
+        sections.append(f"Purpose:\n{state['project_purpose']}")
+
+    return "\n\n".join(sections)
+
+
+def _compacted_messages(messages: list, summary: str) -> list:
+    """Drop everything except the original request and append `summary`"""
+    removals = [RemoveMessage(id=m.id) for m in messages[1:] if m.id]
+    return removals + [HumanMessage(content=summary)]
+
+
+def compact_explorer_node(state: AgentState) -> AgentState:
+    """Fold explorer tool output into state and replace the transcript with a digest"""
+    messages = list(state["messages"])
+    update = {
+        "directory_structure": dict(state.get("directory_structure") or {}),
+        "key_files": dict(state.get("key_files") or {}),
+        "repo_metadata": dict(state.get("repo_metadata") or {}),
+    }
+
+    for name, args, content in _tool_results(messages):
+        data = _parse_json(content)
+        if not data or "error" in data:
+            continue
+
+        if name == "explore_github_repo":
+            update["directory_structure"].update(
+                {
+                    "total_files": data.get("total_files", 0),
+                    "total_dirs": data.get("total_dirs", 0),
+                    "main_directories": data.get("main_directories", {}),
+                    "file_extensions": data.get("file_extensions", {}),
+                }
+            )
+            update["key_files"].update(
+                {
+                    "config_files": data.get("config_files", []),
+                    "source_files": data.get("source_files", []),
+                    "readme_path": data.get("readme_path"),
+                    "license_path": data.get("license_path"),
+                }
+            )
+        elif name == "get_github_repo_metadata":
+            update["repo_metadata"] = data
+        elif name == "explore_directory":
+            root = args.get("path") or state.get("project_path")
+            structure, key_files = _local_findings(data, root)
+            update["directory_structure"].update(structure)
+            update["key_files"].update(key_files)
+
+    explorer_summary = last_ai_text(messages)
+    summary = "## EXPLORER FINDINGS\n\n"
+    if explorer_summary:
+        summary += f"{explorer_summary}\n\n"
+    summary += render_findings(update)
+
+    update["messages"] = _compacted_messages(messages, summary)
+    update["current_agent"] = "explorer"
+    update["next_agent"] = "analyzer"
+    return update
+
+
+_SUMMARY_FIELDS = {
+    "tech stack": "tech_stack",
+    "dependencies": "dependencies",
+    "purpose": "project_purpose",
+    "entry points": "entry_points",
+}
+
+_SUMMARY_LINE = re.compile(
+    r"^\W*(tech stack|dependencies|purpose|key features|entry points)\W*:\s*(.*)$",
+    re.IGNORECASE,
+)
+
+
+def _parse_analyzer_summary(text: str) -> dict:
+    """Best-effort parse of the analyzer's "- Field: value" summary format"""
+    sections = {}
+    current = None
+    for line in text.splitlines():
+        match = _SUMMARY_LINE.match(line)
+        if match:
+            current = match.group(1).lower()
+            sections[current] = [match.group(2)]
+        elif current and line.strip():
+            sections[current].append(line)
+
+    result = {}
+    for name, field in _SUMMARY_FIELDS.items():
+        raw_lines = sections.get(name, [])
+        lines = [line.strip().lstrip("-*• ").strip("[] ") for line in raw_lines]
+        lines = [line for line in lines if line]
+        if not lines:
+            continue
+
+        if field == "project_purpose":
+            result[field] = " ".join(lines)
+            continue
+
+        items = [i.strip() for line in lines for i in line.split(",") if i.strip()]
+        result[field] = {"mentioned": items} if field == "dependencies" else items
+    return result
+
+
+def compact_analyzer_node(state: AgentState) -> AgentState:
+    """Keep only the analysis results and the list of files read for the writer"""
+    messages = list(state["messages"])
+    update = {"key_files": dict(state.get("key_files") or {})}
+
+    shards = state.get("shard_summaries") or []
+    files_read, files_outlined = [], []
+    for shard in shards:
+        files_read.extend(shard.get("files_read", []))
+        files_outlined.extend(shard.get("files_outlined", []))
+    read, outlined = files_touched(messages)
+    files_read.extend(read)
+    files_outlined.extend(outlined)
+    if files_read:
+        update["key_files"]["files_read"] = list(dict.fromkeys(files_read))
+    if files_outlined:
+        outlined = [f for f in dict.fromkeys(files_outlined) if f not in files_read]
+        if outlined:
+            update["key_files"]["files_outlined"] = outlined
+
+    analysis = last_ai_text(messages)
+    for field, value in _parse_analyzer_summary(analysis).items():
+        # Manifest facts win over the LLM's reading; the purpose only comes from here
+        if value and (field == "project_purpose" or not state.get(field)):
+            update[field] = value
+
+    findings = render_findings({**state, **update})
+    summary = f"## PROJECT ANALYSIS\n\n{findings}"
+    if analysis:
+        summary += f"\n\nAnalyzer summary:\n{analysis}"
+    for shard in shards:
+        if shard.get("summary"):
+            summary += f"\n\nComponent {shard['shard']}:\n{shard['summary']}"
+
+    update["messages"] = _compacted_messages(messages, summary)
+    update["current_agent"] = "analyzer"
+    update["next_agent"] = "writer"
+    update["analysis_complete"] = True
+    return update
@@ -0,0 +1,243 @@
+import os
+import asyncio
+import hashlib
+from pathlib import Path
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig
+from agents.routing import AGENTS, agent_settings
+from graph.state import AgentState
+from graph.compaction import render_findings
+from tools.local_file_tools import IGNORE_DIRS
+from utils.github_repo import GitHubRepo
+from utils.prompt_loader import prompts_digest
+from utils.analysis_manifest import (
+    ANALYSIS_FIELDS,
+    diff_fingerprints,
+    fingerprint_github,
+    fingerprint_local,
+    list_local,
+    load_manifest,
+    output_dir,
+    remove_manifest,
+    save_manifest,
+)
+
+MAX_LISTED_CHANGES = 100
+
+
+def _source_id(state: AgentState) -> str:
+    if state.get("github_url"):
+        gh = state["github_repo"]
+        return f"github:{gh['owner']}/{gh['repo']}"
+    return f"local:{Path(state['project_path']).resolve()}"
+
+
+def config_key(state: AgentState, config: RunnableConfig) -> dict:
+    """
+    What the README depends on besides the source: each agent's model, the
+    example README and the prompt files. A change to any of them is a full run.
+    """
+    agents = {}
+    for agent in AGENTS:
+        settings = agent_settings(config, agent)
+        agents[agent] = (
+            f"{settings['provider']}:{settings['model_name']}"
+            f"@{settings['temperature']}"
+        )
+    example = state.get("example_readme") or ""
+    return {
+        "agents": agents,
+        "example": hashlib.sha1(example.encode("utf-8")).hexdigest(),
+        "prompts": prompts_digest(),
+    }
+
+
+def _incremental(config: RunnableConfig) -> bool:
+    return config.get("configurable", {}).get("incremental", True)
+
+
+def _github_repo(state: AgentState) -> GitHubRepo:
+    owner = state["github_repo"]["owner"]
+    repo = state["github_repo"]["repo"]
+    return GitHubRepo(owner, repo, os.getenv("GITHUB_TOKEN"))
+
+
+def _github_scan(tree_data: dict) -> tuple:
+    if "error" in tree_data:
+        return {}, None
+    truncated = "tree" if tree_data.get("truncated") else None
+    return fingerprint_github(tree_data), truncated
+
+
+def _local_paths(state: AgentState) -> tuple:
+    root = Path(state["project_path"]).resolve()
+    paths, truncated = list_local(str(root), IGNORE_DIRS)
+
+    # The generated README is an output, not an input, when written into the project
+    readme = output_dir(state["output_path"]).resolve() / "README.md"
+    if root == readme.parent or root in readme.parents:
+        excluded = readme.relative_to(root).as_posix()
+        paths = [path for path in paths if path != excluded]
+    return root, paths, truncated
+
+
+def source_files(state: AgentState) -> list:
+    """
+    Repository-relative paths of the source's files: those fingerprinted at
+    the start of the run, otherwise a listing (the memoized tree on GitHub)
+    """
+    files = state.get("source_fingerprint")
+    if files:
+        return list(files)
+    if state.get("github_url"):
+        return list(_github_repo(state).get_blob_shas())
+    return _local_paths(state)[1]
+
+
+def _scan(state: AgentState, previous: dict) -> tuple:
+    """
+    (files, truncated) of the source. Local files unchanged in mtime and size
+    since `previous` keep its hashes; a truncated walk isn't hashed at all.
+    """
+    if state.get("github_url"):
+        return _github_scan(_github_repo(state).get_tree(recursive=True))
+
+    root, paths, truncated = _local_paths(state)
+    if truncated:
+        return {}, truncated
+    return fingerprint_local(str(root), paths, previous), truncated
+
+
+async def _ascan(state: AgentState, previous: dict) -> tuple:
+    if not state.get("github_url"):
+        return await asyncio.to_thread(_scan, state, previous)
+    return _github_scan(await _github_repo(state).aget_tree(recursive=True))
+
+
+def _describe_changes(changes: dict) -> str:
+    lines = []
+    for kind in ("added", "modified", "removed"):
+        paths = changes[kind]
+        if not paths:
+            continue
+        shown = paths[:MAX_LISTED_CHANGES]
+        more = len(paths) - len(shown)
+        lines.append(f"{kind.capitalize()} ({len(paths)}):")
+        lines.extend(f"- {p}" for p in shown)
+        if more:
+            lines.append(f"- ... and {more} more")
+    return "\n".join(lines)
+
+
+def incremental_node(state: AgentState, config: RunnableConfig) -> AgentState:
+    """
+    Compare the source against the manifest saved by the previous run.
+
+    Routes to the explorer for a full run, straight to the manifest parser and
+    analyzer with the previous analysis when only some files changed, or ends
+    the run when nothing changed and the README is still there. The source is
+    only scanned when there is a manifest to compare it with; a first run
+    goes straight to the explorer and is fingerprinted when it is saved.
+    """
+    manifest = _previous_manifest(state, config)
+    if not manifest:
+        return _plan(state, None, {})
+    return _plan(state, manifest, *_scan(state, manifest["files"]))
+
+
+async def aincremental_node(state: AgentState, config: RunnableConfig) -> AgentState:
+    manifest = _previous_manifest(state, config)
+    if not manifest:
+        return _plan(state, None, {})
+    return _plan(state, manifest, *(await _ascan(state, manifest["files"])))
+
+
+def _previous_manifest(state: AgentState, config: RunnableConfig):
+    """
+    The last run's manifest, if incremental mode is on, the README it describes
+    still exists and it was made from this source with the same settings
+    """
+    if not _incremental(config):
+        return None
+    if not (output_dir(state["output_path"]) / "README.md").exists():
+        return None
+    manifest = load_manifest(state["output_path"])
+    if not manifest or manifest.get("source") != _source_id(state):
+        return None
+    if manifest.get("config") != config_key(state, config):
+        return None
+    if not isinstance(manifest.get("files"), dict):
+        return None
+    return manifest
+
+
+def _plan(state: AgentState, manifest, files: dict, truncated=None) -> AgentState:
+    """Route to a full, incremental or no-op run given the current fingerprint"""
+    update = {"source_fingerprint": files}
+
+    # A partial listing would report every file it missed as removed
+    if not manifest or not files or truncated:
+        update["next_agent"] = "explorer"
+        return update
+
+    changes = diff_fingerprints(manifest["files"], files)
+    update["changed_files"] = changes
+    if not any(changes.values()):
+        update["next_agent"] = "done"
+        update["generation_complete"] = True
+        return update
+
+    readme_path = output_dir(state["output_path"]) / "README.md"
+    analysis = manifest.get("analysis", {})
+    for field in ANALYSIS_FIELDS:
+        if analysis.get(field):
+            update[field] = analysis[field]
+    update["previous_readme"] = readme_path.read_text(encoding="utf-8")
+
+    summary = (
+        "## INCREMENTAL UPDATE\n\n"
+        "A README was generated for this project before. The previous analysis "
+        "is below; it is still accurate for every unchanged file.\n\n"
+        f"{render_findings(analysis)}\n\n"
+        "Files changed since the last README:\n"
+        f"{_describe_changes(changes)}\n\n"
+        "Read only the changed files that matter (skip everything unchanged), "
+        "then summarize the whole project with the previous analysis updated."
+    )
+    update["messages"] = [HumanMessage(content=summary)]
+    update["next_agent"] = "manifests"
+    return update
+
+
+def route_incremental(state: AgentState) -> str:
+    return state.get("next_agent", "explorer")
+
+
+def save_manifest_node(state: AgentState, config: RunnableConfig) -> AgentState:
+    """Record the source fingerprint and analysis next to the written README"""
+    if not state.get("readme_path"):
+        return {}
+    if not _incremental(config):
+        # The README no longer matches whatever an older manifest describes
+        remove_manifest(state["output_path"])
+        return {}
+
+    files = state.get("source_fingerprint") or {}
+    if not files:
+        # Not scanned at the start of the run (no manifest); do it now
+        files, truncated = _scan(state, {})
+        if truncated or not files:
+            # A partial fingerprint would miss changes in the unlisted files
+            remove_manifest(state["output_path"])
+            return {}
+
+    save_manifest(
+        state["output_path"],
+        {
+            "source": _source_id(state),
+            "config": config_key(state, config),
+            "files": files,
+            "analysis": {field: state.get(field) for field in ANALYSIS_FIELDS},
+        },
+    )
+    return {"generation_complete": True}
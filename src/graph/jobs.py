@@ -0,0 +1,252 @@
+import json
+import time
+import uuid
+import queue
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Optional
+from graph.runner import batch_output_dir, run_repo
+
+
+class QueueFull(Exception):
+    """Raised when no more jobs can be queued"""
+
+
+def job_key(request: dict) -> str:
+    """Identical requests share a key, so an in-flight job can be reused"""
+    payload = json.dumps(request, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+def job_config(request: dict) -> dict:
+    """Graph config for a normalized job request"""
+    config = {
+        "configurable": {
+            "provider": request["provider"],
+            "model_name": request["model"],
+            "cache": request["cache"],
+            "incremental": request["incremental"],
+        },
+        "recursion_limit": request["recursion_limit"],
+    }
+    if request.get("read_budget") is not None:
+        config["configurable"]["read_budget"] = request["read_budget"]
+    return config
+
+
+def stream_event(mode: str, event: dict) -> list:
+    """Compact, JSON-safe progress events for one graph stream event"""
+    if mode == "custom":
+        progress = event.get("readme_progress")
+        return [{"type": "progress", **progress}] if progress else []
+
+    events = []
+    for node_name, node_output in event.items():
+        item = {"type": "node", "node": node_name}
+        messages = (node_output or {}).get("messages") or []
+        tool_calls = getattr(messages[-1], "tool_calls", None) if messages else None
+        if tool_calls:
+            item["tool_calls"] = [tc["name"] for tc in tool_calls]
+        events.append(item)
+    return events
+
+
+class Job:
+    """One README generation request and the progress events it produced"""
+
+    def __init__(self, key: str, request: dict):
+        self.id = uuid.uuid4().hex[:12]
+        self.key = key
+        self.request = request
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.events = []
+        self._changed = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def add_event(self, event: dict) -> None:
+        with self._changed:
+            self.events.append({"seq": len(self.events), "time": time.time(), **event})
+            self._changed.notify_all()
+
+    def start(self) -> None:
+        self.status = "running"
+        self.started_at = time.time()
+        self.add_event({"type": "status", "status": "running"})
+
+    def finish(self, result: dict) -> None:
+        self.result = result
+        self.status = result["status"]
+        self.finished_at = time.time()
+        self.add_event({"type": "status", "status": self.status})
+
+    def wait_events(self, after: int, timeout: float) -> list:
+        """Events from index `after` on, waiting up to `timeout` for new ones"""
+        with self._changed:
+            self._changed.wait_for(
+                lambda: len(self.events) > after or self.done, timeout
+            )
+            return self.events[after:]
+
+    def to_dict(self) -> dict:
+        result = dict(self.result or {})
+        result.pop("traceback", None)
+        return {
+            "id": self.id,
+            "repo": self.request["repo"],
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "events": len(self.events),
+            "result": result or None,
+        }
+
+
+class JobQueue:
+    """
+    Bounded queue of README jobs run by a fixed pool of worker threads.
+
+    Every job runs against the same compiled graph, so the shared HTTP session,
+    LLM clients and caches stay warm between requests. Submitting a request
+    identical to a queued or running one returns that job instead of starting
+    another, and jobs writing to the same output directory run one at a time.
+    """
+
+    def __init__(
+        self,
+        app,
+        output_root: str,
+        workers: int = 2,
+        max_queued: int = 100,
+        keep_finished: int = 500,
+        telemetry_path: Optional[str] = None,
+    ):
+        self.app = app
+        self.output_root = output_root
+        self.workers = max(1, workers)
+        self.keep_finished = keep_finished
+        self.telemetry_path = telemetry_path
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._jobs: OrderedDict = OrderedDict()
+        self._inflight: dict = {}
+        self._lock = threading.Lock()
+        self._dir_locks = defaultdict(threading.Lock)
+        self._threads = []
+        self.deduplicated = 0
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._worker, name=f"readme-worker-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Cancel queued jobs and let the workers finish their current one"""
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._inflight.pop(job.key, None)
+            job.finish({"repo": job.request["repo"], "status": "cancelled"})
+
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, request: dict) -> tuple:
+        """Queue a normalized request; returns (job, created)"""
+        key = job_key(request)
+        with self._lock:
+            job = self._inflight.get(key)
+            if job:
+                self.deduplicated += 1
+                return job, False
+
+            job = Job(key, request)
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise QueueFull(f"Queue is full ({self._queue.maxsize} jobs waiting)")
+            self._inflight[key] = job
+            self._jobs[job.id] = job
+            self._prune()
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> list:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def stats(self) -> dict:
+        with self._lock:
+            statuses = [job.status for job in self._jobs.values()]
+        return {
+            "workers": self.workers,
+            "queued": statuses.count("queued"),
+            "running": statuses.count("running"),
+            "finished": sum(1 for s in statuses if s not in ("queued", "running")),
+            "deduplicated": self.deduplicated,
+        }
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
+
+    def _worker(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                result = self._run(job)
+            except Exception as e:
+                result = {
+                    "repo": job.request["repo"],
+                    "status": "error",
+                    "error": f"{type(e).__name__}: {e}",
+                }
+            # New identical requests start a fresh job from here on
+            with self._lock:
+                self._inflight.pop(job.key, None)
+            job.finish(result)
+
+    def _run(self, job: Job) -> dict:
+        request = job.request
+        try:
+            output_path = batch_output_dir(request["repo"], self.output_root)
+        except Exception as e:
+            return {"repo": request["repo"], "status": "error", "error": str(e)}
+
+        def _on_event(mode: str, event: dict) -> None:
+            for item in stream_event(mode, event):
+                job.add_event(item)
+
+        with self._dir_locks[output_path]:
+            job.start()
+            return run_repo(
+                self.app,
+                request["repo"],
+                output_path,
+                job_config(request),
+                request["example"],
+                self.telemetry_path,
+                on_event=_on_event,
+            )
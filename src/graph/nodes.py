@@ -1,102 +1,284 @@
-from langchain_core.messages import SystemMessage
+import os
+import json
+import asyncio
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_stream_writer
 from graph.state import AgentState
-from utils.prompt_loader import load_prompt
-from agents.agent_handler import create_agent
+from utils.prompt_loader import (
+    example_section,
+    load_prompt,
+    static_prompt,
+    system_prompt,
+)
+from agents.agent_handler import agent_for
+from utils.github_repo import GitHubRepo
+from utils.analysis_manifest import output_dir
+from utils.read_budget import current_budget
+from utils.readme_stream import ReadmeStreamWriter
+from utils.manifest_parser import (
+    analyze_manifests,
+    aread_manifests,
+    find_local_manifests,
+    find_tree_manifests,
+    read_local_manifest,
+    read_manifests,
+)
 from tools.github_tools import (
+    IGNORE_PATTERNS,
+    _aread_github_content,
+    _read_github_content,
     explore_github_repo,
     get_github_repo_metadata,
     read_github_file,
+    read_github_file_outline,
+    read_github_files,
+)
+from tools.local_file_tools import (
+    IGNORE_DIRS,
+    explore_directory,
+    read_file,
+    read_file_outline,
+    read_files,
 )
-from tools.local_file_tools import explore_directory, read_file, write_readme
-
 
-def explorer_node(state: AgentState, config: RunnableConfig) -> AgentState:
 
-    setup = config.get("configurable", {})
-    provider = setup.get("provider", "groq")
-    model = setup.get("model_name", "moonshotai/kimi-k2-instruct-0905")
+def _run_context(state: AgentState) -> dict:
+    """Per-repository values that follow the static part of every system prompt"""
+    if state.get("github_url"):
+        return {
+            "GitHub owner": state["github_repo"]["owner"],
+            "GitHub repo": state["github_repo"]["repo"],
+            "GitHub URL": state["github_url"],
+        }
+    return {"Project path": state["project_path"]}
 
-    explorer_base = load_prompt("explorer", "base")
 
+def _explorer_call(state: AgentState, config: RunnableConfig) -> tuple:
+    """The explorer's agent and input messages"""
     if state.get("github_url"):
         tools = [explore_github_repo, get_github_repo_metadata]
-
-        owner = state["github_repo"]["owner"]
-        repo = state["github_repo"]["repo"]
-
-        github_instructions = load_prompt("explorer", "github_instructions")
-        additional_instructions = github_instructions.format(
-            OWNER=owner, REPO=repo, GITHUB_URL=state["github_url"]
-        )
+        instructions = "github_instructions"
     else:
         tools = [explore_directory]
+        instructions = "local_instructions"
 
-        local_instructions = load_prompt("explorer", "local_instructions")
-        additional_instructions = local_instructions.format(
-            PROJECT_PATH=state["project_path"]
-        )
+    agent = agent_for("explorer", config, tools)
+    static = static_prompt("explorer", ADDITIONAL_INSTRUCTIONS=instructions)
+    system_msg = SystemMessage(content=system_prompt(static, _run_context(state)))
+    return agent, [system_msg] + list(state["messages"])
 
-    agent = create_agent(provider, model, tools)
-    instructions = explorer_base.format(ADDITIONAL_INSTRUCTIONS=additional_instructions)
-    system_msg = SystemMessage(content=instructions)
 
-    response = agent.invoke([system_msg] + list(state["messages"]))
+def explorer_node(state: AgentState, config: RunnableConfig) -> AgentState:
+    agent, messages = _explorer_call(state, config)
+    response = agent.invoke(messages)
     return {"messages": [response], "current_agent": "explorer"}
 
 
-def analyzer_node(state: AgentState, config: RunnableConfig) -> AgentState:
+async def aexplorer_node(state: AgentState, config: RunnableConfig) -> AgentState:
+    agent, messages = _explorer_call(state, config)
+    response = await agent.ainvoke(messages)
+    return {"messages": [response], "current_agent": "explorer"}
 
-    setup = config.get("configurable", {})
-    provider = setup.get("provider", "groq")
-    model = setup.get("model_name", "moonshotai/kimi-k2-instruct-0905")
 
-    analyzer_base = load_prompt("analyzer", "base")
+def manifest_node(state: AgentState) -> AgentState:
+    """Parse dependency manifests deterministically before the analyzer runs"""
+    config_files = (state.get("key_files") or {}).get("config_files", [])
 
     if state.get("github_url"):
-        tools = [read_github_file]
-
         owner = state["github_repo"]["owner"]
         repo = state["github_repo"]["repo"]
+        gh_repo = GitHubRepo(owner, repo, os.getenv("GITHUB_TOKEN"))
+
+        paths = config_files or find_tree_manifests(
+            list(gh_repo.get_blob_shas()), IGNORE_PATTERNS
+        )
+
+        def _read(path: str):
+            return _read_github_content(gh_repo, path).get("content")
 
-        github_instructions = load_prompt("analyzer", "read_github")
-        read_instructions = github_instructions.format(OWNER=owner, REPO=repo)
+        files = read_manifests(paths, _read)
+        root = ""
     else:
-        tools = [read_file]
-        read_instructions = load_prompt("analyzer", "read_local")
+        root = state["project_path"]
+        paths = config_files or find_local_manifests(root, IGNORE_DIRS)
+        files = read_manifests(paths, read_local_manifest)
 
-    agent = create_agent(provider, model, tools)
-    instructions = analyzer_base.format(FILE_READ_INSTRUCTIONS=read_instructions)
-    system_msg = SystemMessage(content=instructions)
+    if root:
+        files = {os.path.relpath(p, root): content for p, content in files.items()}
+    return _manifest_update(state, files)
 
-    response = agent.invoke([system_msg] + list(state["messages"]))
-    return {"messages": [response], "current_agent": "analyzer"}
 
+async def amanifest_node(state: AgentState) -> AgentState:
+    """manifest_node with GitHub reads on the event loop"""
+    if not state.get("github_url"):
+        return await asyncio.to_thread(manifest_node, state)
 
-def writer_node(state: AgentState, config: RunnableConfig) -> AgentState:
+    config_files = (state.get("key_files") or {}).get("config_files", [])
+    owner = state["github_repo"]["owner"]
+    repo = state["github_repo"]["repo"]
+    gh_repo = GitHubRepo(owner, repo, os.getenv("GITHUB_TOKEN"))
+
+    paths = config_files or find_tree_manifests(
+        list(await gh_repo.aget_blob_shas()), IGNORE_PATTERNS
+    )
+
+    async def _read(path: str):
+        return (await _aread_github_content(gh_repo, path)).get("content")
+
+    return _manifest_update(state, await aread_manifests(paths, _read))
+
+
+def _manifest_update(state: AgentState, files: dict) -> AgentState:
+    """State update with the facts parsed from manifest contents"""
+    facts = analyze_manifests(files)
+    if not facts["manifests"]:
+        return {}
+
+    tech_stack = facts["languages"] + facts["frameworks"] + facts["tools"]
+    key_files = dict(state.get("key_files") or {})
+    key_files["manifests"] = facts["manifests"]
+    if facts["scripts"]:
+        key_files["scripts"] = facts["scripts"]
+
+    digest = {
+        "tech_stack": tech_stack,
+        "dependencies": facts["dependencies"],
+        "scripts": facts["scripts"],
+        "entry_points": facts["entry_points"],
+    }
+    summary = (
+        "## MANIFEST FACTS\n\n"
+        f"Parsed directly from: {', '.join(facts['manifests'])}. "
+        "These are exact; do not re-read these files for dependencies or scripts.\n\n"
+        + json.dumps(digest, indent=2)
+    )
 
-    setup = config.get("configurable", {})
-    provider = setup.get("provider", "groq")
-    model = setup.get("model_name", "moonshotai/kimi-k2-instruct-0905")
+    return {
+        "messages": [HumanMessage(content=summary)],
+        "tech_stack": tech_stack,
+        "dependencies": facts["dependencies"],
+        "entry_points": facts["entry_points"],
+        "key_files": key_files,
+    }
 
-    writer_base = load_prompt("writer", "base")
 
-    github_context = ""
+def analyzer_tools(state: AgentState) -> tuple:
+    """The file reading tools for this source and the prompt that explains them"""
     if state.get("github_url"):
-        github_context = load_prompt("writer", "github_context")
-
-    example_context = ""
-    if state.get("example_readme"):
-        example_context = load_prompt("writer", "example_readme")
-
-    tools = [write_readme]
-    agent = create_agent(provider, model, tools)
-    instructions = writer_base.format(
-        EXAMPLE_README=example_context,
-        GITHUB_CONTEXT=github_context,
-        OUTPUT_PATH=state["output_path"],
+        tools = [read_github_file_outline, read_github_files, read_github_file]
+        return tools, "read_github"
+    return [read_file_outline, read_files, read_file], "read_local"
+
+
+def read_budget_prompt(instructions: str) -> str:
+    """Prompt explaining the run's read budget to the analyzer, "" without one"""
+    if current_budget() is None:
+        return ""
+    return instructions.replace("read_", "read_budget_", 1)
+
+
+def _analyzer_call(state: AgentState, config: RunnableConfig) -> tuple:
+    """The analyzer's agent and input messages"""
+    tools, instructions = analyzer_tools(state)
+    agent = agent_for("analyzer", config, tools)
+    static = static_prompt(
+        "analyzer",
+        FILE_READ_INSTRUCTIONS=instructions,
+        READ_BUDGET=read_budget_prompt(instructions),
     )
+    system_msg = SystemMessage(content=system_prompt(static, _run_context(state)))
+    return agent, [system_msg] + list(state["messages"])
+
+
+def analyzer_node(state: AgentState, config: RunnableConfig) -> AgentState:
+    agent, messages = _analyzer_call(state, config)
+    response = agent.invoke(messages)
+    return {"messages": [response], "current_agent": "analyzer"}
+
+
+async def aanalyzer_node(state: AgentState, config: RunnableConfig) -> AgentState:
+    agent, messages = _analyzer_call(state, config)
+    response = await agent.ainvoke(messages)
+    return {"messages": [response], "current_agent": "analyzer"}
+
+
+def _writer_call(state: AgentState, config: RunnableConfig) -> tuple:
+    """The writer's agent and input messages"""
+    github_context = "github_context" if state.get("github_url") else ""
+    static = static_prompt("writer", GITHUB_CONTEXT=github_context)
+
+    # The example README is the same for every repository in a run, so it
+    # stays part of the cacheable prefix
+    example = example_section(state.get("example_readme") or "")
+    if example:
+        static = f"{static}\n\n{example}"
+
+    update_context = ""
+    if state.get("previous_readme"):
+        update_context = load_prompt("writer", "update_readme").format(
+            EXISTING_README=state["previous_readme"]
+        )
+
+    agent = agent_for("writer", config, [])
+    instructions = system_prompt(static, _run_context(state), update_context)
     system_msg = SystemMessage(content=instructions)
+    return agent, [system_msg] + list(state["messages"])
+
+
+def _readme_writer(state: AgentState) -> ReadmeStreamWriter:
+    # Tokens go to a temp file as they arrive and replace README.md at the end
+    emit = get_stream_writer()
+    return ReadmeStreamWriter(
+        output_dir(state["output_path"]),
+        on_progress=lambda progress: emit({"readme_progress": progress}),
+    )
+
+
+def _writer_update(written: dict) -> AgentState:
+    summary = (
+        f"Wrote README to {written['path']}: {written['bytes']} bytes, "
+        f"{written['lines']} lines, {written['sections']} sections"
+    )
+    return {
+        "messages": [AIMessage(content=summary)],
+        "current_agent": "writer",
+        "readme_path": written["path"],
+    }
 
-    response = agent.invoke([system_msg] + list(state["messages"]))
-    return {"messages": [response], "current_agent": "writer"}
+
+def writer_node(state: AgentState, config: RunnableConfig) -> AgentState:
+    agent, messages = _writer_call(state, config)
+    readme = _readme_writer(state)
+    try:
+        for chunk in agent.stream(messages):
+            readme.write(_chunk_text(chunk))
+        written = readme.commit()
+    except BaseException:
+        readme.abort()
+        raise
+    return _writer_update(written)
+
+
+async def awriter_node(state: AgentState, config: RunnableConfig) -> AgentState:
+    agent, messages = _writer_call(state, config)
+    readme = _readme_writer(state)
+    try:
+        async for chunk in agent.astream(messages):
+            readme.write(_chunk_text(chunk))
+        written = readme.commit()
+    except BaseException:
+        readme.abort()
+        raise
+    return _writer_update(written)
+
+
+def _chunk_text(chunk) -> str:
+    """Text of a streamed message chunk (plain string or content blocks)"""
+    content = chunk.content
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block.get("text", "") if isinstance(block, dict) else str(block)
+        for block in content
+    )
@@ -0,0 +1,295 @@
+import os
+import time
+import hashlib
+import asyncio
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Optional
+from langchain_core.messages import HumanMessage
+from agents.routing import agent_settings
+from utils.github_repo import parse_github_url, reset_run_cache
+from utils.read_budget import ReadBudget, model_read_budget, use_read_budget
+from utils.telemetry import RunTelemetry, with_telemetry
+
+# Graph tasks run at the same time within one run, i.e. parallel shard agents
+SHARD_CONCURRENCY = int(os.getenv("SHARD_CONCURRENCY", "4"))
+
+
+def build_initial_state(repo: str, output_path: str, example_readme: str = "") -> dict:
+    """Initial AgentState for a GitHub URL or a local project path"""
+    is_github = "github.com" in repo
+    github_url = repo if is_github else None
+    project_path = repo if not is_github else None
+
+    if not project_path and not github_url:
+        raise ValueError("Must provide either local project path or valid github url")
+
+    github_repo = None
+    if github_url:
+        try:
+            owner, name = parse_github_url(github_url)
+            github_repo = {"owner": owner, "repo": name}
+        except ValueError as e:
+            raise ValueError(f"Invalid GitHub URL: {e}")
+
+    source_desc = github_url if github_url else project_path
+    return {
+        "messages": [
+            HumanMessage(content=f"Generate a comprehensive README for: {source_desc}")
+        ],
+        "project_path": project_path,
+        "github_url": github_url,
+        "github_repo": github_repo,
+        "output_path": output_path,
+        "directory_structure": {},
+        "key_files": {},
+        "tech_stack": [],
+        "dependencies": {},
+        "project_purpose": "",
+        "entry_points": [],
+        "repo_metadata": {},
+        "shard_summaries": [],
+        "source_fingerprint": {},
+        "changed_files": {},
+        "previous_readme": "",
+        "example_readme": example_readme,
+        "user_preferences": {},
+        "readme_sections": {},
+        "final_readme": "",
+        "readme_path": "",
+        "current_agent": "explorer",
+        "next_agent": "explorer",
+        "analysis_complete": False,
+        "generation_complete": False,
+    }
+
+
+def read_budget_for(config: dict) -> Optional[ReadBudget]:
+    """
+    Read budget for a run: configurable["read_budget"] tokens, else the default
+    for the analyzer's model. Zero turns the budget off.
+    """
+    model = agent_settings(config, "analyzer")["model_name"]
+    total = config.get("configurable", {}).get("read_budget")
+    if total is None:
+        total = model_read_budget(model)
+    return ReadBudget(total, model) if total > 0 else None
+
+
+def batch_output_dir(repo: str, output_root: str) -> str:
+    """Per-repository output directory used in batch mode"""
+    if "github.com" in repo:
+        owner, name = parse_github_url(repo)
+        dirname = f"{owner}__{name}"
+    else:
+        # Projects with the same name in different places get their own directory
+        path = Path(repo).resolve()
+        digest = hashlib.sha1(str(path).encode("utf-8")).hexdigest()[:8]
+        dirname = f"{path.name or 'project'}__{digest}"
+
+    path = Path(output_root) / dirname
+    path.mkdir(parents=True, exist_ok=True)
+    return str(path)
+
+
+def run_repo(
+    app,
+    repo: str,
+    output_path: str,
+    config: dict,
+    example_readme: str = "",
+    telemetry_path: Optional[str] = None,
+    on_event: Optional[Callable[[str, dict], None]] = None,
+) -> dict:
+    """
+    Run the graph for one repository and return its status and timings.
+
+    `on_event(mode, event)` receives every "updates" and "custom" stream event.
+    """
+    started = time.perf_counter()
+    result = {"repo": repo, "output_path": output_path, "status": "ok"}
+    timer = _NodeTimer(started)
+    recorder = RunTelemetry(repo, telemetry_path)
+    config = with_telemetry({"max_concurrency": SHARD_CONCURRENCY, **config}, recorder)
+    budget = read_budget_for(config)
+
+    try:
+        initial_state = build_initial_state(repo, output_path, example_readme)
+        with use_read_budget(budget):
+            for mode, event in app.stream(
+                initial_state, config=config, stream_mode=["updates", "custom"]
+            ):
+                if on_event:
+                    on_event(mode, event)
+                if mode == "updates":
+                    timer.update(event)
+        _check_readme(result)
+    except Exception as e:
+        _record_error(result, e)
+    finally:
+        _forget_repo(repo)
+
+    return _finish(result, started, timer, recorder, budget)
+
+
+async def arun_repo(
+    app,
+    repo: str,
+    output_path: str,
+    config: dict,
+    example_readme: str = "",
+    telemetry_path: Optional[str] = None,
+    on_event: Optional[Callable[[str, dict], None]] = None,
+) -> dict:
+    """run_repo on the event loop through app.astream"""
+    started = time.perf_counter()
+    result = {"repo": repo, "output_path": output_path, "status": "ok"}
+    timer = _NodeTimer(started)
+    recorder = RunTelemetry(repo, telemetry_path)
+    config = with_telemetry({"max_concurrency": SHARD_CONCURRENCY, **config}, recorder)
+    budget = read_budget_for(config)
+
+    try:
+        initial_state = build_initial_state(repo, output_path, example_readme)
+        with use_read_budget(budget):
+            async for mode, event in app.astream(
+                initial_state, config=config, stream_mode=["updates", "custom"]
+            ):
+                if on_event:
+                    on_event(mode, event)
+                if mode == "updates":
+                    timer.update(event)
+        _check_readme(result)
+    except Exception as e:
+        _record_error(result, e)
+    finally:
+        _forget_repo(repo)
+
+    return _finish(result, started, timer, recorder, budget)
+
+
+class _NodeTimer:
+    """Wall time between consecutive stream updates, attributed to their nodes"""
+
+    def __init__(self, started: float):
+        self.last_mark = started
+        self.node_times = {}
+
+    def update(self, event: dict) -> None:
+        now = time.perf_counter()
+        for node_name in event:
+            elapsed = now - self.last_mark
+            self.node_times[node_name] = self.node_times.get(node_name, 0.0) + elapsed
+        self.last_mark = now
+
+
+def _check_readme(result: dict) -> None:
+    if not (Path(result["output_path"]) / "README.md").exists():
+        result["status"] = "no_readme"
+
+
+def _record_error(result: dict, error: Exception) -> None:
+    result["status"] = "error"
+    result["error"] = f"{type(error).__name__}: {error}"
+    result["traceback"] = traceback.format_exc()
+
+
+def _forget_repo(repo: str) -> None:
+    owner_repo = _github_owner_repo(repo)
+    if owner_repo:
+        reset_run_cache(*owner_repo)
+
+
+def _finish(result: dict, started: float, timer, recorder, budget=None) -> dict:
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    result["node_seconds"] = {k: round(v, 3) for k, v in timer.node_times.items()}
+    if budget:
+        result["read_budget"] = budget.report()
+        recorder.emit("read_budget", **result["read_budget"])
+    result["telemetry"] = recorder.finish(result["status"])
+    return result
+
+
+def _github_owner_repo(repo: str) -> Optional[tuple]:
+    if "github.com" not in repo:
+        return None
+    try:
+        return parse_github_url(repo)
+    except ValueError:
+        return None
+
+
+def run_batch(
+    app,
+    repos: list,
+    output_root: str,
+    config: dict,
+    example_readme: str = "",
+    concurrency: int = 4,
+    on_result: Optional[Callable[[dict], None]] = None,
+    telemetry_path: Optional[str] = None,
+) -> list:
+    """
+    Generate READMEs for many repositories in this process.
+
+    Jobs share the compiled graph, the HTTP session and the on-disk caches, run
+    on at most `concurrency` threads, and a failing repository only marks its
+    own result as failed.
+    """
+    results = []
+
+    def _job(repo: str) -> dict:
+        try:
+            output_path = batch_output_dir(repo, output_root)
+        except Exception as e:
+            return {"repo": repo, "status": "error", "error": str(e), "seconds": 0.0}
+        return run_repo(
+            app, repo, output_path, config, example_readme, telemetry_path
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {pool.submit(_job, repo): repo for repo in repos}
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+    order = {repo: i for i, repo in enumerate(repos)}
+    results.sort(key=lambda r: order.get(r["repo"], len(order)))
+    return results
+
+
+async def arun_batch(
+    app,
+    repos: list,
+    output_root: str,
+    config: dict,
+    example_readme: str = "",
+    concurrency: int = 4,
+    on_result: Optional[Callable[[dict], None]] = None,
+    telemetry_path: Optional[str] = None,
+) -> list:
+    """
+    run_batch on one event loop: at most `concurrency` repositories are in
+    flight at once, each as a task instead of a thread.
+    """
+    limit = asyncio.Semaphore(max(1, concurrency))
+
+    async def _job(repo: str) -> dict:
+        async with limit:
+            try:
+                output_path = batch_output_dir(repo, output_root)
+            except Exception as e:
+                result = {"repo": repo, "status": "error", "error": str(e)}
+                result["seconds"] = 0.0
+            else:
+                result = await arun_repo(
+                    app, repo, output_path, config, example_readme, telemetry_path
+                )
+        if on_result:
+            on_result(result)
+        return result
+
+    return list(await asyncio.gather(*(_job(repo) for repo in repos)))
@@ -0,0 +1,293 @@
+import os
+from functools import lru_cache
+from typing import Annotated, Optional, Sequence, TypedDict
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from langgraph.errors import GraphRecursionError
+from langgraph.graph import END, StateGraph
+from langgraph.graph.message import add_messages
+from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.types import Send
+from agents.agent_handler import agent_for
+from graph.compaction import files_touched, last_ai_text
+from graph.incremental import source_files
+from graph.nodes import _run_context, analyzer_tools, read_budget_prompt
+from graph.state import AgentState
+from tools.github_tools import (
+    IGNORE_PATTERNS,
+    SOURCE_EXTENSIONS,
+    read_github_file,
+    read_github_file_outline,
+    read_github_files,
+)
+from tools.local_file_tools import read_file, read_file_outline, read_files
+from utils.prompt_loader import load_prompt, system_prompt
+from utils.telemetry import record
+
+# Repositories with at least this many source files are analyzed in shards
+SHARD_MIN_FILES = int(os.getenv("SHARD_MIN_FILES", "150"))
+
+# Most shards per run (0 or 1 disables sharding) and graph steps per shard agent
+SHARD_MAX_SHARDS = int(os.getenv("SHARD_MAX_SHARDS", "8"))
+SHARD_RECURSION_LIMIT = int(os.getenv("SHARD_RECURSION_LIMIT", "12"))
+
+# Files listed in a shard agent's request; it can outline the rest by directory
+SHARD_LISTED_FILES = 80
+
+ROOT_SHARD = "(root)"
+
+
+class ShardState(TypedDict):
+    """State of one shard agent's tool loop"""
+
+    messages: Annotated[Sequence[BaseMessage], add_messages]
+    shard: dict
+    project_path: Optional[str]
+    github_url: Optional[str]
+    github_repo: Optional[dict]
+
+
+def source_paths(state: AgentState) -> list:
+    """Repository-relative source files, skipping ignored directories"""
+    return sorted(
+        path
+        for path in source_files(state)
+        if os.path.splitext(path)[1] in SOURCE_EXTENSIONS
+        and not any(part in IGNORE_PATTERNS for part in path.split("/")[:-1])
+    )
+
+
+def _group(paths: list, prefix: str) -> dict:
+    """Paths under `prefix` grouped by the directory one level below it"""
+    groups = {}
+    for path in paths:
+        head, sep, _ = path[len(prefix) :].partition("/")
+        groups.setdefault(f"{prefix}{head}/" if sep else prefix, []).append(path)
+    return groups
+
+
+def plan_shards(paths: list, max_shards: int = SHARD_MAX_SHARDS) -> list:
+    """
+    Split source files into at most `max_shards` groups of whole directories.
+
+    Directories holding more than a fair share of the files are split into
+    their subdirectories, then the directories are packed largest first onto
+    the smallest shard so that the biggest shard, which sets the wall time of
+    the fan-out, stays as small as possible.
+    """
+    groups = _group(paths, "")
+    fair_share = len(paths) / max(1, max_shards)
+    settled = set()
+    while True:
+        oversized = [
+            prefix
+            for prefix, files in groups.items()
+            if prefix not in settled and len(files) > fair_share
+        ]
+        if not oversized:
+            break
+        largest = max(oversized, key=lambda prefix: len(groups[prefix]))
+        # Files directly inside `largest` stay grouped under its own prefix
+        settled.add(largest)
+        groups.update(_group(groups.pop(largest), largest))
+
+    shards = [{"dirs": [], "files": []} for _ in range(min(max_shards, len(groups)))]
+    for prefix, files in sorted(groups.items(), key=lambda g: (-len(g[1]), g[0])):
+        shard = min(shards, key=lambda s: len(s["files"]))
+        shard["dirs"].append(prefix)
+        shard["files"].extend(files)
+
+    shards.sort(key=lambda s: -len(s["files"]))
+    for index, shard in enumerate(shards):
+        labels = [prefix or ROOT_SHARD for prefix in shard["dirs"]]
+        name = ", ".join(labels[:3])
+        if len(labels) > 3:
+            name += f" and {len(labels) - 3} more"
+        shard.update(index=index, name=name)
+    return shards
+
+
+def route_analysis(state: AgentState):
+    """
+    Fan out to one shard agent per part of a large repository, or go straight
+    to the analyzer for small repositories and incremental updates.
+    """
+    if any((state.get("changed_files") or {}).values()):
+        return "analyzer"
+
+    if SHARD_MAX_SHARDS < 2:
+        return "analyzer"
+    paths = source_paths(state)
+    if len(paths) < SHARD_MIN_FILES:
+        return "analyzer"
+
+    shards = plan_shards(paths)
+    if len(shards) < 2:
+        return "analyzer"
+    return [Send("shard_analyzer", _shard_input(state, shard)) for shard in shards]
+
+
+def _shard_input(state: AgentState, shard: dict) -> dict:
+    root = state.get("project_path")
+    listed = shard["files"][:SHARD_LISTED_FILES]
+    if root:
+        listed = [os.path.join(root, path) for path in listed]
+
+    lines = [f"- {path}" for path in listed]
+    more = len(shard["files"]) - len(listed)
+    if more:
+        lines.append(f"- ... and {more} more in the same directories")
+    request = (
+        f"## SHARD: {shard['name']}\n\n"
+        f"Directories: {', '.join(d or ROOT_SHARD for d in shard['dirs'])}\n"
+        f"Source files ({len(shard['files'])}):\n" + "\n".join(lines)
+    )
+    return {
+        "messages": [HumanMessage(content=request)],
+        "shard": {
+            "index": shard["index"],
+            "name": shard["name"],
+            "dirs": shard["dirs"],
+            "files": len(shard["files"]),
+        },
+        "project_path": root,
+        "github_url": state.get("github_url"),
+        "github_repo": state.get("github_repo"),
+    }
+
+
+@lru_cache(maxsize=8)
+def _shard_prompt(instructions: str, budget: str) -> str:
+    return load_prompt("analyzer", "shard").format(
+        FILE_READ_INSTRUCTIONS=load_prompt("analyzer", instructions),
+        READ_BUDGET=load_prompt("analyzer", budget) if budget else "",
+    )
+
+
+def _shard_agent_call(state: ShardState, config: RunnableConfig) -> tuple:
+    tools, instructions = analyzer_tools(state)
+    agent = agent_for("analyzer", config, tools)
+    static = _shard_prompt(instructions, read_budget_prompt(instructions))
+    system_msg = SystemMessage(content=system_prompt(static, _run_context(state)))
+    return agent, [system_msg] + list(state["messages"])
+
+
+def shard_agent_node(state: ShardState, config: RunnableConfig) -> dict:
+    agent, messages = _shard_agent_call(state, config)
+    return {"messages": [agent.invoke(messages)]}
+
+
+async def ashard_agent_node(state: ShardState, config: RunnableConfig) -> dict:
+    agent, messages = _shard_agent_call(state, config)
+    return {"messages": [await agent.ainvoke(messages)]}
+
+
+def _build_shard_app():
+    graph = StateGraph(ShardState)
+    graph.add_node("agent", RunnableLambda(shard_agent_node, afunc=ashard_agent_node))
+    graph.add_node(
+        "tools",
+        ToolNode(
+            [
+                read_github_file_outline,
+                read_github_files,
+                read_github_file,
+                read_file_outline,
+                read_files,
+                read_file,
+            ]
+        ),
+    )
+    graph.set_entry_point("agent")
+    graph.add_conditional_edges(
+        "agent", tools_condition, {"tools": "tools", "__end__": END}
+    )
+    graph.add_edge("tools", "agent")
+    return graph.compile()
+
+
+shard_app = _build_shard_app()
+
+
+def _shard_config(config: RunnableConfig) -> RunnableConfig:
+    return {**config, "recursion_limit": SHARD_RECURSION_LIMIT}
+
+
+def shard_node(state: dict, config: RunnableConfig) -> AgentState:
+    """
+    Run one shard agent to completion and keep only its summary. A shard that
+    hits SHARD_RECURSION_LIMIT keeps what it found so far; any other error
+    fails the run.
+    """
+    result = None
+    try:
+        for result in shard_app.stream(
+            state, _shard_config(config), stream_mode="values"
+        ):
+            pass
+    except GraphRecursionError as e:
+        return _shard_update(state, result, e)
+    return _shard_update(state, result)
+
+
+async def ashard_node(state: dict, config: RunnableConfig) -> AgentState:
+    result = None
+    try:
+        async for result in shard_app.astream(
+            state, _shard_config(config), stream_mode="values"
+        ):
+            pass
+    except GraphRecursionError as e:
+        return _shard_update(state, result, e)
+    return _shard_update(state, result)
+
+
+def _shard_update(state: dict, result: Optional[dict], error=None) -> AgentState:
+    entry = dict(state["shard"])
+    entry["shard"] = entry.pop("name")
+    if error is not None:
+        # The analyzer is told which parts were cut short and reads them itself
+        entry["error"] = f"{type(error).__name__}: {error}"
+        record(shard_cutoffs=1)
+
+    messages = (result or {}).get("messages", [])
+    read, outlined = files_touched(messages)
+    entry.update(
+        summary=last_ai_text(messages),
+        files_read=list(dict.fromkeys(read)),
+        files_outlined=list(dict.fromkeys(outlined)),
+    )
+    return {"shard_summaries": [entry]}
+
+
+def merge_shards_node(state: AgentState) -> AgentState:
+    """Hand every shard's summary to the analyzer in one message"""
+    shards = sorted(state.get("shard_summaries") or [], key=lambda s: s["index"])
+
+    sections = []
+    for shard in shards:
+        body = shard.get("summary") or ""
+        if shard.get("error"):
+            # Cut short by the step limit: say what it covered so far
+            note = f"(analysis stopped early: {shard['error']})"
+            if shard.get("files_read"):
+                read = ", ".join(shard["files_read"])
+                note += f"\nFiles read before it stopped: {read}"
+            body = f"{body}\n{note}" if body else note
+        elif not body:
+            body = "(no summary)"
+        sections.append(f"### {shard['shard']} ({shard['files']} source files)\n{body}")
+
+    key_files = dict(state.get("key_files") or {})
+    key_files["shards"] = {shard["shard"]: shard["files"] for shard in shards}
+
+    summary = (
+        "## SHARD ANALYSES\n\n"
+        f"This repository was split into {len(shards)} parts, each analyzed by "
+        "its own agent:\n\n" + "\n\n".join(sections)
+    )
+    return {
+        "messages": [HumanMessage(content=summary)],
+        "key_files": key_files,
+        "current_agent": "analyzer",
+    }
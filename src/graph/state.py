@@ -1,13 +1,14 @@
 import operator
-
 from typing import TypedDict, Annotated, Sequence, Optional
 from langchain_core.messages import BaseMessage
+from langgraph.graph.message import add_messages
 
 
 class AgentState(TypedDict):
     """Shared state across all specialized agents"""
 
-    messages: Annotated[Sequence[BaseMessage], operator.add]
+    # add_messages lets the compaction steps replace a phase's transcript
+    messages: Annotated[Sequence[BaseMessage], add_messages]
 
     # Source information
     project_path: Optional[str]  # For local projects
@@ -24,6 +25,14 @@ class AgentState(TypedDict):
     entry_points: list
     repo_metadata: dict  # GitHub stars, description, etc.
 
+    # One entry per shard analyzed in parallel on large repositories
+    shard_summaries: Annotated[list, operator.add]
+
+    # Incremental regeneration
+    source_fingerprint: dict  # path -> blob SHA or mtime/size/sha1
+    changed_files: dict  # added / modified / removed since the last run
+    previous_readme: str
+
     # User customization
     example_readme: str
     user_preferences: dict
@@ -31,6 +40,7 @@ class AgentState(TypedDict):
     # Generation phase
     readme_sections: dict
     final_readme: str
+    readme_path: str  # Set once README.md has been written
 
     # Control flow
     current_agent: str
@@ -1,44 +1,122 @@
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import StateGraph, START, END
 from langgraph.prebuilt import ToolNode, tools_condition
 from graph.state import AgentState
-from graph.nodes import explorer_node, analyzer_node, writer_node
+from graph.nodes import (
+    aanalyzer_node,
+    aexplorer_node,
+    amanifest_node,
+    analyzer_node,
+    awriter_node,
+    explorer_node,
+    manifest_node,
+    writer_node,
+)
+from graph.compaction import compact_explorer_node, compact_analyzer_node
+from graph.shards import ashard_node, merge_shards_node, route_analysis, shard_node
+from graph.incremental import (
+    aincremental_node,
+    incremental_node,
+    route_incremental,
+    save_manifest_node,
+)
 from tools.github_tools import (
     explore_github_repo,
     read_github_file,
+    read_github_file_outline,
+    read_github_files,
     get_github_repo_metadata,
 )
-from tools.local_file_tools import explore_directory, read_file, write_readme
+from tools.local_file_tools import (
+    explore_directory,
+    read_file,
+    read_file_outline,
+    read_files,
+)
+
+
+def _node(func, afunc):
+    """A node that runs `func` under invoke/stream and `afunc` under ainvoke/astream"""
+    return RunnableLambda(func, afunc=afunc)
 
 
 workflow = StateGraph(AgentState)
 
-workflow.add_node("explorer", explorer_node)
-workflow.add_node("analyzer", analyzer_node)
-workflow.add_node("writer", writer_node)
+# Nodes waiting on the LLM or GitHub also have native async versions; the rest
+# only do local work and run on LangGraph's thread pool under astream.
+workflow.add_node("explorer", _node(explorer_node, aexplorer_node))
+workflow.add_node("analyzer", _node(analyzer_node, aanalyzer_node))
+workflow.add_node("writer", _node(writer_node, awriter_node))
+
+workflow.add_node("explorer_compact", compact_explorer_node)
+workflow.add_node("analyzer_compact", compact_analyzer_node)
+workflow.add_node("manifests", _node(manifest_node, amanifest_node))
+workflow.add_node("incremental", _node(incremental_node, aincremental_node))
+workflow.add_node("save_manifest", save_manifest_node)
+workflow.add_node("shard_analyzer", _node(shard_node, ashard_node))
+workflow.add_node("merge_shards", merge_shards_node)
 
 workflow.add_node(
     "explorer_tools",
     ToolNode([explore_github_repo, get_github_repo_metadata, explore_directory]),
 )
-workflow.add_node("analyzer_tools", ToolNode([read_github_file, read_file]))
-workflow.add_node("writer_tools", ToolNode([write_readme]))
+workflow.add_node(
+    "analyzer_tools",
+    ToolNode(
+        [
+            read_github_file_outline,
+            read_github_files,
+            read_github_file,
+            read_file_outline,
+            read_files,
+            read_file,
+        ]
+    ),
+)
 
-workflow.set_entry_point("explorer")
+workflow.set_entry_point("incremental")
+
+# Skip unchanged work when a previous run left a manifest behind
+workflow.add_conditional_edges(
+    "incremental",
+    route_incremental,
+    {"explorer": "explorer", "manifests": "manifests", "done": END},
+)
 
 # Explorer loop
 workflow.add_conditional_edges(
-    "explorer", tools_condition, {"tools": "explorer_tools", "__end__": "analyzer"}
+    "explorer",
+    tools_condition,
+    {"tools": "explorer_tools", "__end__": "explorer_compact"},
 )
 workflow.add_edge("explorer_tools", "explorer")
+workflow.add_edge("explorer_compact", "manifests")
 
-# Analyzer loop
+# Large repositories fan out to one shard agent per group of directories, at
+# most max_concurrency at a time; their summaries are merged for the analyzer
 workflow.add_conditional_edges(
-    "analyzer", tools_condition, {"tools": "analyzer_tools", "__end__": "writer"}
+    "manifests", route_analysis, ["analyzer", "shard_analyzer"]
 )
-workflow.add_edge("analyzer_tools", "analyzer")
+workflow.add_edge("shard_analyzer", "merge_shards")
+workflow.add_edge("merge_shards", "analyzer")
 
+# Analyzer loop
 workflow.add_conditional_edges(
-    "writer", tools_condition, {"tools": "writer_tools", "__end__": END}
+    "analyzer",
+    tools_condition,
+    {"tools": "analyzer_tools", "__end__": "analyzer_compact"},
 )
+workflow.add_edge("analyzer_tools", "analyzer")
+workflow.add_edge("analyzer_compact", "writer")
+
+# The writer streams README.md to disk itself
+workflow.add_edge("writer", "save_manifest")
+workflow.add_edge("save_manifest", END)
+
+
+def build_app(checkpointer=None):
+    """The compiled graph; with a checkpointer, state is saved after every step"""
+    return workflow.compile(checkpointer=checkpointer)
+
 
-app = workflow.compile()
+app = build_app()
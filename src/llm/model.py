@@ -1,26 +1,51 @@
 import os
-from typing import Literal
+import asyncio
+import threading
+import weakref
+import httpx
+from typing import Callable, Literal
+from langchain_core.language_models import BaseChatModel
 from langchain_openai import ChatOpenAI
+from llm.providers import API_KEY_ENV, BASE_URLS, register, registered_factory
+from utils.rate_limit import llm_limiter
+from utils.telemetry import record
+
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "20"))
+
+# Long-lived chat models and HTTP clients shared by every node call
+_models: dict = {}
+_http_clients: dict = {}
+
+# httpx connection pools belong to one event loop, so each loop gets its own
+# async clients: loop -> {provider: client}
+_async_http_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_loop_bound_clients: dict = {}
+_lock = threading.Lock()
+_stats = {"models_created": 0, "models_reused": 0, "http_clients_created": 0}
 
 
 class LLM:
 
     def __init__(self, provider: Literal["openai", "groq", "claude"] = "groq") -> None:
         self.provider = provider
-        self.base_urls = {
-            "openai": "https://api.openai.com/v1",
-            "groq": "https://api.groq.com/openai/v1",
-            "claude": "https://api.anthropic.com/v1/",
-        }
-
-    def get_model(self, model_name: str, temperature: float = 0.5) -> ChatOpenAI:
-        api_key_env = {
-            "openai": "OPENAI_API_KEY",
-            "groq": "GROQ_API_KEY",
-            "claude": "ANTHROPIC_API_KEY",
-        }
-
-        api_key = os.getenv(api_key_env[self.provider])
+        self.base_urls = BASE_URLS
+
+    def get_model(
+        self,
+        model_name: str,
+        temperature: float = 0.5,
+        http_client: httpx.Client = None,
+        http_async_client: httpx.AsyncClient = None,
+    ) -> ChatOpenAI:
+        if self.provider not in API_KEY_ENV:
+            raise ValueError(
+                f"Unknown provider: {self.provider} "
+                f"(expected one of: {', '.join(API_KEY_ENV)})"
+            )
+
+        api_key = os.getenv(API_KEY_ENV[self.provider])
         if not api_key:
             raise ValueError(f"Missing API key for provider: {self.provider}")
 
@@ -29,4 +54,127 @@ class LLM:
             temperature=temperature,
             api_key=api_key,
             base_url=self.base_urls[self.provider],
+            timeout=LLM_TIMEOUT,
+            max_retries=LLM_MAX_RETRIES,
+            http_client=http_client,
+            http_async_client=http_async_client,
+            # Token usage (including cached prompt tokens) for streamed replies
+            stream_usage=True,
         )
+
+
+def _get_http_client(provider: str) -> httpx.Client:
+    # Called with _lock held
+    if provider not in _http_clients:
+        limiter = llm_limiter(provider)
+
+        def _before(request):
+            # Counted per node; requests beyond one per LLM call are retries
+            record(llm_requests=1)
+            limiter.acquire()
+
+        def _after(response):
+            limiter.observe(response.status_code, response.headers)
+
+        _http_clients[provider] = httpx.Client(
+            timeout=LLM_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=LLM_POOL_SIZE,
+                max_keepalive_connections=LLM_POOL_SIZE,
+            ),
+            event_hooks={"request": [_before], "response": [_after]},
+        )
+        _stats["http_clients_created"] += 1
+    return _http_clients[provider]
+
+
+def _get_async_http_client(provider: str) -> httpx.AsyncClient:
+    """Pooled async client for `provider` on the running event loop"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        # Pooled connections keep a finished loop alive; drop its clients
+        for closed in [other for other in _async_http_clients if other.is_closed()]:
+            del _async_http_clients[closed]
+
+        clients = _async_http_clients.setdefault(loop, {})
+        if provider in clients:
+            return clients[provider]
+
+        limiter = llm_limiter(provider)
+
+        async def _before(request):
+            record(llm_requests=1)
+            await limiter.aacquire()
+
+        async def _after(response):
+            limiter.observe(response.status_code, response.headers)
+
+        clients[provider] = httpx.AsyncClient(
+            timeout=LLM_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=LLM_POOL_SIZE,
+                max_keepalive_connections=LLM_POOL_SIZE,
+            ),
+            event_hooks={"request": [_before], "response": [_after]},
+        )
+        _stats["http_clients_created"] += 1
+        return clients[provider]
+
+
+class _LoopBoundClient(httpx.AsyncClient):
+    """
+    The async client a shared chat model is built with. Chat models outlive
+    event loops (one asyncio.run per batch or benchmark run), so every request
+    is sent on the running loop's own pooled client instead of this one.
+    """
+
+    def __init__(self, provider: str):
+        super().__init__(timeout=LLM_TIMEOUT)
+        self.provider = provider
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        return await _get_async_http_client(self.provider).send(request, **kwargs)
+
+
+def _get_loop_bound_client(provider: str) -> httpx.AsyncClient:
+    # Called with _lock held
+    if provider not in _loop_bound_clients:
+        _loop_bound_clients[provider] = _LoopBoundClient(provider)
+    return _loop_bound_clients[provider]
+
+
+def register_provider(name: str, factory: Callable[[str, float], BaseChatModel]):
+    """Serve `name` from `factory` instead of an OpenAI-compatible endpoint"""
+    with _lock:
+        register(name, factory)
+
+
+def get_shared_model(
+    provider: str, model_name: str, temperature: float = 0.5
+) -> BaseChatModel:
+    """Process-wide chat model per (provider, model, temperature) on a pooled client"""
+    key = (provider, model_name, temperature)
+    with _lock:
+        if key in _models:
+            _stats["models_reused"] += 1
+            return _models[key]
+
+        factory = registered_factory(provider)
+        if factory:
+            model = factory(model_name, temperature)
+        else:
+            model = LLM(provider=provider).get_model(
+                model_name=model_name,
+                temperature=temperature,
+                http_client=_get_http_client(provider),
+                http_async_client=_get_loop_bound_client(provider),
+            )
+        _models[key] = model
+        _stats["models_created"] += 1
+        return model
+
+
+def model_stats() -> dict:
+    """How often chat models were created versus reused"""
+    with _lock:
+        return dict(_stats)
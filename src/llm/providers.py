@@ -0,0 +1,47 @@
+import os
+from typing import Callable, Optional
+
+# Built-in providers: all serve an OpenAI-compatible chat completions API.
+# Kept free of langchain imports so settings can be checked without it.
+BASE_URLS = {
+    "openai": "https://api.openai.com/v1",
+    "groq": "https://api.groq.com/openai/v1",
+    "claude": "https://api.anthropic.com/v1/",
+}
+API_KEY_ENV = {
+    "openai": "OPENAI_API_KEY",
+    "groq": "GROQ_API_KEY",
+    "claude": "ANTHROPIC_API_KEY",
+}
+
+# Model used when a run doesn't name one; LLM_MODEL overrides it
+DEFAULT_PROVIDER = "groq"
+DEFAULT_MODELS = {
+    "groq": "moonshotai/kimi-k2-instruct-0905",
+    "openai": "gpt-4o",
+}
+
+# Extra providers: name -> factory(model_name, temperature) returning a chat model
+_registered: dict = {}
+
+
+def register(name: str, factory: Callable) -> None:
+    _registered[name] = factory
+
+
+def registered_factory(name: str) -> Optional[Callable]:
+    return _registered.get(name)
+
+
+def is_provider(name: str) -> bool:
+    """Whether `name` is a built-in or registered provider"""
+    return name in BASE_URLS or name in _registered
+
+
+def default_provider() -> str:
+    return os.getenv("LLM_PROVIDER") or DEFAULT_PROVIDER
+
+
+def default_model(provider: str) -> Optional[str]:
+    """LLM_MODEL, or the provider's default model (None if it has none)"""
+    return os.getenv("LLM_MODEL") or DEFAULT_MODELS.get(provider)
@@ -1,9 +1,29 @@
 import os
+import sys
+import json
+import time
 import argparse
+from pathlib import Path
+from typing import Optional
 from dotenv import load_dotenv
-from graph.workflow import app
-from langchain_core.messages import HumanMessage
-from utils.github_repo import parse_github_url
+from llm.providers import default_model, default_provider
+from utils.github_url import parse_github_url
+
+# The LangChain/LangGraph stack is imported inside the functions that run the
+# graph, so --help, argument errors and --dry-run return without loading it.
+
+
+def read_repo_list(path: str) -> list:
+    """Read repositories from a file (or stdin for "-"), one per line"""
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+    repos = [line.strip() for line in lines]
+    repos = [repo for repo in repos if repo and not repo.startswith("#")]
+    return list(dict.fromkeys(repos))
 
 
 def main():
@@ -11,19 +31,46 @@ def main():
 
     parser = argparse.ArgumentParser(description="AI Repo Explorer")
 
-    parser.add_argument("--repo", required=True, help="GitHub URL or local path")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--repo", help="GitHub URL or local path")
+    source.add_argument(
+        "--repos-file",
+        help="File with one GitHub URL or local path per line ('-' for stdin)",
+    )
+    source.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Continue a failed or interrupted run from its last completed step",
+    )
 
     parser.add_argument(
         "--provider",
-        default=os.getenv("LLM_PROVIDER", "groq"),
+        default=default_provider(),
         choices=["openai", "groq"],
         help="LLM provider (overrides LLM_PROVIDER env var)",
     )
 
     parser.add_argument(
         "--model",
-        default=os.getenv("LLM_MODEL", "moonshotai/kimi-k2-instruct-0905"),
-        help="Specific model name (overrides LLM_MODEL env var)",
+        help="Specific model name (overrides LLM_MODEL env var; default depends on "
+        "the provider)",
+    )
+    for agent in ("explorer", "analyzer", "writer"):
+        parser.add_argument(
+            f"--{agent}-model",
+            metavar="[PROVIDER:]MODEL",
+            help=f"Model for the {agent} (env {agent.upper()}_MODEL, default: --model)",
+        )
+        parser.add_argument(
+            f"--{agent}-temperature",
+            type=float,
+            help=f"Sampling temperature for the {agent} (default: 0.5)",
+        )
+    parser.add_argument(
+        "--escalate",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Retry a turn on --model when a per-agent model makes invalid tool calls",
     )
     parser.add_argument("--example", help="Path to an example README for style")
     parser.add_argument("--output", default=".", help="Output directory")
@@ -33,24 +80,86 @@ def main():
         default=30,
         help="Maximum recursion depth for agent interactions",
     )
+    parser.add_argument(
+        "--read-budget",
+        type=int,
+        default=None,
+        help="Tokens of file content a run may read (default: per model, "
+        "READ_TOKEN_BUDGET; 0 disables the budget)",
+    )
+    parser.add_argument(
+        "--cache",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("LLM_CACHE", "").lower() in ("1", "true", "yes"),
+        help="Replay cached LLM responses for identical requests (default: off)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Only re-analyze files changed since the last generated README",
+    )
+    parser.add_argument(
+        "--snapshot",
+        action="store_true",
+        default=os.getenv("GITHUB_SNAPSHOT", "").lower() in ("1", "true", "yes"),
+        help="Download the GitHub repository tarball once and read files locally",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=int(os.getenv("BATCH_CONCURRENCY", "4")),
+        help="Repositories generated at the same time with --repos-file",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("AUTOREADME_CHECKPOINT", "").lower() in ("1", "true", "yes"),
+        help="Save the run's state after every step so --resume can continue it",
+    )
+    parser.add_argument(
+        "--shard-concurrency",
+        type=int,
+        default=int(os.getenv("SHARD_CONCURRENCY", "4")),
+        help="Shards of a large repository analyzed at the same time",
+    )
+    parser.add_argument(
+        "--telemetry",
+        default=os.getenv("AUTOREADME_TELEMETRY"),
+        help="Append per-node, per-tool and LLM events to this JSON lines file",
+    )
+    parser.add_argument(
+        "--metrics",
+        default=os.getenv("AUTOREADME_METRICS"),
+        help="Write run totals in Prometheus text format to this file",
+    )
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action=argparse.BooleanOptionalAction,
+        default=os.getenv("AUTOREADME_ASYNC", "").lower() in ("1", "true", "yes"),
+        help="Run on one event loop (app.astream) instead of a thread per job",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Validate the inputs and print what would run, without calling an LLM",
+    )
+    parser.add_argument(
+        "--report",
+        help="Batch summary report path (default: <output>/batch_report.json)",
+    )
 
     args = parser.parse_args()
 
-    is_github = "github.com" in args.repo
-    github_url = args.repo if is_github else None
-    project_path = args.repo if not is_github else None
+    if args.snapshot:
+        os.environ["GITHUB_SNAPSHOT"] = "1"
+    args.model = args.model or default_model(args.provider)
 
-    if not project_path and not github_url:
-        raise ValueError("Must provide either local project path or valid github url")
+    if args.dry_run:
+        sys.exit(dry_run(args))
 
-    github_repo = None
-    if github_url:
-        try:
-            owner, repo = parse_github_url(github_url)
-            github_repo = {"owner": owner, "repo": repo}
-            print(f"📦 GitHub Repository: {owner}/{repo}")
-        except ValueError as e:
-            raise ValueError(f"Invalid GitHub URL: {e}")
+    resumed = resume_run(args) if args.resume else None
 
     example_readme = ""
     if args.example:
@@ -60,94 +169,473 @@ def main():
         except Exception as e:
             print(f"⚠️ Could not load example: {e}")
 
-    source_desc = github_url if github_url else project_path
-    initial_state = {
-        "messages": [
-            HumanMessage(content=f"Generate a comprehensive README for: {source_desc}")
-        ],
-        "project_path": project_path,
-        "github_url": github_url,
-        "github_repo": github_repo,
-        "output_path": args.output,
-        "directory_structure": {},
-        "key_files": {},
-        "tech_stack": [],
-        "dependencies": {},
-        "project_purpose": "",
-        "entry_points": [],
-        "repo_metadata": {},
-        "example_readme": example_readme,
-        "user_preferences": {},
-        "readme_sections": {},
-        "final_readme": "",
-        "current_agent": "explorer",
-        "next_agent": "explorer",
-        "analysis_complete": False,
-        "generation_complete": False,
-    }
-
     config = {
         "configurable": {
             "provider": args.provider,
-            "model_name": args.model
-            or ("llama-3.3-70b-versatile" if args.provider == "groq" else "gpt-4o"),
+            "model_name": args.model,
+            "cache": args.cache,
+            "incremental": args.incremental,
+            "agents": agent_options(args),
         },
         "recursion_limit": args.recursion_limit,
+        "max_concurrency": args.shard_concurrency,
     }
+    if args.escalate is not None:
+        config["configurable"]["escalate"] = args.escalate
+    if args.read_budget is not None:
+        config["configurable"]["read_budget"] = args.read_budget
+
+    if args.repos_file:
+        run_batch_cli(args, config, example_readme)
+        return
+
+    run_id = None
+    if resumed:
+        if resumed["status"] == "ok":
+            print(f"✅ Run {args.resume} already completed")
+            return
+        # Same repository, output and settings as the run being resumed
+        run_id = args.resume
+        config = resumed["config"]
+        example_readme = resumed["example_readme"]
+
+    from graph.runner import build_initial_state, read_budget_for
+    from agents.agent_handler import client_stats
+    from utils.blob_cache import get_blob_cache
+    from utils.telemetry import RunTelemetry, with_telemetry, write_prometheus
+    from utils.read_budget import use_read_budget
 
-    print(f"\n> Starting README Generation using {args.provider.upper()}...")
+    initial_state = build_initial_state(args.repo, args.output, example_readme)
+    github_url = initial_state["github_url"]
+    if initial_state["github_repo"]:
+        owner = initial_state["github_repo"]["owner"]
+        repo = initial_state["github_repo"]["repo"]
+        print(f"📦 GitHub Repository: {owner}/{repo}")
+
+    store = None
+    if run_id or args.checkpoint:
+        from graph.checkpoint import get_run_store, new_run_id
+
+        store = get_run_store()
+        if not run_id:
+            run_id = new_run_id()
+            store.create(run_id, args.repo, args.output, config, example_readme)
+
+    action = "Resuming" if resumed else "Starting"
+    print(f"\n> {action} README Generation using {args.provider.upper()}...")
+    if run_id:
+        print(f"   Run ID: {run_id}")
     print(f"{'='*70}")
 
-    current_agent = None
-    for event in app.stream(initial_state, config=config, stream_mode="updates"):
-        for node_name, node_output in event.items():
-            if (
-                node_name in ["explorer", "analyzer", "writer"]
-                and node_name != current_agent
-            ):
-                current_agent = node_name
-                print(f"\n# {node_name.upper()} AGENT ACTIVATED")
-                print(f"{'='*70}")
-
-            if "messages" in node_output:
-                last_msg = node_output["messages"][-1]
-
-                if hasattr(last_msg, "content") and last_msg.content:
-                    if node_name == "writer":
-                        content = last_msg.content
-                        if len(content) > 200:
-                            first_line = (
-                                content.split("\n")[0]
-                                if "\n" in content
-                                else content[:100]
-                            )
-                            print(f" First Line: {first_line}")
-                            print(
-                                f"   Generated {len(content)} character README with {content.count('##')} sections"
-                            )
-                        else:
-                            print(f"{content}")
-                    else:
-                        preview = last_msg.content[:150].replace("\n", " ")
-                        print(f"{preview}...")
-
-                if hasattr(last_msg, "tool_calls") and last_msg.tool_calls:
-                    for tc in last_msg.tool_calls:
-                        print(f"   Tool: {tc['name']}")
-
-                        if tc["name"] == "write_readme" and "content" in tc.get(
-                            "args", {}
-                        ):
-                            readme = tc["args"]["content"]
-                            title = (
-                                readme.split("\n")[0] if "\n" in readme else "README"
-                            )
-                            print(f"      Title: {title}")
-                            print(
-                                f"      Stats: {len(readme)} chars, {len(readme.split(chr(10)))} lines"
-                            )
+    recorder = RunTelemetry(args.repo, args.telemetry)
+    budget = read_budget_for(config)
+    status = "error"
+    try:
+        run_config = with_telemetry(config, recorder)
+        with use_read_budget(budget):
+            if args.use_async:
+                import asyncio
+
+                asyncio.run(astream_run(initial_state, run_config, run_id))
+            else:
+                stream_run(initial_state, run_config, run_id)
+        status = "ok"
+    finally:
+        if budget:
+            recorder.emit("read_budget", **budget.report())
+        summary = recorder.finish(status)
+        if args.metrics:
+            write_prometheus(args.metrics)
+        if store:
+            store.set_status(run_id, status)
+            if status != "ok":
+                print(f"\n❌ Run failed; continue it with: --resume {run_id}")
 
     print(f"\n{'='*70}\n✨ README Generation Complete!")
+    print_telemetry(summary)
+    if budget:
+        print_read_budget(budget.report())
+
+    clients = client_stats()
+    print(
+        f"   LLM clients: {clients['models_created']} created, "
+        f"{clients['models_reused']} reused"
+    )
+
+    blob_cache = get_blob_cache()
+    if github_url and blob_cache:
+        stats = blob_cache.stats()
+        print(
+            f"   Blob cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({stats['bytes_read']} bytes served from cache)"
+        )
+    print_rate_limits()
+
+
+def print_rate_limits() -> None:
+    from utils.rate_limit import rate_limit_stats
+
+    for name, budget in rate_limit_stats().items():
+        line = f"   Rate limit {name}:"
+        if budget["remaining"] is not None:
+            line += f" {budget['remaining']}"
+            if budget["limit"]:
+                line += f"/{budget['limit']}"
+            line += " left"
+            if budget["reset_in"] is not None:
+                line += f" (resets in {budget['reset_in']:.0f}s)"
+        line += f", waited {budget['wait_seconds']}s over {budget['waits']} waits"
+        if budget["throttled"]:
+            line += f", {budget['throttled']} throttled responses"
+        print(line)
+
+
+def print_telemetry(summary: dict) -> None:
+    totals = summary["totals"]
+    print(
+        f"   Time: {totals['seconds']}s, LLM: {totals['llm_calls']} calls, "
+        f"{totals['prompt_tokens']} prompt + {totals['completion_tokens']} "
+        f"completion tokens, GitHub: {totals['github_calls']} calls "
+        f"({totals['github_bytes']} bytes)"
+    )
+    if totals["prompt_tokens"]:
+        share = totals["cached_tokens"] / totals["prompt_tokens"] * 100
+        print(
+            f"   Prompt cache: {totals['cached_tokens']} of "
+            f"{totals['prompt_tokens']} prompt tokens cached ({share:.0f}%)"
+        )
+    for name, node in summary["nodes"].items():
+        if not node["calls"]:
+            continue
+        line = f"   - {name}: {node['seconds']}s over {node['calls']} call(s)"
+        if node["llm_calls"]:
+            line += f", {node['llm_seconds']}s LLM"
+        if node["llm_retries"]:
+            line += f", {node['llm_retries']} retries"
+        if node.get("model_escalations"):
+            line += f", {node['model_escalations']} escalated"
+        if node.get("shard_cutoffs"):
+            line += f", {node['shard_cutoffs']} shard(s) hit the step limit"
+        if node["github_calls"]:
+            line += f", {node['github_calls']} GitHub calls"
+        print(line)
+
+
+def print_read_budget(report: dict) -> None:
+    kinds = ", ".join(f"{kind} {tokens}" for kind, tokens in report["by_kind"].items())
+    line = f"   Read budget: {report['spent']} of {report['total']} tokens"
+    if kinds:
+        line += f" ({kinds})"
+    if report["excerpted"] or report["skipped"]:
+        line += (
+            f", {len(report['excerpted'])} files excerpted, "
+            f"{len(report['skipped'])} skipped"
+        )
+    print(line)
+
+
+def agent_options(args) -> dict:
+    """Per-agent model and temperature flags that were given on the command line"""
+    agents = {}
+    for agent in ("explorer", "analyzer", "writer"):
+        options = {
+            "model": getattr(args, f"{agent}_model"),
+            "temperature": getattr(args, f"{agent}_temperature"),
+        }
+        options = {k: v for k, v in options.items() if v is not None}
+        if options:
+            agents[agent] = options
+    return agents
+
+
+def resume_run(args) -> dict:
+    """The saved run for --resume, with args pointed at its repository and model"""
+    run = find_run(args.resume)
+    if run is None:
+        print(f"❌ Unknown run ID: {args.resume}")
+        sys.exit(2)
+    point_args_at_run(args, run)
+    return run
+
+
+def find_run(run_id: str) -> Optional[dict]:
+    """A saved run, without creating the checkpoint database when there is none"""
+    from graph.checkpoint import checkpoint_path, get_run_store
+
+    if not checkpoint_path().exists():
+        return None
+    return get_run_store().get(run_id)
+
+
+def point_args_at_run(args, run: dict) -> None:
+    setup = run["config"].get("configurable", {})
+    args.repo = run["repo"]
+    args.output = run["output_path"]
+    args.provider = setup.get("provider", args.provider)
+    args.model = setup.get("model_name", args.model)
+
+
+def stream_run(initial_state: dict, config: dict, run_id: str = None) -> None:
+    """
+    Run the graph for one repository, printing progress as nodes finish.
+
+    With a run ID the state is checkpointed after every step, and a run that
+    stopped part way continues from its last completed step.
+    """
+    from graph.workflow import app, build_app
+
+    if not run_id:
+        return _print_stream(app, initial_state, config)
+
+    from graph.checkpoint import checkpointer, thread_config
+
+    config = thread_config(config, run_id)
+    with checkpointer() as saver:
+        graph = build_app(saver)
+        if graph.get_state(config).next:
+            initial_state = None
+        _print_stream(graph, initial_state, config)
+        # Only unfinished runs are worth keeping
+        saver.delete_thread(run_id)
+
+
+def _print_stream(graph, initial_state, config: dict) -> None:
+    current_agent = None
+    for mode, event in graph.stream(
+        initial_state, config=config, stream_mode=["updates", "custom"]
+    ):
+        current_agent = print_event(mode, event, current_agent)
+
+
+async def astream_run(initial_state: dict, config: dict, run_id: str = None) -> None:
+    """stream_run on an event loop through app.astream"""
+    from graph.workflow import app, build_app
+
+    if not run_id:
+        return await _aprint_stream(app, initial_state, config)
+
+    from graph.checkpoint import acheckpointer, thread_config
+
+    config = thread_config(config, run_id)
+    async with acheckpointer() as saver:
+        graph = build_app(saver)
+        if (await graph.aget_state(config)).next:
+            initial_state = None
+        await _aprint_stream(graph, initial_state, config)
+        await saver.adelete_thread(run_id)
+
+
+async def _aprint_stream(graph, initial_state, config: dict) -> None:
+    current_agent = None
+    async for mode, event in graph.astream(
+        initial_state, config=config, stream_mode=["updates", "custom"]
+    ):
+        current_agent = print_event(mode, event, current_agent)
+
+
+def print_event(mode: str, event: dict, current_agent):
+    """Print one stream event; returns the agent that is active afterwards"""
+    if mode == "custom":
+        progress = event.get("readme_progress")
+        if progress:
+            print(
+                f"\r   Writing README: {progress['bytes']} bytes, "
+                f"{progress['lines']} lines, {progress['sections']} sections",
+                end="",
+                flush=True,
+            )
+        return current_agent
+
+    for node_name, node_output in event.items():
+        if node_name == "incremental":
+            changes = node_output.get("changed_files") or {}
+            if node_output.get("next_agent") == "done":
+                print("\n✅ README is up to date, nothing changed since last run")
+            elif node_output.get("next_agent") == "manifests":
+                counts = ", ".join(f"{len(v)} {k}" for k, v in changes.items())
+                print(f"\n♻️  Incremental update: {counts}")
+            continue
+
+        if node_name == "shard_analyzer":
+            for shard in node_output.get("shard_summaries", []):
+                status = "failed" if shard.get("error") else "analyzed"
+                print(f"   Shard {shard['shard']}: {shard['files']} files {status}")
+            continue
+
+        if node_name in ("explorer", "analyzer", "writer") and (
+            node_name != current_agent
+        ):
+            current_agent = node_name
+            print(f"\n# {node_name.upper()} AGENT ACTIVATED")
+            print(f"{'='*70}")
+
+        if "messages" in node_output:
+            last_msg = node_output["messages"][-1]
+
+            if hasattr(last_msg, "content") and last_msg.content:
+                if node_name == "writer":
+                    print(f"\n{last_msg.content}")
+                else:
+                    preview = last_msg.content[:150].replace("\n", " ")
+                    print(f"{preview}...")
+
+            if hasattr(last_msg, "tool_calls") and last_msg.tool_calls:
+                for tc in last_msg.tool_calls:
+                    print(f"   Tool: {tc['name']}")
+    return current_agent
+
+
+def describe_source(repo: str) -> str:
+    """What a --repo value points at; ValueError if it cannot be used"""
+    if "github.com" in repo:
+        owner, name = parse_github_url(repo)
+        return f"GitHub repository {owner}/{name}"
+
+    path = Path(repo)
+    if not path.is_dir():
+        raise ValueError(f"Not a directory: {repo}")
+    return f"local project {path.resolve()}"
+
+
+def dry_run(args) -> int:
+    """Check every input a run needs and print the plan; returns the exit code"""
+    problems = []
+    if args.resume:
+        run = find_run(args.resume)
+        if run is None:
+            print(f"❌ Unknown run ID: {args.resume}")
+            return 1
+        point_args_at_run(args, run)
+        print(f"> Would resume run {args.resume} ({run['status']})")
+    repos = [args.repo]
+    if args.repos_file:
+        try:
+            repos = read_repo_list(args.repos_file)
+        except OSError as e:
+            problems.append(f"Cannot read {args.repos_file}: {e}")
+            repos = []
+        if not repos and not problems:
+            problems.append(f"No repositories listed in {args.repos_file}")
+
+    print(f"> Dry run: {len(repos)} repositor{'y' if len(repos) == 1 else 'ies'}")
+    for repo in repos:
+        try:
+            print(f"   ✅ {repo}: {describe_source(repo)}")
+        except ValueError as e:
+            problems.append(f"{repo}: {e}")
+            print(f"   ❌ {repo}: {e}")
+
+    if args.example and not os.path.isfile(args.example):
+        problems.append(f"Example README not found: {args.example}")
+
+    output = Path(args.output)
+    existing = next((p for p in [output, *output.parents] if p.exists()), None)
+    if existing is None or not os.access(existing, os.W_OK):
+        problems.append(f"Output directory is not writable: {args.output}")
+
+    from agents.routing import AGENTS, DEFAULT_TEMPERATURE, agent_settings
+    from llm.providers import API_KEY_ENV, is_provider
+
+    plan_config = {
+        "configurable": {
+            "provider": args.provider,
+            "model_name": args.model,
+            "agents": agent_options(args),
+        }
+    }
+    routes = {agent: agent_settings(plan_config, agent) for agent in AGENTS}
+    providers = [args.provider] + [r["provider"] for r in routes.values()]
+    for provider in dict.fromkeys(providers):
+        if not is_provider(provider):
+            problems.append(f"Unknown provider: {provider}")
+            continue
+        key_env = API_KEY_ENV.get(provider)
+        if key_env and not os.getenv(key_env):
+            problems.append(f"Missing API key: set {key_env}")
+    if any("github.com" in repo for repo in repos) and not os.getenv("GITHUB_TOKEN"):
+        print("   ⚠️ GITHUB_TOKEN is not set; GitHub allows 60 requests per hour")
+
+    print(f"   Provider: {args.provider}, model: {args.model}")
+    for agent, route in routes.items():
+        if route == {
+            "provider": args.provider,
+            "model_name": args.model,
+            "temperature": DEFAULT_TEMPERATURE,
+        }:
+            continue
+        print(
+            f"   {agent.capitalize()}: {route['provider']}:{route['model_name']}"
+            f" (temperature {route['temperature']})"
+        )
+    print(f"   Output: {output.resolve()}")
+    for problem in problems:
+        print(f"❌ {problem}")
+    if not problems:
+        print("✨ Inputs look good")
+    return 1 if problems else 0
+
+
+def run_batch_cli(args, config: dict, example_readme: str) -> None:
+    from graph.workflow import app
+    from graph.runner import arun_batch, run_batch
+    from agents.agent_handler import client_stats
+    from utils.rate_limit import rate_limit_stats
+    from utils.telemetry import write_prometheus
+
+    repos = read_repo_list(args.repos_file)
+    print(f"\n> Generating READMEs for {len(repos)} repositories")
+    print(f"   Concurrency: {args.concurrency}, provider: {args.provider.upper()}")
+    if args.use_async:
+        print("   Mode: async (one event loop)")
+    print(f"{'='*70}")
+
+    def _report(result: dict) -> None:
+        mark = "✅" if result["status"] == "ok" else "❌"
+        detail = f" ({result['error']})" if result.get("error") else ""
+        print(
+            f"{mark} {result['repo']}: {result['status']} "
+            f"in {result['seconds']}s{detail}"
+        )
+
+    batch_args = (app, repos, args.output, config)
+    batch_kwargs = {
+        "example_readme": example_readme,
+        "concurrency": args.concurrency,
+        "on_result": _report,
+        "telemetry_path": args.telemetry,
+    }
+    started = time.perf_counter()
+    if args.use_async:
+        import asyncio
+
+        results = asyncio.run(arun_batch(*batch_args, **batch_kwargs))
+    else:
+        results = run_batch(*batch_args, **batch_kwargs)
+    elapsed = time.perf_counter() - started
+    if args.metrics:
+        write_prometheus(args.metrics)
+
+    succeeded = sum(1 for r in results if r["status"] == "ok")
+    report = {
+        "total": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        # Wall-clock time of the whole batch; repo_seconds adds up every run
+        "total_seconds": round(elapsed, 3),
+        "repo_seconds": round(sum(r["seconds"] for r in results), 3),
+        "clients": client_stats(),
+        "rate_limits": rate_limit_stats(),
+        "results": results,
+    }
+
+    report_path = args.report or os.path.join(args.output, "batch_report.json")
+    os.makedirs(os.path.dirname(os.path.abspath(report_path)), exist_ok=True)
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'='*70}\n✨ Batch complete: {succeeded}/{len(results)} succeeded")
+    print(f"   Report: {report_path}")
+    print_rate_limits()
 
 
 if __name__ == "__main__":
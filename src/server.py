@@ -0,0 +1,241 @@
+import os
+import json
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+from dotenv import load_dotenv
+from llm.providers import default_model, default_provider, is_provider
+from utils.github_url import parse_github_url
+
+# Largest accepted request body; the example README is sent inline
+MAX_BODY_BYTES = 1024 * 1024
+
+# How long a follow=1 event stream waits for news before sending a keep-alive
+FOLLOW_POLL_SECONDS = 15.0
+
+
+def normalize_request(body: dict) -> dict:
+    """Validated job request with defaults filled in; ValueError if invalid"""
+    repo = body.get("repo")
+    if not isinstance(repo, str) or not repo.strip():
+        raise ValueError("'repo' must be a GitHub URL or a local path")
+    repo = repo.strip()
+    if "github.com" in repo:
+        parse_github_url(repo)
+    elif not Path(repo).is_dir():
+        raise ValueError(f"Not a directory: {repo}")
+    else:
+        repo = str(Path(repo).resolve())
+
+    provider = body.get("provider") or default_provider()
+    if not is_provider(provider):
+        raise ValueError(f"Unknown provider: {provider}")
+    model = body.get("model") or default_model(provider)
+    if not model:
+        raise ValueError(f"'model' is required for provider {provider}")
+
+    example = body.get("example") or ""
+    if not isinstance(example, str):
+        raise ValueError("'example' must be the text of an example README")
+
+    return {
+        "repo": repo,
+        "provider": provider,
+        "model": model,
+        "example": example,
+        "cache": bool(body.get("cache", False)),
+        "incremental": bool(body.get("incremental", True)),
+        "recursion_limit": _int(body.get("recursion_limit", 30), "recursion_limit"),
+        "read_budget": (
+            None
+            if body.get("read_budget") is None
+            else _int(body["read_budget"], "read_budget")
+        ),
+    }
+
+
+def _int(value, name: str) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' must be an integer")
+
+
+def make_handler(jobs):
+    """Request handler class bound to one JobQueue"""
+    from agents.agent_handler import client_stats
+    from graph.jobs import QueueFull
+    from utils.rate_limit import rate_limit_stats
+    from utils.telemetry import prometheus_text
+
+    class Handler(BaseHTTPRequestHandler):
+        server_version = "AutoREADME"
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            parts = [p for p in parsed.path.split("/") if p]
+            query = parse_qs(parsed.query)
+
+            if parts == ["healthz"]:
+                stats = {
+                    "jobs": jobs.stats(),
+                    "clients": client_stats(),
+                    "rate_limits": rate_limit_stats(),
+                }
+                return self._json(200, {"status": "ok", **stats})
+            if parts == ["metrics"]:
+                return self._send(
+                    200, prometheus_text().encode(), "text/plain; version=0.0.4"
+                )
+            if parts == ["jobs"]:
+                return self._json(200, {"jobs": [j.to_dict() for j in jobs.jobs()]})
+            if len(parts) < 2 or parts[0] != "jobs":
+                return self._json(404, {"error": "Not found"})
+
+            job = jobs.get(parts[1])
+            if job is None:
+                return self._json(404, {"error": f"Unknown job: {parts[1]}"})
+            if len(parts) == 2:
+                return self._json(200, job.to_dict())
+            if parts[2:] == ["events"]:
+                return self._events(job, query)
+            if parts[2:] == ["readme"]:
+                return self._readme(job)
+            return self._json(404, {"error": "Not found"})
+
+        def do_POST(self):
+            if urlparse(self.path).path.rstrip("/") != "/jobs":
+                return self._json(404, {"error": "Not found"})
+
+            length = int(self.headers.get("Content-Length") or 0)
+            if length > MAX_BODY_BYTES:
+                return self._json(413, {"error": "Request body too large"})
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(body, dict):
+                    raise ValueError("Expected a JSON object")
+                request = normalize_request(body)
+            except ValueError as e:
+                return self._json(400, {"error": str(e)})
+
+            try:
+                job, created = jobs.submit(request)
+            except QueueFull as e:
+                return self._json(503, {"error": str(e)})
+            return self._json(202, {**job.to_dict(), "deduplicated": not created})
+
+        def _events(self, job, query: dict) -> None:
+            """Progress events as JSON lines; follow=1 streams until the job ends"""
+            try:
+                after = max(0, int(query.get("after", ["0"])[0]))
+            except ValueError:
+                return self._json(400, {"error": "'after' must be an integer"})
+            follow = query.get("follow", ["0"])[0] in ("1", "true")
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            try:
+                while True:
+                    timeout = FOLLOW_POLL_SECONDS if follow else 0
+                    events = job.wait_events(after, timeout)
+                    for event in events:
+                        self.wfile.write(json.dumps(event).encode() + b"\n")
+                    after += len(events)
+                    if not follow or (job.done and after >= len(job.events)):
+                        return
+                    if not events:
+                        self.wfile.write(b"\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                return
+
+        def _readme(self, job) -> None:
+            path = (job.result or {}).get("output_path")
+            readme = Path(path) / "README.md" if path else None
+            if job.status != "ok" or not readme or not readme.exists():
+                return self._json(
+                    409, {"error": f"No README for this job ({job.status})"}
+                )
+            self._send(200, readme.read_bytes(), "text/markdown; charset=utf-8")
+
+        def _json(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload, default=str).encode()
+            self._send(status, body, "application/json")
+
+        def _send(self, status: int, body: bytes, content_type: str) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            if os.getenv("AUTOREADME_ACCESS_LOG", "").lower() in ("1", "true", "yes"):
+                super().log_message(format, *args)
+
+    return Handler
+
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="AutoREADME job service")
+    parser.add_argument("--host", default=os.getenv("AUTOREADME_HOST", "127.0.0.1"))
+    parser.add_argument(
+        "--port", type=int, default=int(os.getenv("AUTOREADME_PORT", "8080"))
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("AUTOREADME_WORKERS", "4")),
+        help="Jobs generated at the same time",
+    )
+    parser.add_argument(
+        "--max-queued",
+        type=int,
+        default=int(os.getenv("AUTOREADME_MAX_QUEUED", "100")),
+        help="Jobs waiting for a worker before new ones are rejected",
+    )
+    parser.add_argument(
+        "--output",
+        default=os.getenv("AUTOREADME_OUTPUT", "./readmes"),
+        help="Root directory; each repository gets its own subdirectory",
+    )
+    parser.add_argument(
+        "--telemetry",
+        default=os.getenv("AUTOREADME_TELEMETRY"),
+        help="Append per-node, per-tool and LLM events to this JSON lines file",
+    )
+    args = parser.parse_args()
+
+    # Compile the graph once; every job reuses it and the clients it creates
+    from graph.jobs import JobQueue
+    from graph.workflow import app
+
+    jobs = JobQueue(
+        app,
+        args.output,
+        workers=args.workers,
+        max_queued=args.max_queued,
+        telemetry_path=args.telemetry,
+    )
+    jobs.start()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(jobs))
+    server.daemon_threads = True
+    print(f"> AutoREADME service on http://{args.host}:{args.port}")
+    print(f"   Workers: {jobs.workers}, output: {Path(args.output).resolve()}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n> Shutting down, cancelling queued jobs")
+    finally:
+        server.server_close()
+        jobs.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,100 @@
 import json
 import os
+import asyncio
 from langchain_core.tools import tool
-from utils.github_repo import GitHubRepo
+from utils.code_outline import MAX_SOURCE_BYTES, outline_source
+from utils.github_repo import GitHubRepo, snapshot_enabled
+from utils.read_budget import charge_outlines, current_budget, fit_reads
+from tools.local_file_tools import (
+    MAX_BATCH_FILES,
+    MAX_OUTLINE_FILES,
+    READ_ERRORS,
+    aread_in_parallel,
+    read_in_parallel,
+    read_local_file,
+)
+
+
+IGNORE_PATTERNS = {
+    "node_modules",
+    ".git",
+    "__pycache__",
+    "dist",
+    "build",
+    ".next",
+    ".cache",
+    "coverage",
+    "vendor",
+    "target",
+    "test",
+    "tests",
+    "__tests__",
+    ".github",
+    "docs",
+    "examples",
+}
+
+CONFIG_FILES = {
+    "package.json",
+    "requirements.txt",
+    "pyproject.toml",
+    "setup.py",
+    "Cargo.toml",
+    "go.mod",
+    "composer.json",
+    "build.gradle",
+    "pom.xml",
+    "Makefile",
+    "Dockerfile",
+    "docker-compose.yml",
+    "README.md",
+    "LICENSE",
+    ".env.example",
+    "tsconfig.json",
+    "setup.cfg",
+    "poetry.lock",
+    "yarn.lock",
+    "package-lock.json",
+}
+
+SOURCE_EXTENSIONS = {
+    ".py",
+    ".js",
+    ".jsx",
+    ".ts",
+    ".tsx",
+    ".go",
+    ".rs",
+    ".java",
+    ".cpp",
+    ".c",
+    ".h",
+    ".rb",
+    ".php",
+    ".swift",
+    ".kt",
+}
+
+MAX_FILE_CHARS = 50000
+
+README_NAMES = {"readme.md", "readme.rst", "readme.txt", "readme"}
+LICENSE_NAMES = {"license", "license.md", "license.txt"}
+
+
+def is_snapshot_path(path: str) -> bool:
+    """Whether a repository path is worth extracting from a tarball snapshot"""
+    path_parts = path.split("/")
+    if any(ignored in path_parts for ignored in IGNORE_PATTERNS):
+        return False
+
+    filename = path_parts[-1]
+    file_ext = f".{filename.split('.')[-1]}" if "." in filename else ""
+    return (
+        filename in CONFIG_FILES
+        or file_ext in SOURCE_EXTENSIONS
+        or filename.lower() in README_NAMES
+        or filename.lower() in LICENSE_NAMES
+    )
 
 
 @tool
@@ -21,153 +114,229 @@ def explore_github_repo(owner: str, repo: str) -> str:
         github_token = os.getenv("GITHUB_TOKEN")
         gh_repo = GitHubRepo(owner, repo, github_token)
 
-        tree_data = gh_repo.get_tree(recursive=True)
-
-        if "error" in tree_data:
-            return json.dumps({"error": tree_data["error"]})
-
-        IGNORE_PATTERNS = {
-            "node_modules",
-            ".git",
-            "__pycache__",
-            "dist",
-            "build",
-            ".next",
-            ".cache",
-            "coverage",
-            "vendor",
-            "target",
-            "test",
-            "tests",
-            "__tests__",
-            ".github",
-            "docs",
-            "examples",
-        }
+        if snapshot_enabled():
+            tree_data = gh_repo.get_snapshot_tree(path_filter=is_snapshot_path)
+        else:
+            tree_data = gh_repo.get_tree(recursive=True)
+        return _summarize_tree(tree_data)
 
-        CONFIG_FILES = {
-            "package.json",
-            "requirements.txt",
-            "pyproject.toml",
-            "setup.py",
-            "Cargo.toml",
-            "go.mod",
-            "composer.json",
-            "build.gradle",
-            "pom.xml",
-            "Makefile",
-            "Dockerfile",
-            "docker-compose.yml",
-            "README.md",
-            "LICENSE",
-            ".env.example",
-            "tsconfig.json",
-            "setup.cfg",
-            "poetry.lock",
-            "yarn.lock",
-            "package-lock.json",
-        }
+    except Exception as e:
+        return json.dumps({"error": str(e)})
 
-        SOURCE_EXTENSIONS = {
-            ".py",
-            ".js",
-            ".jsx",
-            ".ts",
-            ".tsx",
-            ".go",
-            ".rs",
-            ".java",
-            ".cpp",
-            ".c",
-            ".h",
-            ".rb",
-            ".php",
-            ".swift",
-            ".kt",
-        }
 
-        summary = {
-            "total_files": 0,
-            "total_dirs": 0,
-            "config_files": [],
-            "source_files": [],
-            "main_directories": {},
-            "file_extensions": {},
-            "readme_path": None,
-            "license_path": None,
-        }
+async def _aexplore_github_repo(owner: str, repo: str) -> str:
+    try:
+        gh_repo = GitHubRepo(owner, repo, os.getenv("GITHUB_TOKEN"))
+
+        if snapshot_enabled():
+            tree_data = await asyncio.to_thread(
+                gh_repo.get_snapshot_tree, is_snapshot_path
+            )
+        else:
+            tree_data = await gh_repo.aget_tree(recursive=True)
+        return _summarize_tree(tree_data)
+
+    except Exception as e:
+        return json.dumps({"error": str(e)})
 
-        for item in tree_data.get("tree", []):
-            path = item["path"]
-            path_parts = path.split("/")
-
-            if any(ignored in path_parts for ignored in IGNORE_PATTERNS):
-                continue
-
-            if item["type"] == "blob":
-                summary["total_files"] += 1
-                filename = path_parts[-1]
-                file_ext = f".{filename.split('.')[-1]}" if "." in filename else ""
-
-                if filename.lower() in [
-                    "readme.md",
-                    "readme.rst",
-                    "readme.txt",
-                    "readme",
-                ]:
-                    summary["readme_path"] = path
-
-                if filename.lower() in ["license", "license.md", "license.txt"]:
-                    summary["license_path"] = path
-
-                if filename in CONFIG_FILES:
-                    summary["config_files"].append(path)
-
-                if file_ext in SOURCE_EXTENSIONS:
-                    depth = len(path_parts)
-                    if depth <= 4:
-                        summary["source_files"].append(
-                            {
-                                "path": path,
-                                "depth": depth,
-                                "size": item.get("size", 0),
-                                "filename": filename,
-                            }
-                        )
-
-                if "." in filename:
-                    ext = filename.split(".")[-1]
-                    summary["file_extensions"][ext] = (
-                        summary["file_extensions"].get(ext, 0) + 1
-                    )
 
-                if len(path_parts) > 1:
-                    top_dir = path_parts[0]
-                    summary["main_directories"][top_dir] = (
-                        summary["main_directories"].get(top_dir, 0) + 1
+def _summarize_tree(tree_data: dict) -> str:
+    """The explore_github_repo summary of a recursive tree payload"""
+    if "error" in tree_data:
+        return json.dumps({"error": tree_data["error"]})
+
+    summary = {
+        "total_files": 0,
+        "total_dirs": 0,
+        "config_files": [],
+        "source_files": [],
+        "main_directories": {},
+        "file_extensions": {},
+        "readme_path": None,
+        "license_path": None,
+    }
+
+    for item in tree_data.get("tree", []):
+        path = item["path"]
+        path_parts = path.split("/")
+
+        if any(ignored in path_parts for ignored in IGNORE_PATTERNS):
+            continue
+
+        if item["type"] == "blob":
+            summary["total_files"] += 1
+            filename = path_parts[-1]
+            file_ext = f".{filename.split('.')[-1]}" if "." in filename else ""
+
+            if filename.lower() in README_NAMES:
+                summary["readme_path"] = path
+
+            if filename.lower() in LICENSE_NAMES:
+                summary["license_path"] = path
+
+            if filename in CONFIG_FILES:
+                summary["config_files"].append(path)
+
+            if file_ext in SOURCE_EXTENSIONS:
+                depth = len(path_parts)
+                if depth <= 4:
+                    summary["source_files"].append(
+                        {
+                            "path": path,
+                            "depth": depth,
+                            "size": item.get("size", 0),
+                            "filename": filename,
+                        }
                     )
 
-            elif item["type"] == "tree":
-                summary["total_dirs"] += 1
+            if "." in filename:
+                ext = filename.split(".")[-1]
+                summary["file_extensions"][ext] = (
+                    summary["file_extensions"].get(ext, 0) + 1
+                )
 
-        summary["source_files"].sort(key=lambda x: (x["depth"], -x["size"]))
+            if len(path_parts) > 1:
+                top_dir = path_parts[0]
+                summary["main_directories"][top_dir] = (
+                    summary["main_directories"].get(top_dir, 0) + 1
+                )
 
-        summary["source_files"] = [f["path"] for f in summary["source_files"][:20]]
+        elif item["type"] == "tree":
+            summary["total_dirs"] += 1
 
-        top_extensions = sorted(
-            summary["file_extensions"].items(), key=lambda x: x[1], reverse=True
-        )[:15]
-        summary["file_extensions"] = dict(top_extensions)
+    summary["source_files"].sort(key=lambda x: (x["depth"], -x["size"]))
 
-        top_dirs = sorted(
-            summary["main_directories"].items(), key=lambda x: x[1], reverse=True
-        )[:10]
-        summary["main_directories"] = dict(top_dirs)
+    summary["source_files"] = [f["path"] for f in summary["source_files"][:20]]
 
-        return json.dumps(summary, indent=2)
+    top_extensions = sorted(
+        summary["file_extensions"].items(), key=lambda x: x[1], reverse=True
+    )[:15]
+    summary["file_extensions"] = dict(top_extensions)
+
+    top_dirs = sorted(
+        summary["main_directories"].items(), key=lambda x: x[1], reverse=True
+    )[:10]
+    summary["main_directories"] = dict(top_dirs)
+
+    return json.dumps(summary, indent=2)
+
+
+def _read_github_content(
+    gh_repo: GitHubRepo, filepath: str, max_chars: int = MAX_FILE_CHARS
+) -> dict:
+    """Read one file and return {"path", "content", "truncated"} or {"path", "error"}"""
+    try:
+        content = None
+        if snapshot_enabled():
+            content = _read_snapshot_file(gh_repo, filepath)
+        if content is None:
+            content = gh_repo.get_file_content(filepath)
+        return _content_result(filepath, content, max_chars)
 
     except Exception as e:
-        return json.dumps({"error": str(e)})
+        return {"path": filepath, "error": f"Error reading file: {str(e)}"}
+
+
+async def _aread_github_content(
+    gh_repo: GitHubRepo, filepath: str, max_chars: int = MAX_FILE_CHARS
+) -> dict:
+    """Async _read_github_content; snapshot reads run on a worker thread"""
+    try:
+        content = None
+        if snapshot_enabled():
+            content = await asyncio.to_thread(_read_snapshot_file, gh_repo, filepath)
+        if content is None:
+            content = await gh_repo.aget_file_content(filepath)
+        return _content_result(filepath, content, max_chars)
+
+    except Exception as e:
+        return {"path": filepath, "error": f"Error reading file: {str(e)}"}
+
+
+def _read_github_batch(
+    gh_repo: GitHubRepo,
+    filepaths: list,
+    limit: int = MAX_BATCH_FILES,
+    max_chars: int = MAX_FILE_CHARS,
+) -> dict:
+    """
+    read_in_parallel over _read_github_content, with the files fetched together
+    by GitHubRepo.get_files when GraphQL is available
+    """
+
+    def read_one(path: str) -> dict:
+        return _read_github_content(gh_repo, path, max_chars)
+
+    if snapshot_enabled() or not gh_repo.batch_enabled:
+        return read_in_parallel(read_one, filepaths, limit)
+
+    selected = list(dict.fromkeys(filepaths))
+    try:
+        contents = gh_repo.get_files(selected[:limit])
+    except Exception:
+        return read_in_parallel(read_one, filepaths, limit)
+    return _batch_result(selected, contents, limit, max_chars)
+
+
+async def _aread_github_batch(
+    gh_repo: GitHubRepo,
+    filepaths: list,
+    limit: int = MAX_BATCH_FILES,
+    max_chars: int = MAX_FILE_CHARS,
+) -> dict:
+    """Async _read_github_batch"""
+
+    async def read_one(path: str) -> dict:
+        return await _aread_github_content(gh_repo, path, max_chars)
+
+    if snapshot_enabled() or not gh_repo.batch_enabled:
+        return await aread_in_parallel(read_one, filepaths, limit)
+
+    selected = list(dict.fromkeys(filepaths))
+    try:
+        contents = await gh_repo.aget_files(selected[:limit])
+    except Exception:
+        return await aread_in_parallel(read_one, filepaths, limit)
+    return _batch_result(selected, contents, limit, max_chars)
+
+
+def _batch_result(selected: list, contents: dict, limit: int, max_chars: int) -> dict:
+    return {
+        "files": [
+            _content_result(path, contents[path], max_chars)
+            for path in selected[:limit]
+        ],
+        "skipped": selected[limit:],
+    }
+
+
+def _content_result(filepath: str, content, max_chars: int = MAX_FILE_CHARS) -> dict:
+    """{"path", "content", "truncated"} or {"path", "error"} for fetched content"""
+    if isinstance(content, list):
+        file_names = [item.get("name", "unknown") for item in content]
+        return {
+            "path": filepath,
+            "error": (
+                f"'{filepath}' is a directory. "
+                f"Contents: {', '.join(file_names)}. "
+                "Please read a specific file path instead."
+            ),
+        }
+
+    if not isinstance(content, (str, bytes)):
+        return {
+            "path": filepath,
+            "error": f"Unexpected data type received: {type(content).__name__}",
+        }
+
+    if isinstance(content, str) and content.startswith("Error reading file: "):
+        return {"path": filepath, "error": content[len("Error reading file: ") :]}
+
+    truncated = len(content) > max_chars
+    if truncated:
+        content = content[:max_chars]
+
+    return {"path": filepath, "content": content, "truncated": truncated}
 
 
 @tool
@@ -183,30 +352,131 @@ def read_github_file(owner: str, repo: str, filepath: str) -> str:
     Returns:
         File contents as string
     """
-    try:
-        github_token = os.getenv("GITHUB_TOKEN")
-        gh_repo = GitHubRepo(owner, repo, github_token)
-        content = gh_repo.get_file_content(filepath)
+    github_token = os.getenv("GITHUB_TOKEN")
+    gh_repo = GitHubRepo(owner, repo, github_token)
+    result = _read_github_content(gh_repo, filepath, _max_chars())
+    return _file_text(fit_reads([result])[0])
 
-        if isinstance(content, list):
-            file_names = [item.get("name", "unknown") for item in content]
-            return (
-                f"Error: '{filepath}' is a directory. "
-                f"Contents: {', '.join(file_names)}. "
-                "Please call read_github_file again with a specific file path."
-            )
 
-        if not isinstance(content, (str, bytes)):
-            return f"Error: Unexpected data type received: {type(content).__name__}"
+async def _aread_github_file(owner: str, repo: str, filepath: str) -> str:
+    gh_repo = GitHubRepo(owner, repo, os.getenv("GITHUB_TOKEN"))
+    result = await _aread_github_content(gh_repo, filepath, _max_chars())
+    return _file_text(fit_reads([result])[0])
 
-        max_chars = 50000
-        if len(content) > max_chars:
-            content = content[:max_chars] + "\n\n... (truncated)"
 
-        return content
+def _max_chars() -> int:
+    """Characters kept per file; under a read budget the budget excerpts instead"""
+    return MAX_SOURCE_BYTES if current_budget() else MAX_FILE_CHARS
 
-    except Exception as e:
-        return f"Error reading file: {str(e)}"
+
+def _file_text(result: dict) -> str:
+    if "error" in result:
+        return f"Error: {result['error']}"
+
+    content = result["content"]
+    if result["truncated"] and not result.get("excerpted"):
+        content += "\n\n... (truncated)"
+    return content
+
+
+@tool
+def read_github_files(owner: str, repo: str, filepaths: list[str]) -> str:
+    """
+    Read several files from a GitHub repository in one call.
+
+    Args:
+        owner: GitHub username or organization
+        repo: Repository name
+        filepaths: Paths to files in repository (up to 25)
+
+    Returns:
+        JSON string with one entry per file: content and truncated flag, or error.
+        Files too large for the run's read budget come back as head/tail excerpts.
+    """
+    github_token = os.getenv("GITHUB_TOKEN")
+    gh_repo = GitHubRepo(owner, repo, github_token)
+    batch = _read_github_batch(gh_repo, filepaths, max_chars=_max_chars())
+    batch["files"] = fit_reads(batch["files"])
+    return json.dumps(batch, indent=2)
+
+
+async def _aread_github_files(owner: str, repo: str, filepaths: list[str]) -> str:
+    gh_repo = GitHubRepo(owner, repo, os.getenv("GITHUB_TOKEN"))
+    batch = await _aread_github_batch(gh_repo, filepaths, max_chars=_max_chars())
+    batch["files"] = fit_reads(batch["files"])
+    return json.dumps(batch, indent=2)
+
+
+@tool
+def read_github_file_outline(owner: str, repo: str, filepaths: list[str]) -> str:
+    """
+    Outline several source files from a GitHub repository (up to 100) without
+    returning them whole: module docstring, imports, class and function
+    signatures with decorators and first docstring line, CLI arguments and the
+    __main__ block, each line prefixed with its line number.
+
+    Args:
+        owner: GitHub username or organization
+        repo: Repository name
+        filepaths: Paths to source files in repository (up to 100)
+
+    Returns:
+        JSON string with one entry per file: outline and line count, or error
+    """
+    gh_repo = GitHubRepo(owner, repo, os.getenv("GITHUB_TOKEN"))
+    batch = _read_github_batch(gh_repo, filepaths, MAX_OUTLINE_FILES, MAX_SOURCE_BYTES)
+    return json.dumps(_outline_batch(batch), indent=2)
+
+
+async def _aread_github_file_outline(
+    owner: str, repo: str, filepaths: list[str]
+) -> str:
+    gh_repo = GitHubRepo(owner, repo, os.getenv("GITHUB_TOKEN"))
+    batch = await _aread_github_batch(
+        gh_repo, filepaths, MAX_OUTLINE_FILES, MAX_SOURCE_BYTES
+    )
+    return json.dumps(_outline_batch(batch), indent=2)
+
+
+def _outline_batch(batch: dict) -> dict:
+    files = [_outline_result(result) for result in batch["files"]]
+    charge_outlines(files)
+    return {"files": files, "skipped": batch["skipped"]}
+
+
+def _outline_result(result: dict) -> dict:
+    """{"path", "outline", "lines"} for a read result, passing errors through"""
+    if "error" in result:
+        return result
+    content = result["content"]
+    if isinstance(content, bytes):
+        content = content.decode("utf-8", errors="ignore")
+    return {
+        "path": result["path"],
+        "outline": outline_source(result["path"], content),
+        "lines": content.count("\n") + 1,
+    }
+
+
+def _read_snapshot_file(gh_repo: GitHubRepo, filepath: str):
+    """Read a file from the local snapshot, or None if it can't be read from it"""
+    files_dir = gh_repo.get_snapshot(path_filter=is_snapshot_path)
+    path = (files_dir / filepath.lstrip("/")).resolve()
+
+    if files_dir.resolve() != path and files_dir.resolve() not in path.parents:
+        return None
+
+    if path.is_dir():
+        return [{"name": item.name} for item in sorted(path.iterdir())]
+
+    if not path.is_file():
+        return None
+
+    # Errors name the temporary path; let the API read the file instead
+    content = read_local_file(str(path), max_lines=10_000)
+    if content.startswith(READ_ERRORS):
+        return None
+    return content
 
 
 @tool
@@ -224,29 +494,50 @@ def get_github_repo_metadata(owner: str, repo: str) -> str:
     try:
         github_token = os.getenv("GITHUB_TOKEN")
         gh_repo = GitHubRepo(owner, repo, github_token)
-        info = gh_repo.get_repo_info()
-
-        if "error" in info:
-            return json.dumps({"error": info["error"]})
-
-        license_info = info.get("license")
-        license_name = license_info.get("name") if license_info else "No License"
-
-        # Extract useful metadata
-        metadata = {
-            "name": info.get("name"),
-            "description": info.get("description"),
-            "stars": info.get("stargazers_count"),
-            "forks": info.get("forks_count"),
-            "language": info.get("language"),
-            "topics": info.get("topics", []),
-            "license": license_name,
-            "homepage": info.get("homepage"),
-            "created_at": info.get("created_at"),
-            "updated_at": info.get("updated_at"),
-        }
+        return _repo_metadata(gh_repo.get_repo_info())
+
+    except Exception as e:
+        return json.dumps({"error": str(e)})
+
 
-        return json.dumps(metadata, indent=2)
+async def _aget_github_repo_metadata(owner: str, repo: str) -> str:
+    try:
+        gh_repo = GitHubRepo(owner, repo, os.getenv("GITHUB_TOKEN"))
+        return _repo_metadata(await gh_repo.aget_repo_info())
 
     except Exception as e:
         return json.dumps({"error": str(e)})
+
+
+def _repo_metadata(info: dict) -> str:
+    """The get_github_repo_metadata summary of a repo info payload"""
+    if "error" in info:
+        return json.dumps({"error": info["error"]})
+
+    license_info = info.get("license")
+    license_name = license_info.get("name") if license_info else "No License"
+
+    # Extract useful metadata
+    metadata = {
+        "name": info.get("name"),
+        "description": info.get("description"),
+        "stars": info.get("stargazers_count"),
+        "forks": info.get("forks_count"),
+        "language": info.get("language"),
+        "topics": info.get("topics", []),
+        "license": license_name,
+        "homepage": info.get("homepage"),
+        "created_at": info.get("created_at"),
+        "updated_at": info.get("updated_at"),
+    }
+
+    return json.dumps(metadata, indent=2)
+
+
+# Native coroutines, used when the graph runs with ainvoke/astream; without them
+# ToolNode would run the sync functions on a thread pool.
+explore_github_repo.coroutine = _aexplore_github_repo
+read_github_file.coroutine = _aread_github_file
+read_github_files.coroutine = _aread_github_files
+read_github_file_outline.coroutine = _aread_github_file_outline
+get_github_repo_metadata.coroutine = _aget_github_repo_metadata
@@ -1,66 +1,87 @@
+import os
 import json
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Awaitable, Callable, Optional
 from langchain_core.tools import tool
+from utils.code_outline import MAX_SOURCE_BYTES, outline_files
+from utils.fs_walker import DirectoryWalker
+from utils.read_budget import charge_outlines, current_budget, fit_reads
+
+# Upper bound on files per batch read and on concurrent reads per batch
+MAX_BATCH_FILES = 25
+READ_WORKERS = int(os.getenv("READ_FILES_WORKERS", "8"))
+
+# Line and size caps of local reads; with a read budget, larger files are read
+# whole and the budget excerpts them instead
+MAX_LINES = 500
+MAX_FILE_BYTES = 1_000_000
+BUDGETED_MAX_LINES = 50_000
+
+# Outlines are a fraction of a file's size, so a batch can cover more files
+MAX_OUTLINE_FILES = int(os.getenv("OUTLINE_MAX_FILES", "100"))
+
+# Budgets for explore_directory; truncated walks say so in their output
+EXPLORE_MAX_ENTRIES = int(os.getenv("EXPLORE_MAX_ENTRIES", "2000"))
+EXPLORE_TIME_BUDGET = float(os.getenv("EXPLORE_TIME_BUDGET", "10"))
+EXPLORE_WORKERS = int(os.getenv("EXPLORE_WORKERS", "8"))
+
+IGNORE_DIRS = {
+    "node_modules",
+    ".git",
+    "__pycache__",
+    ".venv",
+    "venv",
+    "dist",
+    "build",
+    ".next",
+    ".cache",
+    "coverage",
+    ".pytest_cache",
+}
+
+READ_ERRORS = ("Error: File not found", "Error: File too large", "Error reading file")
 
 
 @tool
 def explore_directory(path: str, max_depth: int = 3) -> str:
-    """Explore local directory structure (original tool)"""
-    IGNORE_DIRS = {
-        "node_modules",
-        ".git",
-        "__pycache__",
-        ".venv",
-        "venv",
-        "dist",
-        "build",
-        ".next",
-        ".cache",
-        "coverage",
-        ".pytest_cache",
-    }
-
-    def _explore(current_path: Path, current_depth: int = 0) -> dict:
-        if current_depth > max_depth:
-            return {}
-
-        result = {"type": "directory", "children": {}}
-
-        try:
-            for item in sorted(current_path.iterdir()):
-                if item.name.startswith(".") or item.name in IGNORE_DIRS:
-                    continue
-
-                if item.is_dir():
-                    result["children"][item.name] = _explore(item, current_depth + 1)
-                else:
-                    result["children"][item.name] = {
-                        "type": "file",
-                        "size": item.stat().st_size,
-                    }
-        except PermissionError:
-            result["error"] = "Permission denied"
-
-        return result
-
+    """Explore local directory structure, skipping gitignored paths.
+    Very large trees are cut off early and marked with a "truncated" field."""
     path_obj = Path(path).resolve()
     if not path_obj.exists():
         return json.dumps({"error": f"Path does not exist: {path}"})
 
-    structure = _explore(path_obj)
+    walker = DirectoryWalker(
+        IGNORE_DIRS,
+        max_depth=max_depth,
+        max_entries=EXPLORE_MAX_ENTRIES,
+        time_budget=EXPLORE_TIME_BUDGET,
+        workers=EXPLORE_WORKERS,
+    )
+    structure = walker.walk(str(path_obj))
     return json.dumps(structure, indent=2)
 
 
-@tool
-def read_file(filepath: str, max_lines: int = 500) -> str:
-    """Read local file (original tool)"""
+def read_limits(max_lines: Optional[int] = None) -> tuple:
+    """(max_lines, max_bytes) of a read: fixed caps, or looser ones under a budget"""
+    if current_budget() is None:
+        return max_lines or MAX_LINES, MAX_FILE_BYTES
+    return max_lines or BUDGETED_MAX_LINES, MAX_SOURCE_BYTES
+
+
+def read_local_file(
+    filepath: str, max_lines: int = MAX_LINES, max_bytes: int = MAX_FILE_BYTES
+) -> str:
+    """Read a text file from disk with the same limits as the read_file tool"""
     try:
         path = Path(filepath).resolve()
         if not path.exists():
             return f"Error: File not found: {filepath}"
 
-        if path.stat().st_size > 1_000_000:
-            return f"Error: File too large (>1MB): {filepath}"
+        if path.stat().st_size > max_bytes:
+            return f"Error: File too large (>{max_bytes / 1_000_000:g}MB): {filepath}"
 
         with open(path, "r", encoding="utf-8", errors="ignore") as f:
             lines = []
@@ -76,16 +97,99 @@ def read_file(filepath: str, max_lines: int = 500) -> str:
 
 
 @tool
-def write_readme(content: str, output_path: str) -> str:
-    """Write README to file"""
-    try:
-        dir_path = Path(output_path)
-        if dir_path.is_file():
-            dir_path = dir_path.parent
-
-        readme_path = dir_path / "README.md"
-        with open(readme_path, "w", encoding="utf-8") as f:
-            f.write(content)
-        return f"Successfully wrote README to {readme_path}"
-    except Exception as e:
-        return f"Error writing README: {str(e)}"
+def read_file(filepath: str, max_lines: Optional[int] = None) -> str:
+    """Read local file (original tool)"""
+    max_lines, max_bytes = read_limits(max_lines)
+    if current_budget() is None:
+        return read_local_file(filepath, max_lines, max_bytes)
+
+    result = fit_reads([_read_local_content(filepath, max_lines, max_bytes)])[0]
+    if "error" in result:
+        return result["error"]
+    if result["truncated"] and not result.get("excerpted"):
+        return result["content"] + f"\n... (truncated after {max_lines} lines)"
+    return result["content"]
+
+
+def read_in_parallel(
+    read_one: Callable[[str], dict], filepaths: list, limit: int = MAX_BATCH_FILES
+) -> dict:
+    """Run `read_one` over the paths on a bounded thread pool, keeping their order"""
+    selected = list(dict.fromkeys(filepaths))[:limit]
+    skipped = list(dict.fromkeys(filepaths))[limit:]
+
+    if not selected:
+        return {"files": [], "skipped": skipped}
+
+    workers = max(1, min(READ_WORKERS, len(selected)))
+    # Each read runs in a copy of this context, so the telemetry scope and
+    # read budget of the calling node apply inside the pool too
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, read_one, path)
+            for path in selected
+        ]
+        files = [future.result() for future in futures]
+
+    return {"files": files, "skipped": skipped}
+
+
+async def aread_in_parallel(
+    read_one: Callable[[str], Awaitable[dict]],
+    filepaths: list,
+    limit: int = MAX_BATCH_FILES,
+) -> dict:
+    """read_in_parallel for coroutines, with at most READ_WORKERS in flight"""
+    selected = list(dict.fromkeys(filepaths))[:limit]
+    skipped = list(dict.fromkeys(filepaths))[limit:]
+    in_flight = asyncio.Semaphore(max(1, READ_WORKERS))
+
+    async def _read(path: str) -> dict:
+        async with in_flight:
+            return await read_one(path)
+
+    files = await asyncio.gather(*(_read(path) for path in selected))
+    return {"files": list(files), "skipped": skipped}
+
+
+def _read_local_content(
+    filepath: str, max_lines: int, max_bytes: int = MAX_FILE_BYTES
+) -> dict:
+    """Read one file and return {"path", "content", "truncated"} or {"path", "error"}"""
+    content = read_local_file(filepath, max_lines, max_bytes)
+    if content.startswith(READ_ERRORS):
+        return {"path": filepath, "error": content}
+
+    marker = f"\n... (truncated after {max_lines} lines)"
+    truncated = content.endswith(marker)
+    if truncated:
+        content = content[: -len(marker)]
+    return {"path": filepath, "content": content, "truncated": truncated}
+
+
+@tool
+def read_files(filepaths: list[str], max_lines: Optional[int] = None) -> str:
+    """Read several local files at once (up to 25), each limited to max_lines.
+    Returns JSON with one entry per file: content and truncated flag, or error.
+    Files too large for the run's read budget come back as head/tail excerpts."""
+    max_lines, max_bytes = read_limits(max_lines)
+    result = read_in_parallel(
+        lambda path: _read_local_content(path, max_lines, max_bytes), filepaths
+    )
+    result["files"] = fit_reads(result["files"])
+    return json.dumps(result, indent=2)
+
+
+@tool
+def read_file_outline(filepaths: list[str]) -> str:
+    """Outline several local source files at once (up to 100) without reading them
+    whole: module docstring, imports, class and function signatures with their
+    decorators and first docstring line, CLI arguments and the __main__ block.
+    Each line starts with its line number. Use read_files for the full source."""
+    selected = list(dict.fromkeys(filepaths))
+    files = outline_files(selected[:MAX_OUTLINE_FILES])
+    charge_outlines(files)
+    return json.dumps(
+        {"files": files, "skipped": selected[MAX_OUTLINE_FILES:]}, indent=2
+    )
+
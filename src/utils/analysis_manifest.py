@@ -0,0 +1,155 @@
+import os
+import json
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import Optional
+from utils.fs_walker import DirectoryWalker
+from utils.readme_stream import file_mode
+
+MANIFEST_NAME = ".autoreadme.json"
+MANIFEST_VERSION = 1
+
+# Fingerprinting is a walk of the whole tree, so it gets a much larger budget
+# than explore_directory.
+FINGERPRINT_MAX_ENTRIES = 200_000
+FINGERPRINT_TIME_BUDGET = 60.0
+
+# Structured analysis fields carried from one run to the next
+ANALYSIS_FIELDS = (
+    "directory_structure",
+    "key_files",
+    "tech_stack",
+    "dependencies",
+    "project_purpose",
+    "entry_points",
+    "repo_metadata",
+)
+
+
+def output_dir(output_path: str) -> Path:
+    """Directory that receives README.md: `output_path`, or its parent for a file"""
+    path = Path(output_path)
+    return path.parent if path.is_file() else path
+
+
+def load_manifest(output_path: str) -> Optional[dict]:
+    path = output_dir(output_path) / MANIFEST_NAME
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def remove_manifest(output_path: str) -> None:
+    try:
+        (output_dir(output_path) / MANIFEST_NAME).unlink()
+    except OSError:
+        pass
+
+
+def save_manifest(output_path: str, manifest: dict) -> Path:
+    """Write the manifest atomically next to the README"""
+    directory = output_dir(output_path)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / MANIFEST_NAME
+
+    fd, tmp_path = tempfile.mkstemp(prefix=".autoreadme-", dir=directory)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        os.fchmod(f.fileno(), file_mode(path))
+        json.dump({"version": MANIFEST_VERSION, **manifest}, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _flatten(node: dict, prefix: str = "") -> list:
+    files = []
+    for name, child in node.get("children", {}).items():
+        path = f"{prefix}{name}"
+        if child.get("type") == "directory":
+            files.extend(_flatten(child, f"{path}/"))
+        else:
+            files.append(path)
+    return files
+
+
+def _sha1(path: Path) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def list_local(project_path: str, ignore_dirs: set) -> tuple:
+    """
+    Relative paths of every file in a local project, and why the walk stopped
+    early ("max_entries", "time_budget") or None when it saw the whole tree
+    """
+    walker = DirectoryWalker(
+        ignore_dirs,
+        max_depth=64,
+        max_entries=FINGERPRINT_MAX_ENTRIES,
+        time_budget=FINGERPRINT_TIME_BUDGET,
+    )
+    paths = _flatten(walker.walk(str(Path(project_path).resolve())))
+    return paths, walker.truncated_reason
+
+
+def fingerprint_local(
+    project_path: str, paths: list, previous: Optional[dict] = None
+) -> dict:
+    """
+    Per-file fingerprints (mtime, size, sha1) of the listed files of a project.
+
+    Content hashes are only recomputed when mtime or size differ from
+    `previous`, so touching a file without changing it is not a change.
+    """
+    root = Path(project_path).resolve()
+    previous = previous or {}
+
+    files = {}
+    for rel in paths:
+        path = root / rel
+        try:
+            st = path.stat()
+        except OSError:
+            continue
+
+        old = previous.get(rel)
+        if old and old["mtime"] == st.st_mtime_ns and old["size"] == st.st_size:
+            files[rel] = old
+            continue
+        try:
+            digest = _sha1(path)
+            files[rel] = {"mtime": st.st_mtime_ns, "size": st.st_size, "sha1": digest}
+        except OSError:
+            continue
+    return files
+
+
+def fingerprint_github(tree_data: dict) -> dict:
+    """Per-file blob SHAs from a recursive tree API response"""
+    return {
+        item["path"]: {"sha": item["sha"]}
+        for item in tree_data.get("tree", [])
+        if item.get("type") == "blob" and item.get("sha")
+    }
+
+
+def _content_key(entry: dict) -> Optional[str]:
+    return entry.get("sha") or entry.get("sha1")
+
+
+def diff_fingerprints(old: dict, new: dict) -> dict:
+    """Added, modified and removed paths between two fingerprints"""
+    added = sorted(p for p in new if p not in old)
+    removed = sorted(p for p in old if p not in new)
+    modified = sorted(
+        p for p in new if p in old and _content_key(new[p]) != _content_key(old[p])
+    )
+    return {"added": added, "modified": modified, "removed": removed}
@@ -0,0 +1,152 @@
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional
+
+DEFAULT_CACHE_DIR = Path("~/.cache/autoreadme/blobs").expanduser()
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+class BlobCache:
+    """
+    Content-addressed on-disk cache of git blobs keyed by their SHA.
+
+    Blobs are immutable, so entries never need invalidation: a file that did not
+    change has the same SHA on every branch, fork and run. Writes go through a
+    temporary file and an atomic rename, so any number of processes can read
+    while another one writes. Each hit refreshes the entry's mtime and the
+    least recently used entries are evicted once the cache exceeds `max_bytes`.
+    """
+
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._size = None
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "bytes_read": 0,
+            "bytes_written": 0,
+            "evictions": 0,
+        }
+
+    def _path(self, sha: str) -> Path:
+        return self.root / sha[:2] / sha[2:]
+
+    def get(self, sha: str) -> Optional[bytes]:
+        """Return the cached blob or None"""
+        path = self._path(sha)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+
+        with self._lock:
+            self._stats["hits"] += 1
+            self._stats["bytes_read"] += len(data)
+        return data
+
+    def put(self, sha: str, data: bytes) -> None:
+        """Store a blob, evicting old entries if the byte cap is exceeded"""
+        path = self._path(sha)
+        if path.exists():
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            return
+
+        with self._lock:
+            self._stats["bytes_written"] += len(data)
+            if self._size is not None:
+                self._size += len(data)
+            over_cap = self._current_size() > self.max_bytes
+
+        if over_cap:
+            self._evict()
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process"""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+    def _entries(self) -> list:
+        entries = []
+        for shard in self.root.iterdir():
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard):
+                if entry.name.startswith(".tmp-"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        return entries
+
+    def _current_size(self) -> int:
+        # Called with self._lock held
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        return self._size
+
+    def _evict(self) -> None:
+        """Drop least recently used blobs until the cache is 90% of its cap"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self._size = total
+            self._stats["evictions"] += evicted
+
+
+def get_blob_cache() -> Optional[BlobCache]:
+    """Process-wide blob cache, or None when disabled with GITHUB_BLOB_CACHE=0"""
+    global _cache
+    if os.getenv("GITHUB_BLOB_CACHE", "1").lower() in ("0", "false", "no"):
+        return None
+
+    with _cache_lock:
+        if _cache is None:
+            root = os.getenv("GITHUB_BLOB_CACHE_DIR")
+            max_bytes = int(os.getenv("GITHUB_BLOB_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+            try:
+                _cache = BlobCache(
+                    Path(root).expanduser() if root else DEFAULT_CACHE_DIR, max_bytes
+                )
+            except OSError:
+                return None
+        return _cache
@@ -0,0 +1,300 @@
+import os
+import re
+import ast
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Optional
+
+# Upper bounds for one file's outline and for the source it is built from
+MAX_OUTLINE_CHARS = int(os.getenv("OUTLINE_MAX_CHARS", "8000"))
+MAX_SOURCE_BYTES = 2_000_000
+
+# Batches of at least this many local files are parsed on a process pool
+OUTLINE_PROCESS_THRESHOLD = int(os.getenv("OUTLINE_PROCESS_THRESHOLD", "16"))
+OUTLINE_WORKERS = int(os.getenv("OUTLINE_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+DOC_LINES = 6
+MAIN_BLOCK_LINES = 20
+MAX_LINE_CHARS = 160
+CLI_CALLS = {
+    "ArgumentParser",
+    "add_argument",
+    "add_argument_group",
+    "add_mutually_exclusive_group",
+    "add_parser",
+    "add_subparsers",
+}
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _clip(text: str, limit: int = MAX_LINE_CHARS) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def _doc(text: str, indent: str, lines: int = 1) -> list:
+    kept = [line.strip() for line in text.strip().splitlines()][:lines]
+    return [f'{indent}"""{_clip(" ".join(kept))}"""'] if kept else []
+
+
+# Python
+
+
+def _signature(node) -> str:
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    signature = f"{prefix} {node.name}({ast.unparse(node.args)})"
+    if node.returns is not None:
+        signature += f" -> {ast.unparse(node.returns)}"
+    return signature
+
+
+def _python_body(nodes: list, depth: int, out: list) -> None:
+    indent = "  " * depth
+    for node in nodes:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            for decorator in node.decorator_list:
+                decorator_text = _clip(ast.unparse(decorator))
+                out.append(f"L{decorator.lineno} {indent}@{decorator_text}")
+
+            if isinstance(node, ast.ClassDef):
+                bases = [ast.unparse(b) for b in node.bases]
+                bases += [ast.unparse(k) for k in node.keywords]
+                header = f"class {node.name}"
+                if bases:
+                    header += f"({', '.join(bases)})"
+            else:
+                header = _signature(node)
+            out.append(f"L{node.lineno} {indent}{_clip(header)}")
+
+            doc = ast.get_docstring(node)
+            if doc:
+                out.extend(_doc(doc, f"     {indent}  "))
+            if isinstance(node, ast.ClassDef):
+                _python_body(node.body, depth + 1, out)
+
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            # Dataclass, TypedDict and model fields, plus annotated constants
+            if depth or node.target.id.isupper():
+                field = f"{node.target.id}: {ast.unparse(node.annotation)}"
+                if node.value is not None:
+                    field += f" = {ast.unparse(node.value)}"
+                out.append(f"L{node.lineno} {indent}{_clip(field, 100)}")
+
+        elif isinstance(node, ast.Assign) and len(node.targets) == 1:
+            target = node.targets[0]
+            if isinstance(target, ast.Name) and (target.id.isupper() or depth):
+                value = _clip(ast.unparse(node.value), 80)
+                out.append(f"L{node.lineno} {indent}{target.id} = {value}")
+
+
+def _is_main_guard(node) -> bool:
+    return (
+        isinstance(node, ast.If)
+        and isinstance(node.test, ast.Compare)
+        and isinstance(node.test.left, ast.Name)
+        and node.test.left.id == "__name__"
+        and any(
+            isinstance(c, ast.Constant) and c.value == "__main__"
+            for c in node.test.comparators
+        )
+    )
+
+
+def outline_python(source: str) -> str:
+    """Docstrings, imports, signatures, CLI definitions and the __main__ block"""
+    tree = ast.parse(source)
+    out = []
+
+    doc = ast.get_docstring(tree)
+    if doc:
+        out.extend(_doc(doc, "", DOC_LINES))
+
+    imports = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            imports.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.append("." * node.level + (node.module or ""))
+    if imports:
+        out.append(_clip("imports: " + ", ".join(dict.fromkeys(imports)), 400))
+
+    _python_body(tree.body, 0, out)
+
+    cli = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        func = node.func
+        name = func.attr if isinstance(func, ast.Attribute) else getattr(func, "id", "")
+        if name in CLI_CALLS:
+            cli.append((node.lineno, _clip(ast.unparse(node))))
+    if cli:
+        out.append("CLI:")
+        out.extend(f"L{line} {call}" for line, call in sorted(cli))
+
+    lines = source.splitlines()
+    for node in tree.body:
+        if _is_main_guard(node):
+            block = lines[node.lineno - 1 : node.end_lineno][:MAIN_BLOCK_LINES]
+            out.append(f"L{node.lineno} __main__:")
+            out.extend(f"  {line.rstrip()}" for line in block)
+    return "\n".join(out)
+
+
+# Other languages: declaration lines matched per language family
+
+_JS = [
+    r"^\s*export\s",
+    r"^\s*(async\s+)?function\b",
+    r"^\s*(abstract\s+)?class\s+\w",
+    r"^\s*(interface|type|enum)\s+\w",
+    r"^\s*(const|let|var)\s+\w+\s*=\s*(async\s+)?(\([^)]*\)|\w+)\s*=>",
+    r"^\s+(static\s+|async\s+|get\s+|set\s+|public\s+|private\s+|protected\s+)*"
+    r"(?!(if|for|while|switch|catch|return|function)\b)[A-Za-z_$][\w$]*\s*"
+    r"\([^)]*\)\s*(:\s*[^={]+)?\{\s*$",
+    r"\.(command|option|argument)\(",
+]
+_C_FAMILY = [
+    r"^\s*(class|struct|enum|union|namespace|typedef|template)\b",
+    r"^#\s*define\s+\w+",
+    r"^(?!\s)(?!(if|for|while|switch|return|else)\b)[A-Za-z_][\w\s\*&:<>,~]*"
+    r"\b[\w:~]+\s*\([^;]*\)\s*(const\s*)?(\{|;)?\s*$",
+]
+_LANGUAGES = {
+    (".js", ".jsx", ".ts", ".tsx"): _JS,
+    (".go",): [
+        r"^package\s",
+        r"^func\s",
+        r"^type\s+\w+",
+        r"^\s*(flag|pflag)\.\w+\(",
+        r"cobra\.Command\{",
+    ],
+    (".rs",): [
+        r"^\s*(pub(\([^)]*\))?\s+)?(async\s+)?(unsafe\s+)?"
+        r"(fn|struct|enum|trait|impl|mod|type|const|static|macro_rules!)\b",
+        r"^\s*#\[(?!cfg\(test\))",
+        r"^\s*//!",
+    ],
+    (".java", ".kt"): [
+        r"^\s*package\s",
+        r"^\s*@\w+",
+        r"^\s*((public|protected|private|internal|abstract|final|static|open|data|"
+        r"sealed|override|suspend|inline|enum|annotation)\s+)*"
+        r"(class|interface|enum|record|object|fun)\s",
+        r"^\s*(public|protected|private)\s[^=;]*\([^;]*\)\s*(throws\s[\w., ]+)?"
+        r"\s*\{?\s*$",
+    ],
+    (".c", ".h", ".cpp"): _C_FAMILY,
+    (".rb",): [
+        r"^\s*(class|module|def)\s",
+        r"^\s*(attr_\w+|include|extend|require)\b",
+    ],
+    (".php",): [
+        r"^\s*namespace\s",
+        r"^\s*(abstract\s+|final\s+)?(class|interface|trait|enum)\s",
+        r"^\s*((public|protected|private|static|abstract|final)\s+)*function\s",
+    ],
+    (".swift",): [
+        r"^\s*(@\w+\s+)*((public|private|internal|open|fileprivate|static|final|"
+        r"override|mutating)\s+)*(func|class|struct|enum|protocol|extension|actor)\s",
+    ],
+}
+_PATTERNS = {
+    ext: re.compile("|".join(f"(?:{p})" for p in patterns))
+    for exts, patterns in _LANGUAGES.items()
+    for ext in exts
+}
+_LEADING_COMMENT = re.compile(r"^\s*(/\*\*?|//[/!]?|#(?!!|\[|include|define))\s?")
+
+
+def outline_text(source: str, extension: str) -> str:
+    """Header comment and declaration lines of a non-Python source file"""
+    pattern = _PATTERNS.get(extension)
+    lines = source.splitlines()
+    out = []
+
+    header = []
+    for line in lines[:40]:
+        if not line.strip():
+            if header:
+                break
+            continue
+        if not _LEADING_COMMENT.match(line) and not line.strip().startswith("*"):
+            break
+        text = _LEADING_COMMENT.sub("", line).strip(" */")
+        if text:
+            header.append(text)
+    if header:
+        out.append(f"/* {_clip(' '.join(header[:DOC_LINES]), 400)} */")
+
+    if pattern is None:
+        return "\n".join(out)
+    for number, line in enumerate(lines, 1):
+        if pattern.search(line):
+            declaration = line.rstrip().rstrip("{").rstrip()
+            out.append(f"L{number} {_clip(declaration)}")
+    return "\n".join(out)
+
+
+def outline_source(path: str, source: str) -> str:
+    """Outline of one file, capped at MAX_OUTLINE_CHARS"""
+    extension = Path(path).suffix.lower()
+    outline = None
+    if extension == ".py":
+        try:
+            outline = outline_python(source)
+        except (SyntaxError, ValueError, RecursionError):
+            outline = None
+    if outline is None:
+        outline = outline_text(source, extension)
+    if len(outline) > MAX_OUTLINE_CHARS:
+        cut = outline.rfind("\n", 0, MAX_OUTLINE_CHARS)
+        outline = outline[: cut if cut > 0 else MAX_OUTLINE_CHARS]
+        outline += "\n... (outline truncated)"
+    return outline
+
+
+def outline_file(path: str) -> dict:
+    """{"path", "outline", "lines"} for a file on disk, or {"path", "error"}"""
+    try:
+        file_path = Path(path)
+        if file_path.stat().st_size > MAX_SOURCE_BYTES:
+            return {"path": path, "error": "File too large (>2MB)"}
+        source = file_path.read_text(encoding="utf-8", errors="ignore")
+    except OSError as e:
+        return {"path": path, "error": f"Error reading file: {e}"}
+    return {
+        "path": path,
+        "outline": outline_source(path, source),
+        "lines": source.count("\n") + 1,
+    }
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that runs threads (batch, service) can deadlock
+            _pool = ProcessPoolExecutor(
+                max_workers=max(1, OUTLINE_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def outline_files(paths: list) -> list:
+    """outline_file for every path; large batches are parsed on a process pool"""
+    global _pool
+    if len(paths) < OUTLINE_PROCESS_THRESHOLD or OUTLINE_WORKERS <= 1:
+        return [outline_file(path) for path in paths]
+    try:
+        return list(_get_pool().map(outline_file, paths, chunksize=4))
+    except (BrokenProcessPool, OSError):
+        with _pool_lock:
+            _pool = None
+        return [outline_file(path) for path in paths]
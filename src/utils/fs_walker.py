@@ -0,0 +1,239 @@
+import os
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+
+def _translate(pattern: str) -> str:
+    """Regex body for a gitignore glob (`*`, `?`, `[...]` and `**`)"""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern[i : i + 3] == "**/":
+                out.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern[i : i + 2] == "**":
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class IgnoreRules:
+    """Ordered gitignore rules; the last matching rule decides, as in git"""
+
+    def __init__(self, rules: Optional[list] = None):
+        self.rules = rules or []
+
+    def extended(self, lines: list, base: str) -> "IgnoreRules":
+        """New rule set with the patterns of a .gitignore located at `base`"""
+        rules = list(self.rules)
+        for line in lines:
+            line = line.rstrip("\n")
+            if not line.strip() or line.startswith("#"):
+                continue
+            line = line.rstrip()
+
+            negate = line.startswith("!")
+            if negate:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+
+            anchored = "/" in line
+            line = line.lstrip("/")
+            regex = re.compile(f"^{_translate(line)}$")
+            rules.append((regex, negate, dir_only, anchored, base))
+        return IgnoreRules(rules)
+
+    def ignored(self, rel_path: str, is_dir: bool) -> bool:
+        result = False
+        name = rel_path.rsplit("/", 1)[-1]
+        for regex, negate, dir_only, anchored, base in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if base:
+                if not rel_path.startswith(base + "/"):
+                    continue
+                target = rel_path[len(base) + 1 :]
+            else:
+                target = rel_path
+            if regex.match(target if anchored else name):
+                result = not negate
+        return result
+
+
+def _read_lines(path: Path) -> list:
+    try:
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return f.readlines()
+    except OSError:
+        return []
+
+
+class DirectoryWalker:
+    """
+    Budgeted directory walker built on os.scandir.
+
+    Honors the repository's .gitignore files and .git/info/exclude on top of a
+    fixed set of ignored directory names, stops after `max_entries` entries or
+    `time_budget` seconds, and walks the top-level subdirectories on a thread
+    pool. The result has the same shape as explore_directory's original output,
+    with a `truncated` marker wherever the budget or depth limit cut the walk.
+    """
+
+    def __init__(
+        self,
+        ignore_dirs: set,
+        max_depth: int = 3,
+        max_entries: int = 2000,
+        time_budget: float = 10.0,
+        workers: int = 8,
+    ):
+        self.ignore_dirs = ignore_dirs
+        self.max_depth = max_depth
+        self.max_entries = max_entries
+        self.time_budget = time_budget
+        self.workers = workers
+
+        self._lock = threading.Lock()
+        self._entries = 0
+        self._deadline = 0.0
+        self.truncated_reason = None
+
+    def _take_entry(self) -> bool:
+        """Reserve one entry from the budget; False once the budget is spent"""
+        with self._lock:
+            if self.truncated_reason:
+                return False
+            if self._entries >= self.max_entries:
+                self.truncated_reason = "max_entries"
+                return False
+            if time.monotonic() > self._deadline:
+                self.truncated_reason = "time_budget"
+                return False
+            self._entries += 1
+            return True
+
+    def _scan(self, path: str, rel: str, rules: IgnoreRules) -> tuple:
+        """Sorted files and dirs of a directory, plus rules with its .gitignore"""
+        try:
+            with os.scandir(path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except PermissionError:
+            return None, None, rules
+
+        if any(e.name == ".gitignore" for e in entries):
+            rules = rules.extended(_read_lines(Path(path) / ".gitignore"), rel)
+
+        files, dirs = [], []
+        for entry in entries:
+            if entry.name.startswith(".") or entry.name in self.ignore_dirs:
+                continue
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            child_rel = f"{rel}/{entry.name}" if rel else entry.name
+            if rules.ignored(child_rel, is_dir):
+                continue
+            (dirs if is_dir else files).append((entry, child_rel))
+        return files, dirs, rules
+
+    def _walk(self, path: str, rel: str, depth: int, rules: IgnoreRules) -> dict:
+        result = {"type": "directory", "children": {}}
+        if depth > self.max_depth:
+            result["truncated"] = "max_depth"
+            return result
+
+        files, dirs, rules = self._scan(path, rel, rules)
+        if files is None:
+            result["error"] = "Permission denied"
+            return result
+
+        # Files first: shallow files (manifests, entry points) matter most when
+        # the budget runs out.
+        if not self._add_files(result, files):
+            return result
+
+        for entry, child_rel in dirs:
+            if not self._take_entry():
+                result["truncated"] = self.truncated_reason
+                return result
+            result["children"][entry.name] = self._walk(
+                entry.path, child_rel, depth + 1, rules
+            )
+
+        return result
+
+    def _add_files(self, result: dict, files: list) -> bool:
+        for entry, _ in files:
+            if not self._take_entry():
+                result["truncated"] = self.truncated_reason
+                return False
+            try:
+                size = entry.stat(follow_symlinks=False).st_size
+            except OSError:
+                size = 0
+            result["children"][entry.name] = {"type": "file", "size": size}
+        return True
+
+    def walk(self, root: str) -> dict:
+        self._entries = 0
+        self.truncated_reason = None
+        self._deadline = time.monotonic() + self.time_budget
+
+        root_path = Path(root)
+        rules = IgnoreRules().extended(
+            _read_lines(root_path / ".git" / "info" / "exclude"), ""
+        )
+
+        result = {"type": "directory", "children": {}}
+        files, dirs, rules = self._scan(str(root_path), "", rules)
+        if files is None:
+            result["error"] = "Permission denied"
+            return result
+
+        self._add_files(result, files)
+
+        # Top-level directories are independent subtrees: walk them in parallel
+        # and reassemble in sorted order.
+        subdirs = [d for d in dirs if self._take_entry()]
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            subtrees = pool.map(
+                lambda d: self._walk(d[0].path, d[1], 1, rules), subdirs
+            )
+            for (entry, _), subtree in zip(subdirs, subtrees):
+                result["children"][entry.name] = subtree
+
+        result["entries"] = self._entries
+        if self.truncated_reason:
+            result["truncated"] = self.truncated_reason
+        return result
@@ -1,6 +1,229 @@
+import os
+import json
+import atexit
+import httpx
+import shutil
+import asyncio
+import tarfile
+import tempfile
+import weakref
+import threading
 import requests
 import base64
-from typing import Optional
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Optional
+from requests.adapters import HTTPAdapter
+from utils.blob_cache import get_blob_cache
+from utils.github_url import parse_github_url  # noqa: F401 (re-exported)
+from utils.rate_limit import github_limiter
+from utils.telemetry import record
+
+# Connection pool size of the shared session (per host)
+POOL_SIZE = int(os.getenv("GITHUB_POOL_SIZE", "20"))
+
+# Times a rate-limited request is queued and retried before it fails
+GITHUB_RATE_LIMIT_RETRIES = int(os.getenv("GITHUB_RATE_LIMIT_RETRIES", "3"))
+
+# Timeout in seconds for requests made by the async client
+GITHUB_TIMEOUT = float(os.getenv("GITHUB_TIMEOUT", "60"))
+
+# Files fetched per GraphQL query by get_files (GITHUB_GRAPHQL=0 turns it off)
+GRAPHQL_BATCH_SIZE = int(os.getenv("GITHUB_GRAPHQL_BATCH", "50"))
+
+# Maximum number of responses kept for If-None-Match revalidation
+ETAG_CACHE_SIZE = int(os.getenv("GITHUB_ETAG_CACHE_SIZE", "2048"))
+
+# Repositories at or below this size (GitHub reports KB) are extracted whole;
+# larger ones only keep the paths accepted by the snapshot path filter.
+SNAPSHOT_FULL_EXTRACT_KB = int(os.getenv("GITHUB_SNAPSHOT_FULL_EXTRACT_KB", "20000"))
+
+# Snapshots already extracted in this process:
+# (owner, repo, commit sha) -> (files directory, filtered)
+_snapshots: dict = {}
+
+# Where snapshots go without GITHUB_SNAPSHOT_DIR; removed by reset_run_cache()
+# and at exit
+_temp_snapshot_root: Optional[Path] = None
+
+# Snapshot directory -> lock held while it is checked and extracted
+_snapshot_locks: dict = {}
+
+_session: Optional[requests.Session] = None
+_lock = threading.Lock()
+
+# httpx connection pools belong to one event loop, so there is a client per loop
+_async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# (url, auth) -> (etag, payload), revalidated with If-None-Match
+_etag_cache: OrderedDict = OrderedDict()
+
+# (url, auth) -> payload, served without any request until reset_run_cache()
+_run_memo: dict = {}
+
+
+def get_session() -> requests.Session:
+    """Process-wide session so every GitHubRepo shares keep-alive connections"""
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Shared async client for the running event loop, pooled like the session"""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=GITHUB_TIMEOUT,
+                follow_redirects=True,
+                limits=httpx.Limits(
+                    max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE
+                ),
+            )
+            _async_clients[loop] = client
+        return client
+
+
+def reset_run_cache(owner: Optional[str] = None, repo: Optional[str] = None) -> None:
+    """
+    Forget memoized repo info, trees and temporary snapshots (ETags are kept
+    for revalidation). With `owner` and `repo`, only that repository's entries
+    are dropped.
+    """
+    with _lock:
+        for key in list(_snapshots):
+            if owner is None or repo is None or key[:2] == (owner, repo):
+                _snapshots.pop(key, None)
+        if _temp_snapshot_root is not None:
+            temp = _temp_snapshot_root
+            if owner is not None and repo is not None:
+                temp = temp / owner / repo
+            for path in temp.iterdir() if temp.is_dir() else []:
+                shutil.rmtree(path, ignore_errors=True)
+
+        if owner is None or repo is None:
+            _run_memo.clear()
+            return
+
+        prefix = f"{api_url()}/repos/{owner}/{repo}"
+        for key in list(_run_memo):
+            if key == ("blob_shas", owner, repo) or (
+                isinstance(key[0], str)
+                and (key[0] == prefix or key[0].startswith(prefix + "/"))
+            ):
+                _run_memo.pop(key, None)
+
+
+def api_url() -> str:
+    """GitHub REST API root; GITHUB_API_URL points it at GitHub Enterprise or a stub"""
+    return os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+
+
+def graphql_url() -> str:
+    """GraphQL endpoint of api_url(); GitHub Enterprise serves it at /api/graphql"""
+    url = os.getenv("GITHUB_GRAPHQL_URL")
+    if url:
+        return url.rstrip("/")
+    root = api_url()
+    if root.endswith("/v3"):
+        root = root[: -len("/v3")]
+    return f"{root}/graphql"
+
+
+def _files_query(count: int) -> str:
+    """Query for `count` git objects named by the expressions $p0, $p1, ..."""
+    params = "".join(f", $p{i}: String!" for i in range(count))
+    fields = " ".join(
+        f"f{i}: object(expression: $p{i}) {{ ...file }}" for i in range(count)
+    )
+    return (
+        f"query($owner: String!, $name: String!{params}) "
+        f"{{ repository(owner: $owner, name: $name) {{ {fields} }} }} "
+        "fragment file on GitObject { __typename "
+        "... on Blob { oid byteSize isBinary isTruncated text } "
+        "... on Tree { entries { name } } }"
+    )
+
+
+def _graphql_repository(response) -> dict:
+    """The `repository` object of a GraphQL response, raising on query errors"""
+    record(github_calls=1, github_bytes=len(response.content))
+    response.raise_for_status()
+    body = response.json()
+    repository = (body.get("data") or {}).get("repository")
+    if repository is None:
+        errors = body.get("errors") or [{"message": "No repository in response"}]
+        raise RuntimeError("; ".join(e.get("message", "") for e in errors))
+    return repository
+
+
+def _object_content(path: str, node: Optional[dict], cache):
+    """
+    get_file_content's value for a GraphQL object, or None for blobs whose text
+    GraphQL did not return whole and that must come from the Blobs API
+    """
+    if node is None:
+        return f"Error reading file: Not Found: {path}"
+    if node.get("__typename") == "Tree":
+        return [{"name": entry["name"]} for entry in node.get("entries") or []]
+    if node.get("__typename") != "Blob":
+        return f"Error reading file: {path} is a {node.get('__typename')}"
+    if node.get("isBinary"):
+        return f"Error reading file: Binary file ({node.get('byteSize')} bytes)"
+    if node.get("isTruncated") or node.get("text") is None:
+        return None
+
+    text = node["text"]
+    if cache and node.get("oid"):
+        cache.put(node["oid"], text.encode("utf-8"))
+    return text
+
+
+def _snapshot_filtered(target: Path) -> Optional[bool]:
+    """Whether the snapshot at `target` kept only filtered paths; None if absent"""
+    try:
+        with open(target / "tree.json", "r", encoding="utf-8") as f:
+            return bool(json.load(f).get("filtered", True))
+    except (OSError, ValueError):
+        return None
+
+
+def _snapshot_root() -> Path:
+    """GITHUB_SNAPSHOT_DIR, or a temporary directory removed at exit"""
+    global _temp_snapshot_root
+    cache_root = os.getenv("GITHUB_SNAPSHOT_DIR")
+    if cache_root:
+        return Path(cache_root).expanduser()
+    with _lock:
+        if _temp_snapshot_root is None:
+            _temp_snapshot_root = Path(tempfile.mkdtemp(prefix="autoreadme-"))
+            atexit.register(shutil.rmtree, _temp_snapshot_root, True)
+        return _temp_snapshot_root
+
+
+def _snapshot_lock(target: Path) -> threading.Lock:
+    with _lock:
+        return _snapshot_locks.setdefault(str(target), threading.Lock())
+
+
+def _prune_snapshots(target: Path) -> None:
+    """Remove snapshots of older commits next to `target`"""
+    for sibling in target.parent.iterdir():
+        if sibling != target and not sibling.name.startswith(".staging-"):
+            shutil.rmtree(sibling, ignore_errors=True)
+
+
+def snapshot_enabled() -> bool:
+    """Whether GitHub tools should read from a local tarball snapshot"""
+    return os.getenv("GITHUB_SNAPSHOT", "").lower() in ("1", "true", "yes")
 
 
 class GitHubRepo:
@@ -9,66 +232,456 @@ class GitHubRepo:
     def __init__(self, owner: str, repo: str, token: Optional[str] = None):
         self.owner = owner
         self.repo = repo
-        self.base_url = f"https://api.github.com/repos/{owner}/{repo}"
+        self.base_url = f"{api_url()}/repos/{owner}/{repo}"
         self.headers = {"Accept": "application/vnd.github.v3+json"}
         if token:
             self.headers["Authorization"] = f"token {token}"
+        self.limiter = github_limiter(api_url(), self.headers.get("Authorization"))
+
+    def _get_json(self, url: str, memoize: bool = False):
+        """GET a JSON payload, revalidating previously seen responses by ETag"""
+        key = (url, self.headers.get("Authorization"))
+        memo = _run_memo.get(key) if memoize else None
+        if memo is not None:
+            return memo
+
+        headers, cached = self._conditional_headers(key)
+        for _ in range(GITHUB_RATE_LIMIT_RETRIES + 1):
+            self.limiter.acquire()
+            response = get_session().get(url, headers=headers)
+            if not self.limiter.observe(response.status_code, response.headers):
+                break
+        return self._json_payload(key, cached, response, memoize)
+
+    async def _aget_json(self, url: str, memoize: bool = False):
+        """Async _get_json on the event loop's shared httpx client"""
+        key = (url, self.headers.get("Authorization"))
+        memo = _run_memo.get(key) if memoize else None
+        if memo is not None:
+            return memo
+
+        headers, cached = self._conditional_headers(key)
+        for _ in range(GITHUB_RATE_LIMIT_RETRIES + 1):
+            await self.limiter.aacquire()
+            response = await get_async_client().get(url, headers=headers)
+            if not self.limiter.observe(response.status_code, response.headers):
+                break
+        return self._json_payload(key, cached, response, memoize)
+
+    def _conditional_headers(self, key: tuple) -> tuple:
+        headers = dict(self.headers)
+        cached = _etag_cache.get(key)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        return headers, cached
+
+    def _json_payload(self, key: tuple, cached, response, memoize: bool):
+        """Payload of a requests or httpx response, updating the ETag cache"""
+        record(
+            github_calls=1,
+            github_bytes=len(response.content),
+            github_not_modified=int(response.status_code == 304),
+        )
+        if response.status_code == 304 and cached:
+            data = cached[1]
+            with _lock:
+                _etag_cache.move_to_end(key)
+        else:
+            response.raise_for_status()
+            data = response.json()
+            etag = response.headers.get("ETag")
+            if etag:
+                with _lock:
+                    _etag_cache[key] = (etag, data)
+                    _etag_cache.move_to_end(key)
+                    while len(_etag_cache) > ETAG_CACHE_SIZE:
+                        _etag_cache.popitem(last=False)
+
+        if memoize:
+            with _lock:
+                _run_memo[key] = data
+        return data
+
+    def _tree_url(self, repo_info: dict, recursive: bool) -> str:
+        url = f"{self.base_url}/git/trees/{repo_info.get('default_branch', 'main')}"
+        return url + "?recursive=1" if recursive else url
 
     def get_tree(self, recursive: bool = True) -> dict:
         """Get repository tree structure"""
         try:
-            repo_info = requests.get(self.base_url, headers=self.headers).json()
-            default_branch = repo_info.get("default_branch", "main")
-
-            url = f"{self.base_url}/git/trees/{default_branch}"
-            if recursive:
-                url += "?recursive=1"
+            repo_info = self.get_repo_info()
+            if "error" in repo_info:
+                return repo_info
+            return self._get_json(self._tree_url(repo_info, recursive), memoize=True)
+        except Exception as e:
+            return {"error": str(e)}
 
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            return response.json()
+    async def aget_tree(self, recursive: bool = True) -> dict:
+        """Async get_tree"""
+        try:
+            repo_info = await self.aget_repo_info()
+            if "error" in repo_info:
+                return repo_info
+            url = self._tree_url(repo_info, recursive)
+            return await self._aget_json(url, memoize=True)
         except Exception as e:
             return {"error": str(e)}
 
+    def _blob_shas(self, tree_data: dict) -> dict:
+        shas = {
+            item["path"]: item["sha"]
+            for item in tree_data.get("tree", [])
+            if item.get("type") == "blob" and item.get("sha")
+        }
+        with _lock:
+            _run_memo[("blob_shas", self.owner, self.repo)] = shas
+        return shas
+
+    def get_blob_shas(self) -> dict:
+        """Map of file path to blob SHA from the (memoized) recursive tree"""
+        shas = _run_memo.get(("blob_shas", self.owner, self.repo))
+        if shas is None:
+            return self._blob_shas(self.get_tree(recursive=True))
+        return shas
+
+    async def aget_blob_shas(self) -> dict:
+        """Async get_blob_shas"""
+        shas = _run_memo.get(("blob_shas", self.owner, self.repo))
+        if shas is None:
+            return self._blob_shas(await self.aget_tree(recursive=True))
+        return shas
+
     def get_file_content(self, path: str) -> str:
-        """Get content of a specific file"""
+        """Get content of a specific file, served from the blob cache when unchanged"""
         try:
-            url = f"{self.base_url}/contents/{path}"
-            response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
+            cache = get_blob_cache()
+            cached = self._cached_blob(cache, self._known_blob_sha(path))
+            if cached is not None:
+                return cached
+
+            data = self._get_json(f"{self.base_url}/contents/{path}")
+            if self._too_large(data):
+                cached = self._cached_blob(cache, data.get("sha"))
+                if cached is not None:
+                    return cached
+                data = self._get_json(self._blob_url(data["sha"]))
+            return self._decode_content(data, cache)
+        except Exception as e:
+            return f"Error reading file: {str(e)}"
+
+    async def aget_file_content(self, path: str) -> str:
+        """Async get_file_content"""
+        try:
+            cache = get_blob_cache()
+            cached = self._cached_blob(cache, self._known_blob_sha(path))
+            if cached is not None:
+                return cached
 
-            if data.get("encoding") == "base64":
-                content = base64.b64decode(data["content"]).decode("utf-8")
-                return content
-            return data.get("content", "")
+            data = await self._aget_json(f"{self.base_url}/contents/{path}")
+            if self._too_large(data):
+                cached = self._cached_blob(cache, data.get("sha"))
+                if cached is not None:
+                    return cached
+                data = await self._aget_json(self._blob_url(data["sha"]))
+            return self._decode_content(data, cache)
         except Exception as e:
             return f"Error reading file: {str(e)}"
 
+    def _known_blob_sha(self, path: str) -> Optional[str]:
+        """
+        Blob SHA of `path` if this run already has the recursive tree; looking
+        it up never fetches the tree just to consult the blob cache
+        """
+        auth = self.headers.get("Authorization")
+        shas = _run_memo.get(("blob_shas", self.owner, self.repo))
+        if shas is None:
+            repo_info = _run_memo.get((self.base_url, auth))
+            tree = repo_info and _run_memo.get((self._tree_url(repo_info, True), auth))
+            if not tree:
+                return None
+            shas = self._blob_shas(tree)
+        return shas.get(path.strip("/"))
+
+    def _cached_blob(self, cache, sha: Optional[str]) -> Optional[str]:
+        cached = cache.get(sha) if cache and sha else None
+        return cached.decode("utf-8") if cached is not None else None
+
+    def _blob_url(self, sha: str) -> str:
+        return f"{self.base_url}/git/blobs/{sha}"
+
+    def _too_large(self, data) -> bool:
+        """Whether the Contents API left out a file's content (files over 1MB)"""
+        return (
+            isinstance(data, dict)
+            and data.get("encoding") == "none"
+            and bool(data.get("sha"))
+        )
+
+    @property
+    def batch_enabled(self) -> bool:
+        """Whether get_files can be used; GitHub's GraphQL API needs a token"""
+        enabled = os.getenv("GITHUB_GRAPHQL", "1").lower() not in ("0", "false", "no")
+        return enabled and "Authorization" in self.headers
+
+    def _cached_files(self, paths: list, cache, shas: dict) -> dict:
+        contents = {}
+        for path in paths:
+            cached = self._cached_blob(cache, shas.get(path.strip("/")))
+            if cached is not None:
+                contents[path] = cached
+        return contents
+
+    def _files_request(self, paths: list) -> dict:
+        variables = {"owner": self.owner, "name": self.repo}
+        for i, path in enumerate(paths):
+            variables[f"p{i}"] = f"HEAD:{path.strip('/')}"
+        return {"query": _files_query(len(paths)), "variables": variables}
+
+    def _post_graphql(self, payload: dict) -> dict:
+        limiter = github_limiter(graphql_url(), self.headers.get("Authorization"))
+        for _ in range(GITHUB_RATE_LIMIT_RETRIES + 1):
+            limiter.acquire()
+            response = get_session().post(
+                graphql_url(), headers=self.headers, json=payload
+            )
+            if not limiter.observe(response.status_code, response.headers):
+                break
+        return _graphql_repository(response)
+
+    async def _apost_graphql(self, payload: dict) -> dict:
+        limiter = github_limiter(graphql_url(), self.headers.get("Authorization"))
+        for _ in range(GITHUB_RATE_LIMIT_RETRIES + 1):
+            await limiter.aacquire()
+            response = await get_async_client().post(
+                graphql_url(), headers=self.headers, json=payload
+            )
+            if not limiter.observe(response.status_code, response.headers):
+                break
+        return _graphql_repository(response)
+
+    def _batches(self, paths: list, contents: dict) -> list:
+        missing = [path for path in dict.fromkeys(paths) if path not in contents]
+        return [
+            missing[start : start + GRAPHQL_BATCH_SIZE]
+            for start in range(0, len(missing), max(1, GRAPHQL_BATCH_SIZE))
+        ]
+
+    def get_files(self, paths: list) -> dict:
+        """
+        get_file_content for many paths in as few requests as possible.
+
+        Unchanged blobs come from the blob cache, the rest from GraphQL queries
+        of up to GRAPHQL_BATCH_SIZE `HEAD:<path>` objects each. Blobs whose
+        text GraphQL truncates or leaves out are fetched from the Git Blobs
+        API. Raises when a GraphQL query fails, so callers can fall back to
+        get_file_content.
+        """
+        cache = get_blob_cache()
+        contents = self._cached_files(
+            paths, cache, self.get_blob_shas() if cache else {}
+        )
+        large = {}
+        for batch in self._batches(paths, contents):
+            repository = self._post_graphql(self._files_request(batch))
+            for i, path in enumerate(batch):
+                node = repository.get(f"f{i}")
+                content = _object_content(path, node, cache)
+                if content is None:
+                    large[path] = node["oid"]
+                else:
+                    contents[path] = content
+
+        for path, sha in large.items():
+            contents[path] = self._get_blob(sha, cache)
+        return contents
+
+    async def aget_files(self, paths: list) -> dict:
+        """Async get_files; large blobs are fetched concurrently"""
+        cache = get_blob_cache()
+        contents = self._cached_files(
+            paths, cache, (await self.aget_blob_shas()) if cache else {}
+        )
+        large = {}
+        for batch in self._batches(paths, contents):
+            repository = await self._apost_graphql(self._files_request(batch))
+            for i, path in enumerate(batch):
+                node = repository.get(f"f{i}")
+                content = _object_content(path, node, cache)
+                if content is None:
+                    large[path] = node["oid"]
+                else:
+                    contents[path] = content
+
+        blobs = await asyncio.gather(
+            *(self._aget_blob(sha, cache) for sha in large.values())
+        )
+        contents.update(zip(large, blobs))
+        return contents
+
+    def _get_blob(self, sha: str, cache):
+        try:
+            return self._decode_content(self._get_json(self._blob_url(sha)), cache)
+        except Exception as e:
+            return f"Error reading file: {str(e)}"
+
+    async def _aget_blob(self, sha: str, cache):
+        try:
+            data = await self._aget_json(self._blob_url(sha))
+            return self._decode_content(data, cache)
+        except Exception as e:
+            return f"Error reading file: {str(e)}"
+
+    def _decode_content(self, data, cache):
+        """File text of a contents API payload; directory listings pass through"""
+        if isinstance(data, list):
+            return data
+
+        if data.get("encoding") == "base64":
+            raw = base64.b64decode(data["content"])
+            if cache and data.get("sha"):
+                cache.put(data["sha"], raw)
+            return raw.decode("utf-8")
+        return data.get("content", "")
+
     def get_repo_info(self) -> dict:
         """Get repository metadata"""
         try:
-            response = requests.get(self.base_url, headers=self.headers)
-            response.raise_for_status()
-            return response.json()
+            return self._get_json(self.base_url, memoize=True)
         except Exception as e:
             return {"error": str(e)}
 
+    async def aget_repo_info(self) -> dict:
+        """Async get_repo_info"""
+        try:
+            return await self._aget_json(self.base_url, memoize=True)
+        except Exception as e:
+            return {"error": str(e)}
+
+    def get_head_sha(self, branch: str) -> str:
+        """Commit SHA at the head of `branch`, memoized until reset_run_cache()"""
+        url = f"{self.base_url}/commits/{branch}"
+        return self._get_json(url, memoize=True)["sha"]
+
+    def get_snapshot(
+        self, path_filter: Optional[Callable[[str], bool]] = None
+    ) -> Path:
+        """
+        Download the repository tarball once and extract it to a local directory.
+
+        Snapshots are keyed on the default branch's head commit, so a push makes
+        the next run download a new one, and older ones are pruned. They live in
+        GITHUB_SNAPSHOT_DIR when set (and are reused across runs), otherwise in
+        a temporary directory that reset_run_cache() clears. Returns the
+        directory holding the extracted files; a `tree.json` next to it mirrors
+        the recursive tree API response for every file in the tarball and
+        records whether only filtered paths were kept.
+        """
+        repo_info = self.get_repo_info()
+        if "error" in repo_info:
+            raise RuntimeError(repo_info["error"])
+        default_branch = repo_info.get("default_branch", "main")
+        sha = self.get_head_sha(default_branch)
+
+        if repo_info.get("size", 0) <= SNAPSHOT_FULL_EXTRACT_KB:
+            path_filter = None
+
+        key = (self.owner, self.repo, sha)
+        cached = _snapshots.get(key)
+        if cached and (path_filter or not cached[1]):
+            return cached[0]
+
+        target = _snapshot_root() / self.owner / self.repo / sha
+        # Concurrent runs of the same repository extract it once
+        with _snapshot_lock(target):
+            filtered = _snapshot_filtered(target)
+            if filtered is None or (filtered and not path_filter):
+                self._extract_tarball(sha, target, path_filter)
+                filtered = path_filter is not None
+                _prune_snapshots(target)
+            _snapshots[key] = (target / "files", filtered)
+        return target / "files"
+
+    def get_snapshot_tree(
+        self, path_filter: Optional[Callable[[str], bool]] = None
+    ) -> dict:
+        """Get repository tree structure from the local snapshot"""
+        try:
+            files_dir = self.get_snapshot(path_filter)
+            with open(files_dir.parent / "tree.json", "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            return {"error": str(e)}
+
+    def _extract_tarball(
+        self,
+        ref: str,
+        target: Path,
+        path_filter: Optional[Callable[[str], bool]],
+    ) -> None:
+        """Stream the tarball for `ref` into `target` without buffering it in memory"""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=target.parent))
+        files_dir = staging / "files"
+        files_dir.mkdir()
+        tree = []
+
+        try:
+            url = f"{self.base_url}/tarball/{ref}"
+            self.limiter.acquire()
+            with get_session().get(url, headers=self.headers, stream=True) as response:
+                self.limiter.observe(response.status_code, response.headers)
+                response.raise_for_status()
+                response.raw.decode_content = True
+
+                with tarfile.open(fileobj=response.raw, mode="r|gz") as archive:
+                    for member in archive:
+                        # Members are prefixed with "<owner>-<repo>-<sha>/"
+                        parts = member.name.split("/", 1)
+                        if len(parts) < 2 or not parts[1]:
+                            continue
+                        path = parts[1].rstrip("/")
+
+                        if member.isdir():
+                            tree.append({"path": path, "type": "tree"})
+                            continue
+                        if not member.isfile():
+                            continue
 
-def parse_github_url(url: str) -> tuple:
-    """Parse GitHub URL to extract owner and repo name"""
-    url = url.strip().rstrip("/")
+                        tree.append({"path": path, "type": "blob", "size": member.size})
+                        if path_filter and not path_filter(path):
+                            continue
 
-    if url.endswith(".git"):
-        url = url[:-4]
+                        dest = (files_dir / path).resolve()
+                        if files_dir.resolve() not in dest.parents:
+                            continue
 
-    url = url.replace("https://", "").replace("http://", "")
+                        dest.parent.mkdir(parents=True, exist_ok=True)
+                        src = archive.extractfile(member)
+                        with src, open(dest, "wb") as dst:
+                            shutil.copyfileobj(src, dst)
 
-    if url.startswith("github.com/"):
-        url = url[11:]
+                record(github_calls=1, github_bytes=response.raw.tell())
 
-    parts = url.split("/")
-    if len(parts) >= 2:
-        return parts[0], parts[1]
+            with open(staging / "tree.json", "w", encoding="utf-8") as f:
+                json.dump(
+                    {
+                        "ref": ref,
+                        "tree": tree,
+                        "truncated": False,
+                        "filtered": path_filter is not None,
+                    },
+                    f,
+                )
 
-    raise ValueError(f"Invalid GitHub URL: {url}")
+            # Move a previous (filtered) extract aside instead of deleting it in
+            # place, so the swap itself is a pair of renames
+            previous = None
+            if target.exists():
+                previous = Path(tempfile.mkdtemp(prefix=".staging-", dir=target.parent))
+                os.replace(target, previous / "snapshot")
+            os.replace(staging, target)
+            if previous:
+                shutil.rmtree(previous, ignore_errors=True)
+        finally:
+            if staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
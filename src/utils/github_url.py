@@ -0,0 +1,17 @@
+def parse_github_url(url: str) -> tuple:
+    """Parse GitHub URL to extract owner and repo name"""
+    url = url.strip().rstrip("/")
+
+    if url.endswith(".git"):
+        url = url[:-4]
+
+    url = url.replace("https://", "").replace("http://", "")
+
+    if url.startswith("github.com/"):
+        url = url[11:]
+
+    parts = url.split("/")
+    if len(parts) >= 2:
+        return parts[0], parts[1]
+
+    raise ValueError(f"Invalid GitHub URL: {url}")
@@ -0,0 +1,398 @@
+import os
+import re
+import json
+import asyncio
+import contextvars
+import configparser
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Awaitable, Callable, Optional
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+MAX_MANIFEST_BYTES = 1_000_000
+LOCAL_SEARCH_DEPTH = 2
+
+# Most manifests read when searching for them, shallowest first
+MAX_MANIFESTS = int(os.getenv("MAX_MANIFESTS", "50"))
+
+# Well-known dependencies that identify a framework or major library
+FRAMEWORKS = {
+    "django": "Django",
+    "flask": "Flask",
+    "fastapi": "FastAPI",
+    "streamlit": "Streamlit",
+    "langchain": "LangChain",
+    "langgraph": "LangGraph",
+    "torch": "PyTorch",
+    "tensorflow": "TensorFlow",
+    "pandas": "pandas",
+    "pytest": "pytest",
+    "react": "React",
+    "next": "Next.js",
+    "vue": "Vue",
+    "svelte": "Svelte",
+    "@angular/core": "Angular",
+    "express": "Express",
+    "@nestjs/core": "NestJS",
+    "electron": "Electron",
+    "vite": "Vite",
+    "actix-web": "Actix Web",
+    "axum": "Axum",
+    "rocket": "Rocket",
+    "tokio": "Tokio",
+    "github.com/gin-gonic/gin": "Gin",
+    "github.com/labstack/echo/v4": "Echo",
+    "github.com/gofiber/fiber/v2": "Fiber",
+    "github.com/spf13/cobra": "Cobra",
+    "laravel/framework": "Laravel",
+    "symfony/framework-bundle": "Symfony",
+    "org.springframework.boot": "Spring Boot",
+}
+
+
+def _requirement_name(spec: str) -> Optional[str]:
+    """Package name from a PEP 508 requirement string"""
+    spec = spec.split(";")[0].split("#")[0].strip()
+    if not spec or spec.startswith(("-", "git+", "http://", "https://")):
+        return None
+    match = re.match(r"^([A-Za-z0-9][A-Za-z0-9._-]*)", spec)
+    return match.group(1).lower() if match else None
+
+
+def parse_requirements_txt(content: str) -> dict:
+    names = [_requirement_name(line) for line in content.splitlines()]
+    return {
+        "languages": ["Python"],
+        "dependencies": {"python": [n for n in names if n]},
+    }
+
+
+def parse_pyproject_toml(content: str) -> dict:
+    if tomllib is None:
+        return {"languages": ["Python"]}
+
+    data = tomllib.loads(content)
+    project = data.get("project", {})
+    poetry = data.get("tool", {}).get("poetry", {})
+
+    specs = list(project.get("dependencies", []))
+    for extra in project.get("optional-dependencies", {}).values():
+        specs.extend(extra)
+    names = [_requirement_name(s) for s in specs]
+    names.extend(n.lower() for n in poetry.get("dependencies", {}) if n != "python")
+
+    scripts = dict(project.get("scripts", {}))
+    scripts.update(poetry.get("scripts", {}))
+
+    return {
+        "languages": ["Python"],
+        "dependencies": {"python": [n for n in names if n]},
+        "scripts": scripts,
+        "entry_points": [f"{name} = {target}" for name, target in scripts.items()],
+    }
+
+
+def parse_setup_py(content: str) -> dict:
+    result = {"languages": ["Python"], "dependencies": {"python": []}}
+
+    match = re.search(r"install_requires\s*=\s*\[(.*?)\]", content, re.S)
+    if match:
+        specs = re.findall(r"[\"']([^\"']+)[\"']", match.group(1))
+        result["dependencies"]["python"] = [
+            n for n in (_requirement_name(s) for s in specs) if n
+        ]
+
+    match = re.search(r"console_scripts[\"']\s*:\s*\[(.*?)\]", content, re.S)
+    if match:
+        result["entry_points"] = re.findall(
+            r"[\"']([^\"']+=[^\"']+)[\"']", match.group(1)
+        )
+    return result
+
+
+def parse_setup_cfg(content: str) -> dict:
+    parser = configparser.ConfigParser()
+    parser.read_string(content)
+
+    specs = parser.get("options", "install_requires", fallback="").splitlines()
+    scripts = parser.get("options.entry_points", "console_scripts", fallback="")
+    return {
+        "languages": ["Python"],
+        "dependencies": {
+            "python": [n for n in (_requirement_name(s) for s in specs) if n]
+        },
+        "entry_points": [s.strip() for s in scripts.splitlines() if s.strip()],
+    }
+
+
+def parse_package_json(content: str) -> dict:
+    data = json.loads(content)
+    deps = list(data.get("dependencies", {})) + list(data.get("devDependencies", {}))
+
+    entry_points = []
+    if data.get("main"):
+        entry_points.append(data["main"])
+    bin_field = data.get("bin")
+    if isinstance(bin_field, str):
+        entry_points.append(bin_field)
+    elif isinstance(bin_field, dict):
+        entry_points.extend(f"{name} = {path}" for name, path in bin_field.items())
+
+    languages = ["JavaScript"]
+    if "typescript" in deps:
+        languages.append("TypeScript")
+
+    return {
+        "languages": languages,
+        "dependencies": {"npm": deps},
+        "scripts": dict(data.get("scripts", {})),
+        "entry_points": entry_points,
+    }
+
+
+def parse_tsconfig_json(content: str) -> dict:
+    return {"languages": ["TypeScript"]}
+
+
+def parse_cargo_toml(content: str) -> dict:
+    if tomllib is None:
+        return {"languages": ["Rust"]}
+
+    data = tomllib.loads(content)
+    deps = list(data.get("dependencies", {})) + list(data.get("dev-dependencies", {}))
+
+    entry_points = [
+        b.get("path", f"src/bin/{b.get('name')}.rs") for b in data.get("bin", [])
+    ]
+    if not entry_points and "package" in data and "lib" not in data:
+        entry_points.append("src/main.rs")
+
+    return {
+        "languages": ["Rust"],
+        "dependencies": {"cargo": deps},
+        "entry_points": entry_points,
+    }
+
+
+def parse_go_mod(content: str) -> dict:
+    requires = re.findall(
+        r"^\s*(?:require\s+)?([\w.\-]+\.[\w]+/[\w./\-]+)\s+v", content, re.M
+    )
+    module = re.search(r"^module\s+(\S+)", content, re.M)
+    go_version = re.search(r"^go\s+(\S+)", content, re.M)
+
+    result = {"languages": ["Go"], "dependencies": {"go": requires}}
+    if module:
+        result["module"] = module.group(1)
+    if go_version:
+        result["language_versions"] = {"Go": go_version.group(1)}
+    return result
+
+
+def parse_composer_json(content: str) -> dict:
+    data = json.loads(content)
+    deps = list(data.get("require", {})) + list(data.get("require-dev", {}))
+    deps = [d for d in deps if d != "php" and not d.startswith("ext-")]
+    return {
+        "languages": ["PHP"],
+        "dependencies": {"composer": deps},
+        "scripts": {k: str(v) for k, v in data.get("scripts", {}).items()},
+    }
+
+
+def parse_pom_xml(content: str) -> dict:
+    deps = re.findall(
+        r"<dependency>\s*<groupId>([^<]+)</groupId>\s*<artifactId>([^<]+)</artifactId>",
+        content,
+    )
+    return {
+        "languages": ["Java"],
+        "dependencies": {"maven": [f"{group}:{artifact}" for group, artifact in deps]},
+    }
+
+
+def parse_build_gradle(content: str) -> dict:
+    configurations = "implementation|api|compileOnly|runtimeOnly|testImplementation"
+    deps = re.findall(
+        rf"(?:{configurations})\s*\(?\s*[\"']([^\"':]+:[^\"':]+)", content
+    )
+    languages = ["Kotlin"] if "kotlin" in content.lower() else ["Java"]
+    return {
+        "languages": languages,
+        "dependencies": {"gradle": deps},
+    }
+
+
+def parse_dockerfile(content: str) -> dict:
+    commands = re.findall(r"^\s*(?:ENTRYPOINT|CMD)\s+(.+)$", content, re.M | re.I)
+    return {"tools": ["Docker"], "entry_points": [c.strip() for c in commands[-1:]]}
+
+
+def parse_docker_compose(content: str) -> dict:
+    return {"tools": ["Docker Compose"]}
+
+
+def parse_makefile(content: str) -> dict:
+    targets = re.findall(r"^([A-Za-z0-9][\w.-]*)\s*:(?!=)", content, re.M)
+    targets = [t for t in dict.fromkeys(targets) if not t.startswith(".")]
+    return {"tools": ["Make"], "scripts": {t: f"make {t}" for t in targets}}
+
+
+MANIFEST_PARSERS: dict = {
+    "requirements.txt": parse_requirements_txt,
+    "pyproject.toml": parse_pyproject_toml,
+    "setup.py": parse_setup_py,
+    "setup.cfg": parse_setup_cfg,
+    "package.json": parse_package_json,
+    "tsconfig.json": parse_tsconfig_json,
+    "Cargo.toml": parse_cargo_toml,
+    "go.mod": parse_go_mod,
+    "composer.json": parse_composer_json,
+    "pom.xml": parse_pom_xml,
+    "build.gradle": parse_build_gradle,
+    "Dockerfile": parse_dockerfile,
+    "docker-compose.yml": parse_docker_compose,
+    "Makefile": parse_makefile,
+}
+
+
+def is_manifest(path: str) -> bool:
+    return Path(path).name in MANIFEST_PARSERS
+
+
+def analyze_manifests(files: dict) -> dict:
+    """
+    Merge the facts from every manifest in `files` (path -> content).
+
+    Returns languages, frameworks, tools, dependencies per ecosystem, scripts per
+    manifest and entry points. Manifests that fail to parse are listed under
+    `errors` instead of aborting the whole analysis.
+    """
+    result = {
+        "languages": [],
+        "frameworks": [],
+        "tools": [],
+        "dependencies": {},
+        "scripts": {},
+        "entry_points": [],
+        "manifests": [],
+        "errors": {},
+    }
+
+    for path in sorted(files, key=lambda p: (p.count("/"), p)):
+        parser = MANIFEST_PARSERS.get(Path(path).name)
+        if parser is None or not isinstance(files[path], str):
+            continue
+        try:
+            facts = parser(files[path])
+        except Exception as e:
+            result["errors"][path] = f"{type(e).__name__}: {e}"
+            continue
+
+        result["manifests"].append(path)
+        for key in ("languages", "tools", "entry_points"):
+            for value in facts.get(key, []):
+                if value not in result[key]:
+                    result[key].append(value)
+        for ecosystem, deps in facts.get("dependencies", {}).items():
+            merged = result["dependencies"].setdefault(ecosystem, [])
+            merged.extend(d for d in deps if d not in merged)
+        if facts.get("scripts"):
+            result["scripts"][path] = facts["scripts"]
+
+    for deps in result["dependencies"].values():
+        for dep in deps:
+            framework = FRAMEWORKS.get(dep.lower()) or FRAMEWORKS.get(dep.split(":")[0])
+            if framework and framework not in result["frameworks"]:
+                result["frameworks"].append(framework)
+
+    return result
+
+
+def find_local_manifests(project_path: str, ignore_dirs: set) -> list:
+    """Manifest paths under `project_path`, at most LOCAL_SEARCH_DEPTH levels deep"""
+    root = Path(project_path).resolve()
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        depth = len(Path(dirpath).relative_to(root).parts)
+        dirnames[:] = [
+            d for d in dirnames if d not in ignore_dirs and not d.startswith(".")
+        ]
+        if depth >= LOCAL_SEARCH_DEPTH:
+            dirnames[:] = []
+        found.extend(
+            os.path.join(dirpath, f) for f in filenames if f in MANIFEST_PARSERS
+        )
+    found.sort(key=lambda p: (len(Path(p).relative_to(root).parts), p))
+    return sorted(found[:MAX_MANIFESTS])
+
+
+def find_tree_manifests(paths: list, ignore_dirs: set) -> list:
+    """
+    find_local_manifests over the file paths of a repository tree: the same
+    depth limit and count cap, skipping ignored and hidden directories
+    """
+    found = []
+    for path in paths:
+        *dirs, name = path.split("/")
+        if name not in MANIFEST_PARSERS or len(dirs) > LOCAL_SEARCH_DEPTH:
+            continue
+        if any(d in ignore_dirs or d.startswith(".") for d in dirs):
+            continue
+        found.append(path)
+    found.sort(key=lambda p: (p.count("/"), p))
+    return sorted(found[:MAX_MANIFESTS])
+
+
+def read_manifests(
+    paths: list, read: Callable[[str], object], workers: int = 8
+) -> dict:
+    """Fetch manifests concurrently with `read`, skipping failures and huge files"""
+    paths = [p for p in dict.fromkeys(paths) if is_manifest(p)]
+    if not paths:
+        return {}
+
+    # Reads run in copies of this context so their telemetry counts for the node
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(paths)))) as pool:
+        futures = [
+            pool.submit(contextvars.copy_context().run, read, path) for path in paths
+        ]
+        contents = [future.result() for future in futures]
+    return _usable_manifests(paths, contents)
+
+
+async def aread_manifests(
+    paths: list, read: Callable[[str], Awaitable[object]], workers: int = 8
+) -> dict:
+    """read_manifests for a coroutine `read`, with at most `workers` in flight"""
+    paths = [p for p in dict.fromkeys(paths) if is_manifest(p)]
+    limit = asyncio.Semaphore(max(1, workers))
+
+    async def _read(path: str):
+        async with limit:
+            return await read(path)
+
+    contents = await asyncio.gather(*(_read(path) for path in paths))
+    return _usable_manifests(paths, contents)
+
+
+def _usable_manifests(paths: list, contents: list) -> dict:
+    return {
+        path: content
+        for path, content in zip(paths, contents)
+        if isinstance(content, str) and len(content) <= MAX_MANIFEST_BYTES
+    }
+
+
+def read_local_manifest(path: str) -> Optional[str]:
+    try:
+        if os.path.getsize(path) > MAX_MANIFEST_BYTES:
+            return None
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            return f.read()
+    except OSError:
+        return None
@@ -1,9 +1,12 @@
+import hashlib
 import pathlib
+from functools import lru_cache
 
 BASE_DIR = pathlib.Path(__file__).parent.parent.parent
 PROMPTS_DIR = BASE_DIR / "data" / "prompts"
 
 
+@lru_cache(maxsize=None)
 def load_prompt(agent: str, prompt_type: str) -> str:
     prompt_path = PROMPTS_DIR / agent / f"{prompt_type}.md"
 
@@ -11,3 +14,54 @@ def load_prompt(agent: str, prompt_type: str) -> str:
         raise FileNotFoundError(f"Prompt file not found at: {prompt_path.absolute()}")
 
     return prompt_path.read_text(encoding="utf-8")
+
+
+@lru_cache(maxsize=1)
+def prompts_digest() -> str:
+    """Hash of every prompt file, so a run can tell that its prompts changed"""
+    digest = hashlib.sha1()
+    for path in sorted(PROMPTS_DIR.rglob("*.md")):
+        digest.update(path.relative_to(PROMPTS_DIR).as_posix().encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=64)
+def static_prompt(agent: str, **sections: str) -> str:
+    """
+    An agent's base prompt with its placeholders filled by other prompt files
+    (section name -> prompt type, or "" for an empty section).
+
+    The result only depends on the prompt files, so it is assembled once per
+    process and is byte-identical for every repository, which keeps it usable
+    as a provider-side prompt cache prefix.
+    """
+    values = {
+        name: load_prompt(agent, prompt_type) if prompt_type else ""
+        for name, prompt_type in sections.items()
+    }
+    return load_prompt(agent, "base").format(**values)
+
+
+@lru_cache(maxsize=8)
+def example_section(example_readme: str) -> str:
+    """The style reference section for a user-supplied example README"""
+    if not example_readme:
+        return ""
+    return load_prompt("writer", "example_readme").format(EXAMPLE_README=example_readme)
+
+
+def system_prompt(static: str, context: dict, *sections: str) -> str:
+    """
+    Static instructions first, then the values specific to this run.
+
+    `context` becomes a RUN CONTEXT list after the static part; `sections`
+    (e.g. an existing README) are appended last.
+    """
+    lines = [f"- {name}: {value}" for name, value in context.items() if value]
+    parts = [static.rstrip()]
+    if lines:
+        parts.append("## RUN CONTEXT\n\n" + "\n".join(lines))
+    parts.extend(section.strip() for section in sections if section)
+    return "\n\n".join(parts)
@@ -0,0 +1,266 @@
+import os
+import re
+import time
+import asyncio
+import hashlib
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Optional
+from utils.telemetry import record
+
+# Longest a request may be queued for quota before it fails instead
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "600"))
+
+# Backoff for a 429 that does not say when to retry (doubles per repeat)
+DEFAULT_BACKOFF = 2.0
+MAX_BACKOFF = 60.0
+
+# GitHub's primary limits per hour, authenticated and anonymous
+GITHUB_HOURLY_LIMITS = {True: 5000, False: 60}
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+_limiters: dict = {}
+_lock = threading.Lock()
+
+
+class RateLimitExceeded(RuntimeError):
+    """Raised when quota won't come back within RATE_LIMIT_MAX_WAIT"""
+
+
+def _header(headers, name: str) -> Optional[str]:
+    value = headers.get(name) if headers is not None else None
+    return value if value not in (None, "") else None
+
+
+def _duration(value: str) -> Optional[float]:
+    """Seconds in an OpenAI-style reset header ("1s", "6m0s", "20ms")"""
+    parts = _DURATION.findall(value)
+    if not parts:
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return sum(float(amount) * _UNITS[unit] for amount, unit in parts)
+
+
+def _retry_after(headers) -> Optional[float]:
+    """Seconds from retry-after-ms or Retry-After (seconds or an HTTP date)"""
+    value = _header(headers, "retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = _header(headers, "retry-after")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        try:
+            return parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+
+
+class RateLimiter:
+    """
+    Token bucket plus the quota the server last reported for one API key.
+
+    `acquire()` blocks (`aacquire()` awaits) until a token is available and
+    any reported exhaustion or Retry-After has passed, so callers queue
+    instead of failing. `observe()` reads the rate limit headers of every
+    response and says whether the request was throttled and should be retried.
+    """
+
+    def __init__(self, name: str, rate: float = 0.0, burst: float = 1.0):
+        self.name = name
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.limit = None
+        self.remaining = None
+        self.reset_at = None
+        self.backoff = DEFAULT_BACKOFF
+        self.waits = 0
+        self.wait_seconds = 0.0
+        self.throttled = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token and return how long the caller has to wait for it"""
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self.blocked_until - now)
+            if self.rate > 0:
+                elapsed = now - self.updated
+                self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+                self.updated = now
+                # Going negative queues callers in arrival order
+                self.tokens -= 1
+                if self.tokens < 0:
+                    wait = max(wait, -self.tokens / self.rate)
+
+            if wait > RATE_LIMIT_MAX_WAIT:
+                if self.rate > 0:
+                    self.tokens += 1
+                raise RateLimitExceeded(
+                    f"{self.name} rate limit exhausted for another {wait:.0f}s"
+                )
+            if wait:
+                self.waits += 1
+                self.wait_seconds += wait
+        if wait:
+            record(rate_limit_waits=1, rate_limit_wait_seconds=wait)
+        return wait
+
+    def acquire(self) -> float:
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    async def aacquire(self) -> float:
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        return wait
+
+    def observe(self, status: int, headers) -> bool:
+        """Update the quota from a response; True if it was rate limited"""
+        now = time.monotonic()
+        limit, remaining, reset_in = self._quota(headers)
+        retry_after = _retry_after(headers)
+        throttled = status == 429 or (
+            status == 403 and (remaining == 0 or retry_after is not None)
+        )
+
+        with self._lock:
+            if limit is not None:
+                self.limit = limit
+            if remaining is not None:
+                self.remaining = remaining
+                if self.rate > 0:
+                    self.tokens = min(self.tokens, remaining)
+            if reset_in is not None:
+                self.reset_at = now + max(0.0, reset_in)
+
+            block = None
+            if retry_after is not None:
+                block = retry_after
+            elif remaining == 0 and reset_in is not None:
+                block = reset_in
+            elif throttled:
+                block = self.backoff
+                self.backoff = min(MAX_BACKOFF, self.backoff * 2)
+            if not throttled:
+                self.backoff = DEFAULT_BACKOFF
+            if block is not None:
+                self.blocked_until = max(self.blocked_until, now + max(0.0, block))
+            if throttled:
+                self.throttled += 1
+
+        if throttled:
+            record(rate_limited=1)
+        return throttled
+
+    @staticmethod
+    def _quota(headers) -> tuple:
+        """(limit, remaining, seconds until reset) from GitHub or OpenAI headers"""
+        remaining = _header(headers, "x-ratelimit-remaining")
+        if remaining is not None:
+            # GitHub: the reset header is an epoch timestamp
+            limit = _header(headers, "x-ratelimit-limit")
+            reset = _header(headers, "x-ratelimit-reset")
+            return (
+                int(limit) if limit and limit.isdigit() else None,
+                int(remaining) if remaining.isdigit() else None,
+                float(reset) - time.time() if reset and reset.isdigit() else None,
+            )
+
+        # OpenAI-compatible: separate request and token quotas with durations;
+        # the one that runs out first decides
+        quotas = []
+        for kind in ("requests", "tokens"):
+            remaining = _header(headers, f"x-ratelimit-remaining-{kind}")
+            if remaining is None or not remaining.isdigit():
+                continue
+            limit = _header(headers, f"x-ratelimit-limit-{kind}")
+            reset = _header(headers, f"x-ratelimit-reset-{kind}")
+            quotas.append(
+                (
+                    int(remaining),
+                    int(limit) if limit and limit.isdigit() else None,
+                    _duration(reset) if reset else None,
+                )
+            )
+        if not quotas:
+            return None, None, None
+        remaining, limit, reset_in = min(
+            quotas, key=lambda q: q[0] / q[1] if q[1] else q[0]
+        )
+        return limit, remaining, reset_in
+
+    def snapshot(self) -> dict:
+        """Current budget, for health checks and metrics"""
+        with self._lock:
+            now = time.monotonic()
+            tokens = None
+            if self.rate > 0:
+                elapsed = now - self.updated
+                tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset_in": (
+                    round(max(0.0, self.reset_at - now), 1) if self.reset_at else None
+                ),
+                "blocked_for": round(max(0.0, self.blocked_until - now), 1),
+                "rate": self.rate,
+                "tokens": round(tokens, 2) if tokens is not None else None,
+                "waits": self.waits,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "throttled": self.throttled,
+            }
+
+
+def get_limiter(name: str, rate: float = 0.0, burst: float = 1.0) -> RateLimiter:
+    """Process-wide limiter for `name`; rate and burst apply on first use"""
+    with _lock:
+        if name not in _limiters:
+            _limiters[name] = RateLimiter(name, rate, burst)
+        return _limiters[name]
+
+
+def github_limiter(api_root: str, authorization: Optional[str]) -> RateLimiter:
+    """Limiter shared by every request made with one GitHub token"""
+    if authorization:
+        digest = hashlib.sha256(authorization.encode("utf-8")).hexdigest()[:8]
+        name = f"github:{api_root}:{digest}"
+    else:
+        name = f"github:{api_root}:anonymous"
+
+    default_rate = GITHUB_HOURLY_LIMITS[bool(authorization)] / 3600
+    rate = float(os.getenv("GITHUB_RATE_LIMIT", default_rate))
+    burst = float(os.getenv("GITHUB_RATE_BURST", "500"))
+    return get_limiter(name, rate, burst)
+
+
+def llm_limiter(provider: str) -> RateLimiter:
+    """Limiter shared by every request to one LLM provider"""
+    rate = os.getenv(f"{provider.upper()}_RATE_LIMIT") or os.getenv(
+        "LLM_RATE_LIMIT", "0"
+    )
+    burst = float(os.getenv("LLM_RATE_BURST", "10"))
+    return get_limiter(f"llm:{provider}", float(rate), burst)
+
+
+def rate_limit_stats() -> dict:
+    """Budget of every limiter used in this process"""
+    with _lock:
+        limiters = list(_limiters.values())
+    return {limiter.name: limiter.snapshot() for limiter in limiters}
@@ -0,0 +1,295 @@
+import os
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Optional
+from utils.telemetry import record
+
+# Tokens of file content one run may read, by model name prefix (longest wins),
+# roughly half the context window so prompts and the README still fit
+MODEL_READ_BUDGETS = {
+    "gpt-4o": 60_000,
+    "gpt-4.1": 200_000,
+    "gpt-4-turbo": 60_000,
+    "gpt-4": 4_000,
+    "gpt-3.5": 8_000,
+    "moonshotai/kimi-k2": 120_000,
+    "llama-3.1-8b": 40_000,
+    "llama-3.3-70b": 60_000,
+    "openai/gpt-oss": 60_000,
+}
+DEFAULT_READ_BUDGET = 60_000
+
+# Largest share of the budget one file may take
+FILE_SHARE = float(os.getenv("READ_BUDGET_FILE_SHARE", "0.15"))
+
+# Read order, and the share of the budget each kind of file must leave for the
+# kinds before it; config files and entry points may spend all of it
+KINDS = ("config", "entry", "source", "other")
+RESERVES = {"config": 0.0, "entry": 0.0, "source": 0.1, "other": 0.2}
+
+# Source files named like this are read as entry points
+ENTRY_POINT_STEMS = {
+    "__main__",
+    "main",
+    "app",
+    "cli",
+    "server",
+    "index",
+    "manage",
+    "run",
+    "wsgi",
+    "asgi",
+    "lib",
+    "mod",
+}
+
+# Allowances below this many tokens skip the file instead of excerpting it
+MIN_EXCERPT_TOKENS = 200
+
+# Share of an excerpt taken from the head of the file; the rest is its tail
+EXCERPT_HEAD = 2 / 3
+
+_budget: ContextVar = ContextVar("read_budget", default=None)
+
+
+# Encodings whose BPE files tiktoken downloads from here on first use
+BPE_URL = "https://openaipublic.blob.core.windows.net/encodings/{}.tiktoken"
+BPE_ENCODINGS = ("o200k_base", "cl100k_base")
+
+
+def _bpe_cached(encoding_name: str) -> bool:
+    """Whether tiktoken can load an encoding without going to the network"""
+    if encoding_name not in BPE_ENCODINGS:
+        return False
+    url = BPE_URL.format(encoding_name)
+    # Same cache location and key as tiktoken.load.read_file_cached
+    cache_dir = os.environ.get(
+        "TIKTOKEN_CACHE_DIR",
+        os.environ.get(
+            "DATA_GYM_CACHE_DIR",
+            os.path.join(tempfile.gettempdir(), "data-gym-cache"),
+        ),
+    )
+    if not cache_dir:
+        return False
+    key = hashlib.sha1(url.encode()).hexdigest()
+    return os.path.exists(os.path.join(cache_dir, key))
+
+
+@lru_cache(maxsize=16)
+def _encoding(model: str):
+    """
+    tiktoken encoding for a model, or None to estimate from characters. Only
+    encodings already in tiktoken's cache are used: a download inside a tool
+    call would stall cold or offline runs.
+    """
+    try:
+        import tiktoken
+
+        try:
+            name = tiktoken.encoding_name_for_model(model)
+        except KeyError:
+            # Not an OpenAI model: a recent BPE is close enough for budgeting
+            name = "o200k_base"
+        if not _bpe_cached(name):
+            return None
+        return tiktoken.get_encoding(name)
+    except Exception:
+        # Not installed, or its encoding files can't be read
+        return None
+
+
+def count_tokens(text: str, model: str = "") -> int:
+    encoding = _encoding(model)
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def model_read_budget(model: str) -> int:
+    """Default budget for a model; READ_TOKEN_BUDGET overrides the table"""
+    override = os.getenv("READ_TOKEN_BUDGET")
+    if override:
+        return int(override)
+    prefixes = [p for p in MODEL_READ_BUDGETS if model.startswith(p)]
+    if not prefixes:
+        return DEFAULT_READ_BUDGET
+    return MODEL_READ_BUDGETS[max(prefixes, key=len)]
+
+
+@lru_cache(maxsize=1)
+def _file_kinds() -> tuple:
+    # Imported here: the file tools import this module
+    from tools.github_tools import CONFIG_FILES, SOURCE_EXTENSIONS
+
+    return CONFIG_FILES, SOURCE_EXTENSIONS
+
+
+def file_kind(path: str) -> str:
+    """"config", "entry", "source" or "other", by file name"""
+    config_files, source_extensions = _file_kinds()
+    name = path.replace("\\", "/").rstrip("/").rsplit("/", 1)[-1]
+    stem, extension = os.path.splitext(name)
+    if name in config_files:
+        return "config"
+    if extension not in source_extensions:
+        return "other"
+    return "entry" if stem in ENTRY_POINT_STEMS else "source"
+
+
+def excerpt(content: str, tokens: int, allowance: int) -> str:
+    """Head and tail of `content` worth about `allowance` of its `tokens`"""
+    lines = content.splitlines(keepends=True)
+    chars = int(len(content) * allowance / max(1, tokens))
+    head, size = [], 0
+    for line in lines:
+        if size + len(line) > chars * EXCERPT_HEAD:
+            break
+        head.append(line)
+        size += len(line)
+    tail = []
+    for line in reversed(lines[len(head) :]):
+        if size + len(line) > chars:
+            break
+        tail.append(line)
+        size += len(line)
+    tail.reverse()
+
+    if not head and not tail:
+        # A few very long lines (minified code, data): cut by characters
+        head_chars = int(chars * EXCERPT_HEAD)
+        omitted = len(content) - chars
+        marker = f"\n... ({omitted} characters omitted to fit the read budget)\n"
+        tail_start = len(content) - (chars - head_chars)
+        return content[:head_chars] + marker + content[tail_start:]
+
+    omitted = len(lines) - len(head) - len(tail)
+    marker = f"\n... ({omitted} of {len(lines)} lines omitted to fit the read budget)"
+    return "".join(head) + marker + "\n" + "".join(tail)
+
+
+class ReadBudget:
+    """
+    Tokens of file content a run may still read, and what they were spent on.
+
+    A batch of reads is charged in order of importance: config files, entry
+    points, other source files, then everything else, shallow paths and large
+    files first within each kind as in explore_github_repo. A file gets at most
+    FILE_SHARE of the budget, and each kind stops at its reserve so later reads
+    of more important files still fit. Files over their allowance come back as
+    a head and tail excerpt, or are skipped once too little is left.
+    """
+
+    def __init__(self, total: int, model: str = ""):
+        self.total = total
+        self.model = model
+        self.spent = 0
+        self.by_kind: dict = {}
+        self.by_file: dict = {}
+        self.excerpted: list = []
+        self.skipped: list = []
+        self._lock = threading.Lock()
+
+    def _allowance(self, kind: str) -> int:
+        floor = RESERVES.get(kind, 0.0) * self.total
+        cap = max(MIN_EXCERPT_TOKENS, int(self.total * FILE_SHARE))
+        return max(0, min(cap, int(self.total - floor - self.spent)))
+
+    def _charge(self, path: str, kind: str, tokens: int) -> None:
+        self.spent += tokens
+        self.by_kind[kind] = self.by_kind.get(kind, 0) + tokens
+        self.by_file[path] = self.by_file.get(path, 0) + tokens
+        record(read_tokens=tokens)
+
+    def fit(self, results: list) -> list:
+        """
+        Read results ({"path", "content", "truncated"} or {"path", "error"})
+        trimmed to the budget, in their original order
+        """
+        fitted = list(results)
+        pending = []
+        for index, result in enumerate(results):
+            content = result.get("content")
+            if "error" in result or not isinstance(content, str):
+                continue
+            kind = file_kind(result["path"])
+            tokens = count_tokens(content, self.model)
+            depth = result["path"].strip("/").count("/")
+            pending.append((KINDS.index(kind), depth, -tokens, index, kind, tokens))
+
+        for *_, index, kind, tokens in sorted(pending):
+            result = results[index]
+            with self._lock:
+                allowance = self._allowance(kind)
+                if tokens <= allowance:
+                    self._charge(result["path"], kind, tokens)
+                    continue
+                if allowance < MIN_EXCERPT_TOKENS:
+                    self.skipped.append(result["path"])
+                    fitted[index] = {
+                        "path": result["path"],
+                        "error": (
+                            "Skipped: the run's read budget is used up "
+                            f"({self.spent} of {self.total} tokens spent). "
+                            "Outline the file instead."
+                        ),
+                    }
+                    continue
+                content = excerpt(result["content"], tokens, allowance)
+                self._charge(result["path"], kind, count_tokens(content, self.model))
+                self.excerpted.append(result["path"])
+            fitted[index] = {**result, "content": content, "truncated": True}
+            fitted[index]["excerpted"] = True
+        return fitted
+
+    def charge_outlines(self, results: list) -> None:
+        """Count outlines against the budget; they are small and never trimmed"""
+        for result in results:
+            if result.get("outline"):
+                tokens = count_tokens(result["outline"], self.model)
+                with self._lock:
+                    self._charge(result["path"], "outline", tokens)
+
+    def report(self) -> dict:
+        with self._lock:
+            largest = sorted(self.by_file.items(), key=lambda item: -item[1])[:10]
+            return {
+                "model": self.model,
+                "total": self.total,
+                "spent": self.spent,
+                "by_kind": dict(self.by_kind),
+                "largest_files": dict(largest),
+                "excerpted": list(dict.fromkeys(self.excerpted)),
+                "skipped": list(dict.fromkeys(self.skipped)),
+            }
+
+
+def current_budget() -> Optional[ReadBudget]:
+    """Read budget of the run this code is part of, if it has one"""
+    return _budget.get()
+
+
+@contextmanager
+def use_read_budget(budget: Optional[ReadBudget]):
+    """Make `budget` the current one for the graph run inside the block"""
+    token = _budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _budget.reset(token)
+
+
+def fit_reads(results: list) -> list:
+    """Read results through the current run's budget, unchanged without one"""
+    budget = current_budget()
+    return budget.fit(results) if budget else results
+
+
+def charge_outlines(results: list) -> None:
+    budget = current_budget()
+    if budget:
+        budget.charge_outlines(results)
@@ -0,0 +1,145 @@
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional
+
+# Flush to disk and report progress at least this often while streaming
+PROGRESS_EVERY_BYTES = 2048
+
+# Read once at import: os.umask can only be queried by setting it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def file_mode(path: Path) -> int:
+    """
+    Permissions for a file replacing `path`: those of the existing file, or
+    what open() would give a new one (mkstemp files are private, 0600)
+    """
+    try:
+        return os.stat(path).st_mode & 0o777
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+class ReadmeStreamWriter:
+    """
+    Writes a README to a temporary file as text chunks arrive.
+
+    Only the line currently being written is kept in memory. A surrounding
+    ```markdown fence and blank lines the model wraps its answer in are
+    dropped, and `commit()` atomically renames the file to README.md so a
+    failed generation never leaves a half-written README behind.
+    """
+
+    def __init__(
+        self, output_dir: Path, on_progress: Optional[Callable[[dict], None]] = None
+    ):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.path = self.output_dir / "README.md"
+        self.on_progress = on_progress
+
+        fd, self._tmp_path = tempfile.mkstemp(
+            prefix=".README-", suffix=".md.tmp", dir=self.output_dir
+        )
+        self._file = os.fdopen(fd, "w", encoding="utf-8")
+        self._pending = ""  # text after the last newline
+        self._held = None  # last complete line, may be the closing fence
+        self._held_blank_lines = 0  # blank lines before the held line
+        self._blank_lines = 0  # blank lines after the held line
+        self._started = False
+        self._fenced = False
+        self._unreported = 0
+
+        self.bytes = 0
+        self.lines = 0
+        self.sections = 0
+
+    def write(self, text: str) -> None:
+        if not text:
+            return
+        self._pending += text
+        *lines, self._pending = self._pending.split("\n")
+        for line in lines:
+            self._line(line)
+
+        if self._unreported >= PROGRESS_EVERY_BYTES:
+            self._file.flush()
+            self._report()
+
+    def _line(self, line: str) -> None:
+        if not self._started:
+            if not line.strip():
+                return
+            self._started = True
+            if line.strip().startswith("```"):
+                self._fenced = True
+                return
+
+        # Blank lines are held back too, so trailing ones can be dropped
+        if not line.strip():
+            self._blank_lines += 1
+            return
+        if self._held is not None:
+            self._emit(self._held)
+        self._held, self._held_blank_lines = line, self._blank_lines
+        self._blank_lines = 0
+
+    def _emit(self, line: str) -> None:
+        if self._held_blank_lines:
+            self._raw("\n" * self._held_blank_lines)
+            self.lines += self._held_blank_lines
+            self._held_blank_lines = 0
+        self._raw(line + "\n")
+        self.lines += 1
+        if line.startswith("## "):
+            self.sections += 1
+
+    def _raw(self, text: str) -> None:
+        self._file.write(text)
+        size = len(text.encode("utf-8"))
+        self.bytes += size
+        self._unreported += size
+
+    def _report(self) -> None:
+        self._unreported = 0
+        if self.on_progress:
+            self.on_progress(self.progress())
+
+    def progress(self) -> dict:
+        return {
+            "path": str(self.path),
+            "bytes": self.bytes,
+            "lines": self.lines,
+            "sections": self.sections,
+        }
+
+    def commit(self) -> dict:
+        """Flush the held-back tail and move the file into place as README.md"""
+        if self._pending:
+            self._line(self._pending)
+            self._pending = ""
+        held, self._held = self._held, None
+        # The closing fence goes together with the blank lines before it
+        if held is not None and not (self._fenced and held.strip() == "```"):
+            self._emit(held)
+
+        self._file.close()
+        if not self.bytes:
+            self.abort()
+            raise ValueError("The writer produced an empty README")
+
+        os.chmod(self._tmp_path, file_mode(self.path))
+        os.replace(self._tmp_path, self.path)
+        self._report()
+        return self.progress()
+
+    def abort(self) -> None:
+        """Discard the partial file, leaving any previous README untouched"""
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except OSError:
+            pass
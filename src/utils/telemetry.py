@@ -0,0 +1,370 @@
+import json
+import time
+import uuid
+import threading
+from contextvars import ContextVar
+from typing import Optional
+from langchain_core.callbacks import BaseCallbackHandler
+
+# Counters kept for every node and tool
+COUNTERS = (
+    "calls",
+    "seconds",
+    "errors",
+    "llm_calls",
+    "llm_seconds",
+    "llm_requests",
+    "prompt_tokens",
+    "completion_tokens",
+    "cached_tokens",
+    "llm_cache_hits",
+    "model_escalations",
+    "shard_cutoffs",
+    "tool_calls",
+    "read_tokens",
+    "github_calls",
+    "github_bytes",
+    "github_not_modified",
+    "rate_limited",
+    "rate_limit_waits",
+    "rate_limit_wait_seconds",
+)
+
+# (recorder, node, tool) of the code running right now; set by the callback
+# handler so that GitHub and HTTP clients can attribute their work.
+_scope: ContextVar = ContextVar("telemetry_scope", default=None)
+
+# Totals over every finished run in this process, for the Prometheus dump
+_totals = {"runs": {}, "nodes": {}, "tools": {}}
+_totals_lock = threading.Lock()
+
+# One lock per JSON lines file so concurrent batch runs don't interleave lines
+_sink_locks: dict = {}
+
+
+def _empty() -> dict:
+    return {name: 0 for name in COUNTERS}
+
+
+def _merge(into: dict, counters: dict) -> None:
+    for name, value in counters.items():
+        into[name] = into.get(name, 0) + value
+
+
+def _rounded(counters: dict) -> dict:
+    return {k: round(v, 3) if isinstance(v, float) else v for k, v in counters.items()}
+
+
+class RunTelemetry:
+    """Per-node and per-tool counters for one graph run, plus a JSON lines sink"""
+
+    def __init__(self, repo: str, path: Optional[str] = None):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.repo = repo
+        self.path = path
+        self.started = time.perf_counter()
+        self.nodes: dict = {}
+        self.tools: dict = {}
+        self._lock = threading.Lock()
+
+    def add(self, node: Optional[str], tool: Optional[str], counters: dict) -> None:
+        with self._lock:
+            if node:
+                _merge(self.nodes.setdefault(node, _empty()), counters)
+            if tool:
+                _merge(self.tools.setdefault(tool, _empty()), counters)
+
+    def emit(self, event: str, **fields) -> None:
+        """Append one event to the JSON lines report, if one is configured"""
+        if not self.path:
+            return
+        entry = {"ts": time.time(), "event": event, "run_id": self.run_id}
+        entry["repo"] = self.repo
+        entry.update(fields)
+        line = json.dumps(entry, default=str) + "\n"
+
+        with _totals_lock:
+            lock = _sink_locks.setdefault(self.path, threading.Lock())
+        with lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def totals(self) -> dict:
+        total = _empty()
+        with self._lock:
+            for counters in self.nodes.values():
+                _merge(total, counters)
+        # Node seconds nest (tools run inside tool nodes), so report wall time
+        total["seconds"] = time.perf_counter() - self.started
+        total["calls"] = 1
+        return total
+
+    def summary(self) -> dict:
+        with self._lock:
+            nodes = {name: _rounded(c) for name, c in self.nodes.items()}
+            tools = {name: _rounded(c) for name, c in self.tools.items()}
+        # Every HTTP request beyond the first of an LLM call is a client retry
+        for counters in nodes.values():
+            retries = counters["llm_requests"] - counters["llm_calls"]
+            counters["llm_retries"] = max(0, retries)
+        return {
+            "run_id": self.run_id,
+            "totals": _rounded(self.totals()),
+            "nodes": nodes,
+            "tools": tools,
+        }
+
+    def finish(self, status: str) -> dict:
+        """Write the run summary event and fold the counters into process totals"""
+        summary = self.summary()
+        self.emit("run", status=status, **summary)
+
+        with _totals_lock:
+            runs = _totals["runs"].setdefault(status, _empty())
+            _merge(runs, self.totals())
+            with self._lock:
+                for name, counters in self.nodes.items():
+                    _merge(_totals["nodes"].setdefault(name, _empty()), counters)
+                for name, counters in self.tools.items():
+                    _merge(_totals["tools"].setdefault(name, _empty()), counters)
+        return summary
+
+
+def record(**counters) -> None:
+    """Add counters to the node and tool currently running, if any is recorded"""
+    scope = _scope.get()
+    if scope is not None:
+        recorder, node, tool = scope
+        recorder.add(node, tool, counters)
+
+
+def _usage(response) -> dict:
+    """Prompt, completion and cached token counts of an LLMResult"""
+    usage = {"prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0}
+    for generations in response.generations:
+        for generation in generations:
+            meta = getattr(getattr(generation, "message", None), "usage_metadata", None)
+            if not meta:
+                continue
+            usage["prompt_tokens"] += meta.get("input_tokens", 0)
+            usage["completion_tokens"] += meta.get("output_tokens", 0)
+            details = meta.get("input_token_details") or {}
+            usage["cached_tokens"] += details.get("cache_read", 0) or 0
+
+    token_usage = (response.llm_output or {}).get("token_usage") or {}
+    if not usage["prompt_tokens"] and token_usage:
+        usage["prompt_tokens"] = token_usage.get("prompt_tokens", 0)
+        usage["completion_tokens"] = token_usage.get("completion_tokens", 0)
+    return usage
+
+
+class TelemetryHandler(BaseCallbackHandler):
+    """
+    Callback handler that times graph nodes, LLM calls and tool calls.
+
+    Node runs are recognized by LangGraph's `langgraph_node` metadata. While a
+    node or tool runs, it is published through a context variable so that
+    `record()` calls from the GitHub and LLM HTTP clients land on it.
+    """
+
+    # Async runs call the handler in the running task rather than on a thread,
+    # so the context variable set here is visible to the node or tool coroutine
+    run_inline = True
+
+    def __init__(self, recorder: RunTelemetry):
+        self.recorder = recorder
+        self._runs: dict = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id, kind: str, name: str, node: Optional[str], **extra):
+        with self._lock:
+            self._runs[run_id] = {
+                "kind": kind,
+                "name": name,
+                "node": node,
+                "started": time.perf_counter(),
+                **extra,
+            }
+
+    def _enter(self, run_id, node: Optional[str], tool: Optional[str]) -> None:
+        token = _scope.set((self.recorder, node, tool))
+        with self._lock:
+            self._runs[run_id]["token"] = token
+
+    def _end(self, run_id, error: Optional[BaseException] = None) -> Optional[dict]:
+        with self._lock:
+            run = self._runs.pop(run_id, None)
+        if run is None:
+            return None
+        if "token" in run:
+            try:
+                _scope.reset(run["token"])
+            except ValueError:
+                # Ended in a different context than it started in
+                pass
+        run["seconds"] = time.perf_counter() - run["started"]
+        run["status"] = "error" if error is not None else "ok"
+        if error is not None:
+            run["error"] = f"{type(error).__name__}: {error}"
+        return run
+
+    # Graph nodes
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        if not node or kwargs.get("name") != node:
+            return
+        self._start(run_id, "node", node, node)
+        self._enter(run_id, node, None)
+
+    def _node_end(self, run_id, error=None) -> None:
+        run = self._end(run_id, error)
+        if not run or run["kind"] != "node":
+            return
+        errors = 1 if error is not None else 0
+        self.recorder.add(
+            run["node"], None, {"calls": 1, "seconds": run["seconds"], "errors": errors}
+        )
+        self.recorder.emit(
+            "node",
+            node=run["node"],
+            seconds=round(run["seconds"], 3),
+            status=run["status"],
+            error=run.get("error"),
+        )
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._node_end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._node_end(run_id, error)
+
+    # LLM calls
+
+    def on_chat_model_start(
+        self, serialized, messages, *, run_id, metadata=None, **kwargs
+    ):
+        metadata = metadata or {}
+        model = metadata.get("ls_model_name") or kwargs.get("name", "")
+        self._start(run_id, "llm", model, metadata.get("langgraph_node"))
+
+    def _llm_end(self, run_id, response=None, error=None) -> None:
+        run = self._end(run_id, error)
+        if not run:
+            return
+        usage = _usage(response) if response is not None else {}
+        counters = {
+            "llm_calls": 1,
+            "llm_seconds": run["seconds"],
+            "errors": 1 if error is not None else 0,
+            **usage,
+        }
+        self.recorder.add(run["node"], None, counters)
+        self.recorder.emit(
+            "llm",
+            node=run["node"],
+            model=run["name"],
+            seconds=round(run["seconds"], 3),
+            status=run["status"],
+            error=run.get("error"),
+            **usage,
+        )
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._llm_end(run_id, response=response)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._llm_end(run_id, error=error)
+
+    # Tool calls
+
+    def on_tool_start(
+        self, serialized, input_str, *, run_id, metadata=None, **kwargs
+    ):
+        node = (metadata or {}).get("langgraph_node")
+        tool = (serialized or {}).get("name") or kwargs.get("name", "tool")
+        self._start(run_id, "tool", tool, node)
+        self._enter(run_id, node, tool)
+
+    def _tool_end(self, run_id, output=None, error=None) -> None:
+        run = self._end(run_id, error)
+        if not run:
+            return
+        failed = error is not None or getattr(output, "status", None) == "error"
+        counters = {"calls": 1, "seconds": run["seconds"], "errors": int(failed)}
+        self.recorder.add(None, run["name"], counters)
+        self.recorder.add(run["node"], None, {"tool_calls": 1})
+        self.recorder.emit(
+            "tool",
+            node=run["node"],
+            tool=run["name"],
+            seconds=round(run["seconds"], 3),
+            status="error" if failed else "ok",
+            error=run.get("error"),
+        )
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._tool_end(run_id, output=output)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._tool_end(run_id, error=error)
+
+
+def with_telemetry(config: dict, recorder: RunTelemetry) -> dict:
+    """Copy of a graph config with the telemetry handler added to its callbacks"""
+    callbacks = list(config.get("callbacks") or [])
+    return {**config, "callbacks": callbacks + [TelemetryHandler(recorder)]}
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text(prefix: str = "autoreadme") -> str:
+    """Process totals in the Prometheus text exposition format"""
+    with _totals_lock:
+        snapshot = {
+            group: {name: dict(c) for name, c in items.items()}
+            for group, items in _totals.items()
+        }
+
+    lines = []
+    for group, label in (("runs", "status"), ("nodes", "node"), ("tools", "tool")):
+        for counter in COUNTERS:
+            samples = [
+                (name, counters.get(counter, 0))
+                for name, counters in sorted(snapshot[group].items())
+            ]
+            if not any(value for _, value in samples):
+                continue
+
+            metric = f"{prefix}_{group[:-1]}_{counter}_total"
+            lines.append(f"# HELP {metric} {counter.replace('_', ' ')} per {label}")
+            lines.append(f"# TYPE {metric} counter")
+            for name, value in samples:
+                value = round(value, 6) if isinstance(value, float) else value
+                lines.append(f'{metric}{{{label}="{_escape(name)}"}} {value}')
+
+    # Imported here: the rate limiter records its waits through this module
+    from utils.rate_limit import rate_limit_stats
+
+    budgets = rate_limit_stats()
+    for field in ("remaining", "limit", "reset_in", "blocked_for", "tokens"):
+        samples = [
+            (name, budget[field])
+            for name, budget in sorted(budgets.items())
+            if budget[field] is not None
+        ]
+        if not samples:
+            continue
+        metric = f"{prefix}_rate_limit_{field}"
+        description = f"rate limit {field.replace('_', ' ')}"
+        lines.append(f"# HELP {metric} {description} per limiter")
+        lines.append(f"# TYPE {metric} gauge")
+        for name, value in samples:
+            lines.append(f'{metric}{{limiter="{_escape(name)}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(prometheus_text())
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The application imports its modules relative to src/, as src/main.py does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,178 @@
+from utils import code_outline
+from utils.code_outline import (
+    outline_file,
+    outline_python,
+    outline_source,
+    outline_text,
+)
+
+PYTHON_SOURCE = '''"""Tool that does things.
+
+More detail here.
+"""
+import os
+from . import sibling
+from ..pkg import mod
+import argparse
+
+MAX = 10
+name = "x"
+LIMIT: int = 5
+
+@dataclass
+class Point(Base, metaclass=Meta):
+    """A point."""
+    x: int = 0
+    y: int
+
+    def norm(self, p: float = 2) -> float:
+        """Norm of the point.
+
+        Second line."""
+        return 0
+
+async def fetch(url, *, timeout=3):
+    pass
+
+def main():
+    parser = argparse.ArgumentParser(description="demo")
+    parser.add_argument("--verbose", action="store_true")
+
+if __name__ == "__main__":
+    main()
+'''
+
+TS_SOURCE = """// Utilities for the API client.
+// Second line.
+
+import { x } from "y";
+
+export interface Options {
+  retries: number;
+}
+
+export class Client {
+  constructor(base: string) {
+    this.base = base;
+  }
+
+  async get(path: string): Promise<string> {
+    if (path) {
+      return "";
+    }
+  }
+}
+
+function helper(a, b) {
+  return a + b;
+}
+
+const handler = async (req) => {
+  return req;
+};
+
+type Id = string;
+program.command("run").option("-v");
+"""
+
+
+def test_python_module_docstring_and_imports():
+    lines = outline_python(PYTHON_SOURCE).splitlines()
+    assert lines[0] == '"""Tool that does things. More detail here."""'
+    assert lines[1] == "imports: os, ., ..pkg, argparse"
+
+
+def test_python_constants_only_keep_upper_case_names():
+    outline = outline_python(PYTHON_SOURCE)
+    assert "L10 MAX = 10" in outline
+    assert "L12 LIMIT: int = 5" in outline
+    assert "name =" not in outline
+
+
+def test_python_classes_fields_and_methods():
+    lines = outline_python(PYTHON_SOURCE).splitlines()
+    start = lines.index("L14 @dataclass")
+    assert lines[start : start + 7] == [
+        "L14 @dataclass",
+        "L15 class Point(Base, metaclass=Meta)",
+        '       """A point."""',
+        "L17   x: int = 0",
+        "L18   y: int",
+        "L20   def norm(self, p: float=2) -> float",
+        '         """Norm of the point."""',
+    ]
+
+
+def test_python_functions_skip_their_bodies():
+    outline = outline_python(PYTHON_SOURCE)
+    assert "L26 async def fetch(url, *, timeout=3)" in outline
+    assert "L29 def main()" in outline
+    assert "return 0" not in outline
+
+
+def test_python_cli_calls_and_main_block():
+    lines = outline_python(PYTHON_SOURCE).splitlines()
+    cli = lines.index("CLI:")
+    assert lines[cli + 1] == "L30 argparse.ArgumentParser(description='demo')"
+    assert lines[cli + 2] == "L31 parser.add_argument('--verbose', action='store_true')"
+    assert lines[-3:] == [
+        "L33 __main__:",
+        '  if __name__ == "__main__":',
+        "      main()",
+    ]
+
+
+def test_typescript_header_comment():
+    lines = outline_text(TS_SOURCE, ".ts").splitlines()
+    assert lines[0] == "/* Utilities for the API client. Second line. */"
+
+
+def test_typescript_declarations():
+    lines = outline_text(TS_SOURCE, ".ts").splitlines()
+    assert lines[1:] == [
+        "L6 export interface Options",
+        "L10 export class Client",
+        "L11 constructor(base: string)",
+        "L15 async get(path: string): Promise<string>",
+        "L22 function helper(a, b)",
+        "L26 const handler = async (req) =>",
+        "L30 type Id = string;",
+        'L31 program.command("run").option("-v");',
+    ]
+
+
+def test_typescript_control_flow_is_not_a_method():
+    outline = outline_text(TS_SOURCE, ".tsx")
+    assert "if (path)" not in outline
+    assert "return" not in outline
+
+
+def test_unknown_extension_only_keeps_the_header():
+    assert outline_text("# Build helpers\nx = 1\n", ".unknown") == "/* Build helpers */"
+    assert outline_text("x = 1\n", ".unknown") == ""
+
+
+def test_invalid_python_falls_back_to_the_text_outline():
+    source = "# Broken on purpose\ndef broken(:\n    pass\n"
+    assert outline_source("broken.py", source) == "/* Broken on purpose */"
+
+
+def test_long_outlines_are_truncated_on_a_line(monkeypatch):
+    monkeypatch.setattr(code_outline, "MAX_OUTLINE_CHARS", 200)
+    source = "".join(f"def function_{i}(argument):\n    pass\n" for i in range(50))
+    outline = outline_source("many.py", source)
+    body, marker = outline.rsplit("\n", 1)
+    assert marker == "... (outline truncated)"
+    assert len(body) <= 200
+    assert body.splitlines()[-1].startswith("L")
+
+
+def test_outline_file_reports_lines_and_errors(tmp_path):
+    path = tmp_path / "app.ts"
+    path.write_text(TS_SOURCE)
+    result = outline_file(str(path))
+    assert result["lines"] == TS_SOURCE.count("\n") + 1
+    assert result["outline"] == outline_text(TS_SOURCE, ".ts")
+
+    missing = outline_file(str(tmp_path / "missing.py"))
+    assert missing["error"].startswith("Error reading file")
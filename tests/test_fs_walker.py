@@ -0,0 +1,124 @@
+import re
+from utils.fs_walker import DirectoryWalker, IgnoreRules, _translate
+
+
+def rules(*lines: str, base: str = "") -> IgnoreRules:
+    return IgnoreRules().extended([line + "\n" for line in lines], base)
+
+
+def matches(pattern: str, path: str) -> bool:
+    return re.match(f"^{_translate(pattern)}$", path) is not None
+
+
+def test_star_and_question_mark_stay_within_one_segment():
+    assert matches("*.log", "debug.log")
+    assert not matches("*.log", "logs/debug.log")
+    assert matches("file?.txt", "file1.txt")
+    assert not matches("file?.txt", "file/.txt")
+
+
+def test_double_star():
+    assert matches("**/build", "build")
+    assert matches("**/build", "a/b/build")
+    assert matches("docs/**", "docs/a/b.md")
+    assert matches("a/**/b", "a/b")
+    assert matches("a/**/b", "a/x/y/b")
+    assert not matches("a/**/b", "a/x/c")
+
+
+def test_character_classes_and_escapes():
+    assert matches("[abc].txt", "b.txt")
+    assert not matches("[abc].txt", "d.txt")
+    assert matches("[!abc].txt", "d.txt")
+    assert not matches("[!abc].txt", "a.txt")
+    assert matches(r"\*.txt", "*.txt")
+    assert not matches(r"\*.txt", "a.txt")
+    assert matches("[oops", "[oops")
+
+
+def test_comments_and_blank_lines_are_skipped():
+    ignore = rules("# *.py", "", "   ")
+    assert ignore.rules == []
+    assert not ignore.ignored("main.py", False)
+
+
+def test_unanchored_pattern_matches_the_name_at_any_depth():
+    ignore = rules("*.pyc")
+    assert ignore.ignored("a.pyc", False)
+    assert ignore.ignored("pkg/sub/a.pyc", False)
+    assert not ignore.ignored("a.py", False)
+
+
+def test_slash_anchors_the_pattern_to_the_gitignore():
+    ignore = rules("/build")
+    assert ignore.ignored("build", True)
+    assert not ignore.ignored("src/build", True)
+
+    ignore = rules("docs/generated")
+    assert ignore.ignored("docs/generated", True)
+    assert not ignore.ignored("site/docs/generated", True)
+
+
+def test_trailing_slash_only_matches_directories():
+    ignore = rules("cache/")
+    assert ignore.ignored("cache", True)
+    assert ignore.ignored("pkg/cache", True)
+    assert not ignore.ignored("cache", False)
+
+
+def test_negation_reincludes_and_the_last_match_wins():
+    ignore = rules("*.log", "!keep.log")
+    assert ignore.ignored("debug.log", False)
+    assert not ignore.ignored("keep.log", False)
+    assert not ignore.ignored("logs/keep.log", False)
+
+    ignore = rules("!keep.log", "*.log")
+    assert ignore.ignored("keep.log", False)
+
+
+def test_negated_directory_pattern_ignores_files():
+    ignore = rules("*", "!src/")
+    assert not ignore.ignored("src", True)
+    assert ignore.ignored("src", False)
+
+
+def test_nested_gitignore_only_applies_below_its_directory():
+    ignore = rules("*.tmp").extended(["/out\n", "!keep.tmp\n"], "pkg")
+    assert ignore.ignored("pkg/out", True)
+    assert not ignore.ignored("out", True)
+    assert not ignore.ignored("pkg/sub/out", True)
+    assert not ignore.ignored("pkg/keep.tmp", False)
+    assert ignore.ignored("keep.tmp", False)
+
+
+def test_walker_applies_nested_gitignores(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.log\n/dist/\n")
+    (tmp_path / "dist").mkdir()
+    (tmp_path / "dist" / "bundle.js").write_text("")
+    (tmp_path / "app.log").write_text("")
+    (tmp_path / "main.py").write_text("")
+    pkg = tmp_path / "pkg"
+    pkg.mkdir()
+    (pkg / ".gitignore").write_text("!important.log\n")
+    (pkg / "important.log").write_text("")
+    (pkg / "other.log").write_text("")
+    (pkg / "dist").mkdir()
+    (pkg / "dist" / "kept.js").write_text("")
+
+    tree = DirectoryWalker(ignore_dirs=set()).walk(str(tmp_path))
+    files = set()
+
+    def collect(node: dict, prefix: str) -> None:
+        for name, child in node["children"].items():
+            if child["type"] == "file":
+                files.add(prefix + name)
+            else:
+                collect(child, f"{prefix}{name}/")
+
+    collect(tree, "")
+    assert "main.py" in files
+    assert "pkg/important.log" in files
+    assert "pkg/dist/kept.js" in files
+    assert "app.log" not in files
+    assert "pkg/other.log" not in files
+    assert "dist/bundle.js" not in files
@@ -0,0 +1,153 @@
+import time
+import asyncio
+from email.utils import formatdate
+import pytest
+from utils import rate_limit
+from utils.rate_limit import RateLimiter, RateLimitExceeded, _duration, _retry_after
+
+
+def test_burst_then_queue_at_the_refill_rate():
+    limiter = RateLimiter("test", rate=10.0, burst=2)
+    assert limiter._reserve() == 0
+    assert limiter._reserve() == 0
+    assert limiter._reserve() == pytest.approx(0.1, abs=0.01)
+    # Callers queue behind each other in arrival order
+    assert limiter._reserve() == pytest.approx(0.2, abs=0.01)
+    assert limiter.snapshot()["waits"] == 2
+
+
+def test_no_rate_never_waits():
+    limiter = RateLimiter("test")
+    assert all(limiter._reserve() == 0 for _ in range(100))
+
+
+def test_wait_beyond_the_limit_raises_and_returns_the_token(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_MAX_WAIT", 0.5)
+    limiter = RateLimiter("test", rate=1.0, burst=1)
+    limiter._reserve()
+    with pytest.raises(RateLimitExceeded):
+        limiter._reserve()
+    assert limiter.tokens == pytest.approx(0.0, abs=0.01)
+
+
+def test_retry_after_formats():
+    assert _retry_after({"retry-after": "7"}) == 7.0
+    assert _retry_after({"retry-after-ms": "1500", "retry-after": "7"}) == 1.5
+    assert _retry_after({"retry-after-ms": "soon", "retry-after": "3"}) == 3.0
+    date = formatdate(time.time() + 30, usegmt=True)
+    assert _retry_after({"retry-after": date}) == pytest.approx(30, abs=2)
+    assert _retry_after({"retry-after": "whenever"}) is None
+    assert _retry_after({"retry-after": ""}) is None
+    assert _retry_after({}) is None
+    assert _retry_after(None) is None
+
+
+def test_reset_durations():
+    assert _duration("1s") == 1.0
+    assert _duration("6m0s") == 360.0
+    assert _duration("20ms") == pytest.approx(0.02)
+    assert _duration("1h2m") == 3720.0
+    assert _duration("2.5") == 2.5
+    assert _duration("later") is None
+
+
+def test_429_with_retry_after_blocks_every_caller():
+    limiter = RateLimiter("test")
+    assert limiter.observe(429, {"retry-after": "5"})
+    assert limiter._reserve() == pytest.approx(5, abs=0.1)
+    assert limiter._reserve() == pytest.approx(5, abs=0.1)
+    assert limiter.snapshot()["throttled"] == 1
+
+
+def test_429_without_retry_after_backs_off_exponentially():
+    limiter = RateLimiter("test")
+    limiter.observe(429, {})
+    assert limiter._reserve() == pytest.approx(rate_limit.DEFAULT_BACKOFF, abs=0.1)
+    limiter.observe(429, {})
+    assert limiter._reserve() == pytest.approx(2 * rate_limit.DEFAULT_BACKOFF, abs=0.1)
+    # A successful response resets the backoff
+    limiter.observe(200, {})
+    assert limiter.backoff == rate_limit.DEFAULT_BACKOFF
+
+
+def test_backoff_is_capped():
+    limiter = RateLimiter("test")
+    for _ in range(20):
+        limiter.observe(429, {})
+    assert limiter.backoff == rate_limit.MAX_BACKOFF
+
+
+def test_github_exhausted_quota_waits_for_the_reset():
+    limiter = RateLimiter("test", rate=1.0, burst=10)
+    reset = int(time.time()) + 60
+    headers = {
+        "x-ratelimit-limit": "5000",
+        "x-ratelimit-remaining": "0",
+        "x-ratelimit-reset": str(reset),
+    }
+    assert limiter.observe(403, headers)
+    assert limiter._reserve() == pytest.approx(60, abs=2)
+    snapshot = limiter.snapshot()
+    assert snapshot["limit"] == 5000
+    assert snapshot["remaining"] == 0
+
+
+def test_forbidden_without_quota_headers_is_not_throttling():
+    limiter = RateLimiter("test")
+    assert not limiter.observe(403, {})
+    assert limiter._reserve() == 0
+
+
+def test_remaining_quota_caps_the_bucket():
+    limiter = RateLimiter("test", rate=1.0, burst=100)
+    reset = str(int(time.time()) + 3600)
+    limiter.observe(200, {"x-ratelimit-remaining": "3", "x-ratelimit-reset": reset})
+    waits = [limiter._reserve() for _ in range(4)]
+    assert waits[:3] == [0, 0, 0]
+    assert waits[3] == pytest.approx(1.0, abs=0.05)
+
+
+def test_openai_headers_use_the_tighter_quota():
+    headers = {
+        "x-ratelimit-limit-requests": "100",
+        "x-ratelimit-remaining-requests": "90",
+        "x-ratelimit-reset-requests": "1s",
+        "x-ratelimit-limit-tokens": "10000",
+        "x-ratelimit-remaining-tokens": "100",
+        "x-ratelimit-reset-tokens": "6m0s",
+    }
+    assert RateLimiter._quota(headers) == (10000, 100, 360.0)
+
+    limiter = RateLimiter("test")
+    headers["x-ratelimit-remaining-tokens"] = "0"
+    assert not limiter.observe(200, headers)
+    assert limiter._reserve() == pytest.approx(360, abs=0.5)
+
+
+def test_acquire_sleeps_for_the_wait(monkeypatch):
+    slept = []
+    monkeypatch.setattr(rate_limit.time, "sleep", slept.append)
+    limiter = RateLimiter("test")
+    limiter.observe(429, {"retry-after": "3"})
+    assert limiter.acquire() == pytest.approx(3, abs=0.1)
+    assert slept == [pytest.approx(3, abs=0.1)]
+
+
+def test_aacquire_awaits_the_wait(monkeypatch):
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(rate_limit.asyncio, "sleep", fake_sleep)
+    limiter = RateLimiter("test")
+    limiter.observe(429, {"retry-after-ms": "250"})
+    assert asyncio.run(limiter.aacquire()) == pytest.approx(0.25, abs=0.05)
+    assert slept == [pytest.approx(0.25, abs=0.05)]
+
+
+def test_limiters_are_shared_per_github_token():
+    first = rate_limit.github_limiter("https://api.test", "token a")
+    assert rate_limit.github_limiter("https://api.test", "token a") is first
+    assert rate_limit.github_limiter("https://api.test", "token b") is not first
+    assert "token a" not in first.name